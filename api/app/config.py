@@ -15,6 +15,30 @@ class Settings(BaseSettings):
     redis_host: str = "redis"
     redis_port: int = 6379
     redis_ttl: int = 3600
+    progress_ttl_seconds: int = 24 * 3600
+    progress_keepalive_seconds: float = 15.0
+    training_interactive_queue: str = "training.interactive"
+    training_bulk_queue: str = "training.bulk"
+    broker_priorities_enabled: bool = True
+    worker_concurrency: int = 0
+    worker_prefetch_multiplier: int = 1
+    worker_max_tasks_per_child: int = 20
+    worker_max_memory_per_child_kb: int = 768 * 1024
+    worker_blas_threads: int = 0
+    worker_metrics_port: int = 9808
+    worker_preload_dataset: bool = True
+    training_soft_time_limit: int = 3600
+    training_time_limit: int = 3900
+    drift_retrain_enabled: bool = True
+    drift_check_interval_seconds: int = 300
+    drift_psi_threshold: float = 0.25
+    drift_sustained_seconds: int = 1800
+    drift_retrain_cooldown_seconds: int = 6 * 3600
+    drift_retrain_mode: str = "full"
+    drift_retrain_stage: str = "Staging"
+    drift_retrain_priority: str = "normal"
+    drift_baseline_hours: int = 168
+    drift_current_hours: int = 24
     postgres_db: str = "mlflow_db"
     postgres_user: str = "mlflow_user"
     postgres_password: str = "mlflow_password"
@@ -26,6 +50,13 @@ class Settings(BaseSettings):
     random_seed: int = 42
     data_dir: str = "/app/data"
     artifact_dir: str = "/mlruns"
+    model_cache_enabled: bool = True
+    model_cache_dir: str = "/app/model_cache"
+    model_cache_max_bytes: int = 2 * 1024 * 1024 * 1024
+    model_shared_weights: bool = False
+    model_memory_budget_bytes: int = 256 * 1024 * 1024
+    model_alias_ttl_seconds: int = 30
+    inference_dtype: str = "float32"
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -0,0 +1,29 @@
+from prometheus_client import Counter, Histogram
+MODEL_LOAD_DURATION_SECONDS = Histogram(
+    "model_load_duration_seconds",
+    "Time spent loading a model into the inference cache",
+    ["model_name", "outcome"],
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0),
+)
+MODEL_LOAD_COALESCED_TOTAL = Counter(
+    "model_load_coalesced_total",
+    "Requests that waited on an in-flight model load instead of starting their own",
+    ["model_name"],
+)
+CELERY_TASK_QUEUE_WAIT_SECONDS = Histogram(
+    "celery_task_queue_wait_seconds",
+    "Time a task spent in the broker queue between publish and start",
+    ["task", "queue", "priority"],
+    buckets=(0.1, 0.5, 1.0, 5.0, 15.0, 30.0, 60.0, 300.0, 900.0, 1800.0, 3600.0),
+)
+CELERY_TASK_RUNTIME_SECONDS = Histogram(
+    "celery_task_runtime_seconds",
+    "Wall-clock run time of a task on a worker",
+    ["task", "state"],
+    buckets=(1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1200.0, 1800.0, 3600.0),
+)
+DRIFT_EVALUATIONS_TOTAL = Counter(
+    "drift_evaluations_total",
+    "Scheduled drift evaluations by the action they took",
+    ["model_name", "action"],
+)
@@ -2,6 +2,7 @@ import logging
 from fastapi import APIRouter, HTTPException, Query
 from typing import Optional
 from app.services.drift_service import get_drift_service
+from app.services.drift_monitor import get_drift_monitor
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/drift", tags=["Drift Detection"])
 @router.get(
@@ -68,3 +69,16 @@ async def get_distribution(
     except Exception as e:
         logger.error(f"Distribution error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+@router.get(
+    "/retrain",
+    summary="Get drift-triggered retraining state",
+    description="Return the sustained-drift timer, cooldown and last automatic retraining job"
+)
+async def get_retrain_state(
+    model_name: str = Query(default="MNISTClassifier", description="Model name to inspect")
+):
+    try:
+        return get_drift_monitor().get_state(model_name)
+    except Exception as e:
+        logger.error(f"Retrain state error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
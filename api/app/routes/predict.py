@@ -3,11 +3,14 @@ import json
 import hashlib
 import redis
 from fastapi import APIRouter, HTTPException, status
+from starlette.concurrency import run_in_threadpool
 from app.schemas.predict import (
     PredictRequest,
     PredictResponse,
     BatchPredictRequest,
     BatchPredictResponse,
+    CachedModelInfo,
+    ModelCacheResponse,
 )
 from app.services.inference_service import get_inference_service
 from app.services.drift_service import get_drift_service
@@ -36,7 +39,8 @@ async def predict(request: PredictRequest):
         r = None
     try:
         inference_service = get_inference_service()
-        result = inference_service.predict(
+        result = await run_in_threadpool(
+            inference_service.predict,
             image_data=request.image,
             model_name=settings.model_name,
             stage="Production",
@@ -92,7 +96,8 @@ async def predict_batch(request: BatchPredictRequest):
     settings = get_settings()
     try:
         inference_service = get_inference_service()
-        result = inference_service.predict_batch(
+        result = await run_in_threadpool(
+            inference_service.predict_batch,
             images=request.images,
             model_name=settings.model_name,
             stage="Production",
@@ -126,7 +131,8 @@ async def predict_staging(request: PredictRequest):
     settings = get_settings()
     try:
         inference_service = get_inference_service()
-        result = inference_service.predict(
+        result = await run_in_threadpool(
+            inference_service.predict,
             image_data=request.image,
             model_name=settings.model_name,
             stage="Staging",
@@ -150,6 +156,64 @@ async def predict_staging(request: PredictRequest):
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Prediction failed: {str(e)}"
         )
+@router.post(
+    "/versions/{version}",
+    response_model=PredictResponse,
+    summary="Get prediction from a pinned model version",
+    description="Get prediction from a specific registered model version, independent of stage",
+)
+async def predict_version(version: str, request: PredictRequest):
+    settings = get_settings()
+    try:
+        inference_service = get_inference_service()
+        result = await run_in_threadpool(
+            inference_service.predict,
+            image_data=request.image,
+            model_name=settings.model_name,
+            version=version,
+        )
+        return PredictResponse(
+            prediction=result["prediction"],
+            confidence=result["confidence"],
+            probabilities=result["probabilities"],
+            model_name=result["model_name"],
+            model_version=result["model_version"],
+            model_stage=result["model_stage"],
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error(f"Version {version} prediction failed: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Prediction failed: {str(e)}"
+        )
+@router.get(
+    "/cache",
+    response_model=ModelCacheResponse,
+    summary="List cached models",
+    description="List models resident in the inference cache with their memory estimates and hit counts",
+)
+async def list_cached_models():
+    try:
+        inference_service = get_inference_service()
+        cached = inference_service.list_cached_models()
+        stats = inference_service.get_cache_stats()
+        return ModelCacheResponse(
+            models=[CachedModelInfo(**entry) for entry in cached],
+            total_count=len(cached),
+            total_bytes=stats["total_bytes"],
+            max_bytes=stats["max_bytes"],
+        )
+    except Exception as e:
+        logger.error(f"Failed to list cached models: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to list cached models: {str(e)}"
+        )
 @router.delete(
     "/cache",
     summary="Clear model cache",
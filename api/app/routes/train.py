@@ -1,7 +1,18 @@
+import json
 import logging
-from fastapi import APIRouter, HTTPException, BackgroundTasks, status
-from app.schemas.train import TrainRequest, TrainResponse, TrainingStatus
+from typing import Optional
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Query, Request, status
+from fastapi.responses import StreamingResponse
+from app.schemas.train import (
+    TrainRequest,
+    TrainResponse,
+    TrainingStatus,
+    SweepRequest,
+    SweepResponse,
+    SweepStatusResponse,
+)
 from app.services.training_service import get_training_service
+from app.services.progress_service import get_progress_service
 from app.config import get_settings
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/train", tags=["Training"])
@@ -25,6 +36,8 @@ async def start_training(request: TrainRequest):
             dropout=request.dropout,
             experiment_name=experiment_name,
             run_name=request.run_name,
+            priority=request.priority.value,
+            warm_start=request.warm_start,
         )
         logger.info(f"Training job started: {job.job_id}")
         return TrainResponse(
@@ -63,14 +76,75 @@ async def get_training_status(job_id: str):
         "error": job.error,
         "params": job.params,
     }
+@router.delete(
+    "/{job_id}",
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Cancel a training job",
+    description="Revoke a queued training job or stop a running one after its current epoch",
+)
+async def cancel_training(job_id: str):
+    training_service = get_training_service()
+    job = training_service.cancel_job(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Training job '{job_id}' not found"
+        )
+    if job.status in (TrainingStatus.COMPLETED, TrainingStatus.FAILED):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Training job '{job_id}' already {job.status.value}"
+        )
+    return {
+        "job_id": job.job_id,
+        "status": job.status,
+        "message": "Training job cancelled" if job.status == TrainingStatus.CANCELLED
+        else "Cancellation requested; the job stops after its current epoch",
+    }
+@router.get(
+    "/stream/{job_id}",
+    summary="Stream training progress",
+    description="Server-Sent Events stream of per-epoch loss and validation accuracy for a training job",
+)
+async def stream_training_progress(job_id: str, request: Request):
+    training_service = get_training_service()
+    progress_service = get_progress_service()
+    if not training_service.has_job(job_id) and progress_service.get_last(job_id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Training job '{job_id}' not found"
+        )
+    async def events():
+        async for event in progress_service.stream(job_id):
+            if await request.is_disconnected():
+                break
+            if event is None:
+                yield ": keepalive\n\n"
+            else:
+                yield f"event: progress\ndata: {json.dumps(event)}\n\n"
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 @router.get(
     "/jobs",
     summary="List all training jobs",
-    description="Get a list of all training jobs",
+    description="Get a page of training jobs, newest first, optionally filtered by status and experiment",
 )
-async def list_training_jobs():
+async def list_training_jobs(
+    status_filter: Optional[TrainingStatus] = Query(default=None, alias="status", description="Only return jobs in this status"),
+    experiment_name: Optional[str] = Query(default=None, description="Only return jobs of this experiment"),
+    limit: int = Query(default=50, ge=1, le=500, description="Maximum number of jobs to return"),
+    offset: int = Query(default=0, ge=0, description="Number of jobs to skip"),
+):
     training_service = get_training_service()
-    jobs = training_service.list_jobs()
+    jobs = training_service.list_jobs(
+        status=status_filter,
+        experiment_name=experiment_name,
+        offset=offset,
+        limit=limit,
+    )
     return {
         "jobs": [
             {
@@ -79,8 +153,62 @@ async def list_training_jobs():
                 "experiment_name": job.experiment_name,
                 "status": job.status,
                 "started_at": job.started_at.isoformat() if job.started_at else None,
+                "completed_at": job.completed_at.isoformat() if job.completed_at else None,
             }
             for job in jobs
         ],
-        "total_count": len(jobs),
+        "total_count": training_service.count_jobs(status=status_filter, experiment_name=experiment_name),
+        "limit": limit,
+        "offset": offset,
     }
+@router.post(
+    "/sweep",
+    response_model=SweepResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Start a hyperparameter sweep",
+    description="Fan a grid or random search out across Celery workers and select the best run when all trials finish",
+)
+async def start_sweep(request: SweepRequest):
+    settings = get_settings()
+    training_service = get_training_service()
+    experiment_name = request.experiment_name or settings.experiment_name
+    try:
+        sweep = await training_service.start_sweep(
+            num_runs=request.num_runs,
+            search_strategy=request.search_strategy.value,
+            epochs=request.epochs,
+            experiment_name=experiment_name,
+            metric=request.metric,
+            register_best=request.register_best,
+            model_name=request.model_name,
+            stage=request.stage.value if request.stage else None,
+        )
+        logger.info(f"Sweep started: {sweep.sweep_id}")
+        return SweepResponse(
+            message="Sweep initiated successfully",
+            sweep_id=sweep.sweep_id,
+            experiment_name=experiment_name,
+            num_trials=len(sweep.trials),
+            status=TrainingStatus.PENDING,
+        )
+    except Exception as e:
+        logger.error(f"Failed to start sweep: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to start sweep: {str(e)}"
+        )
+@router.get(
+    "/sweep/{sweep_id}",
+    response_model=SweepStatusResponse,
+    summary="Get sweep progress",
+    description="Check per-trial progress and the selected best run of a sweep",
+)
+async def get_sweep_status(sweep_id: str):
+    training_service = get_training_service()
+    sweep = training_service.get_sweep(sweep_id)
+    if sweep is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Sweep '{sweep_id}' not found"
+        )
+    return sweep
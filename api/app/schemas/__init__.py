@@ -1,4 +1,12 @@
-from app.schemas.train import TrainRequest, TrainResponse, TrainingStatus
+from app.schemas.train import (
+    TrainRequest,
+    TrainResponse,
+    TrainingStatus,
+    TrainingPriority,
+    SweepRequest,
+    SweepResponse,
+    SweepStatusResponse,
+)
 from app.schemas.experiments import (
     ExperimentSummary,
     ExperimentsResponse,
@@ -17,11 +25,17 @@ from app.schemas.predict import (
     PredictResponse,
     BatchPredictRequest,
     BatchPredictResponse,
+    CachedModelInfo,
+    ModelCacheResponse,
 )
 __all__ = [
     "TrainRequest",
     "TrainResponse",
     "TrainingStatus",
+    "TrainingPriority",
+    "SweepRequest",
+    "SweepResponse",
+    "SweepStatusResponse",
     "ExperimentSummary",
     "ExperimentsResponse",
     "RunSummary",
@@ -35,4 +49,6 @@ __all__ = [
     "PredictResponse",
     "BatchPredictRequest",
     "BatchPredictResponse",
+    "CachedModelInfo",
+    "ModelCacheResponse",
 ]
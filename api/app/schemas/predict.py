@@ -1,5 +1,6 @@
 from pydantic import BaseModel, Field, field_validator
 from typing import List, Optional, Union
+from datetime import datetime
 class PredictRequest(BaseModel):
     image: List[float] = Field(
         description="Flattened image pixel data (784 values for 28x28 MNIST image)"
@@ -78,3 +79,19 @@ class BatchPredictResponse(BaseModel):
     model_name: str = Field(description="Model used for prediction")
     model_version: str = Field(description="Model version used")
     batch_size: int = Field(description="Number of images processed")
+class CachedModelInfo(BaseModel):
+    key: str = Field(description="Cache key")
+    model_name: str = Field(description="Registered model name")
+    version: str = Field(description="Model version")
+    stages: List[str] = Field(default_factory=list, description="Stages currently resolving to this version")
+    run_id: Optional[str] = Field(default=None, description="Training run ID")
+    size_bytes: int = Field(description="Estimated private memory in bytes")
+    shared_bytes: int = Field(default=0, description="Memory-mapped weight bytes shared across workers")
+    hits: int = Field(description="Cache hits since load")
+    loaded_at: datetime = Field(description="Load timestamp")
+    last_accessed_at: datetime = Field(description="Last access timestamp")
+class ModelCacheResponse(BaseModel):
+    models: List[CachedModelInfo] = Field(description="Resident models, most recently used first")
+    total_count: int = Field(description="Number of resident models")
+    total_bytes: int = Field(description="Estimated private memory of all resident models")
+    max_bytes: int = Field(description="Memory budget before LRU eviction")
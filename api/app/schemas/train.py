@@ -1,11 +1,17 @@
-from pydantic import BaseModel, Field
-from typing import Optional
+from pydantic import BaseModel, Field, model_validator
+from typing import List, Optional
 from enum import Enum
+from app.schemas.models import ModelStage
 class TrainingStatus(str, Enum):
     PENDING = "pending"
     RUNNING = "running"
     COMPLETED = "completed"
     FAILED = "failed"
+    CANCELLED = "cancelled"
+class TrainingPriority(str, Enum):
+    HIGH = "high"
+    NORMAL = "normal"
+    LOW = "low"
 class TrainRequest(BaseModel):
     learning_rate: float = Field(
         default=0.001,
@@ -45,6 +51,22 @@ class TrainRequest(BaseModel):
         default=None,
         description="Optional name for this training run"
     )
+    priority: TrainingPriority = Field(
+        default=TrainingPriority.NORMAL,
+        description="Scheduling priority; high and normal use the interactive queue, low uses the bulk queue"
+    )
+    warm_start: bool = Field(
+        default=False,
+        description="Continue training the current Production model on the refresh dataset instead of starting from scratch; "
+                    "the model keeps its own learning_rate, batch_size, hidden_size and dropout, so only epochs may be set"
+    )
+    @model_validator(mode="after")
+    def validate_warm_start_params(self):
+        if self.warm_start:
+            fixed = sorted(self.model_fields_set & {"learning_rate", "batch_size", "hidden_size", "dropout"})
+            if fixed:
+                raise ValueError(f"{', '.join(fixed)} cannot be set with warm_start; the Production model's values are reused")
+        return self
     model_config = {
         "json_schema_extra": {
             "examples": [
@@ -55,7 +77,8 @@ class TrainRequest(BaseModel):
                     "hidden_size": 128,
                     "dropout": 0.2,
                     "experiment_name": "MNIST_Experiments",
-                    "run_name": "my_training_run"
+                    "run_name": "my_training_run",
+                    "priority": "normal"
                 }
             ]
         }
@@ -83,3 +106,83 @@ class TrainStatusResponse(BaseModel):
     status: TrainingStatus = Field(description="Current training status")
     metrics: Optional[dict] = Field(default=None, description="Training metrics if available")
     error: Optional[str] = Field(default=None, description="Error message if failed")
+class SearchStrategy(str, Enum):
+    RANDOM = "random"
+    GRID = "grid"
+class SweepRequest(BaseModel):
+    num_runs: int = Field(
+        default=10,
+        ge=1,
+        le=100,
+        description="Number of configurations to train"
+    )
+    search_strategy: SearchStrategy = Field(
+        default=SearchStrategy.RANDOM,
+        description="Hyperparameter search strategy"
+    )
+    epochs: int = Field(
+        default=5,
+        ge=1,
+        le=100,
+        description="Training epochs per run (random search may override)"
+    )
+    experiment_name: Optional[str] = Field(
+        default=None,
+        description="MLflow experiment name (uses default if not specified)"
+    )
+    metric: str = Field(
+        default="accuracy",
+        description="Metric used to select the best run"
+    )
+    register_best: bool = Field(
+        default=False,
+        description="Register the best run in the model registry"
+    )
+    model_name: Optional[str] = Field(
+        default=None,
+        description="Registered model name (uses default if not specified)"
+    )
+    stage: Optional[ModelStage] = Field(
+        default=ModelStage.STAGING,
+        description="Stage to transition the registered model to"
+    )
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "num_runs": 12,
+                    "search_strategy": "grid",
+                    "epochs": 5,
+                    "experiment_name": "MNIST_Experiments",
+                    "register_best": True,
+                    "stage": "Staging"
+                }
+            ]
+        }
+    }
+class SweepResponse(BaseModel):
+    message: str = Field(description="Status message")
+    sweep_id: str = Field(description="Sweep ID")
+    experiment_name: str = Field(description="MLflow experiment name")
+    num_trials: int = Field(description="Number of dispatched training runs")
+    status: TrainingStatus = Field(description="Sweep status")
+class SweepTrialStatus(BaseModel):
+    job_id: str = Field(description="Training job ID")
+    run_name: Optional[str] = Field(default=None, description="MLflow run name")
+    run_id: Optional[str] = Field(default=None, description="MLflow run ID")
+    status: TrainingStatus = Field(description="Trial status")
+    params: dict = Field(default_factory=dict, description="Trial hyperparameters")
+    error: Optional[str] = Field(default=None, description="Error message if failed")
+class SweepStatusResponse(BaseModel):
+    sweep_id: str = Field(description="Sweep ID")
+    experiment_name: str = Field(description="MLflow experiment name")
+    status: TrainingStatus = Field(description="Sweep status")
+    total: int = Field(description="Number of trials")
+    completed: int = Field(description="Trials finished successfully")
+    failed: int = Field(description="Trials that failed")
+    running: int = Field(description="Trials currently running")
+    trials: List[SweepTrialStatus] = Field(default_factory=list, description="Per-trial status")
+    best_run: Optional[dict] = Field(default=None, description="Best run once the sweep finishes")
+    model_name: Optional[str] = Field(default=None, description="Registered model name")
+    model_version: Optional[str] = Field(default=None, description="Registered model version")
+    error: Optional[str] = Field(default=None, description="Error message if failed")
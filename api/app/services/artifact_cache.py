@@ -0,0 +1,134 @@
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional, Dict, Any, List
+import mlflow
+from app.config import get_settings
+logger = logging.getLogger(__name__)
+class ArtifactCache:
+    MANIFEST_FILE = "manifest.json"
+    MODEL_DIR = "model"
+    def __init__(self, cache_dir: str, max_bytes: int):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+    def _entry_key(self, model_name: str, version: str, run_id: str) -> str:
+        return hashlib.sha256(f"{model_name}:{version}:{run_id}".encode()).hexdigest()[:32]
+    @contextmanager
+    def _file_lock(self, name: str):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.cache_dir / f".{name}.lock", "a") as handle:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+    def _read_manifest(self, entry_dir: Path) -> Optional[Dict[str, Any]]:
+        try:
+            with open(entry_dir / self.MANIFEST_FILE) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    def _dir_size(self, path: Path) -> int:
+        return sum(p.stat().st_size for p in path.rglob("*") if p.is_file())
+    def get_or_download(self, model_name: str, version: str, run_id: str) -> str:
+        key = self._entry_key(model_name, version, run_id)
+        entry_dir = self.cache_dir / key
+        model_dir = entry_dir / self.MODEL_DIR
+        if self._read_manifest(entry_dir):
+            os.utime(entry_dir / self.MANIFEST_FILE)
+            logger.debug(f"Artifact cache hit: {model_name} v{version}")
+            return str(model_dir)
+        with self._file_lock(key):
+            if self._read_manifest(entry_dir):
+                os.utime(entry_dir / self.MANIFEST_FILE)
+                return str(model_dir)
+            staging_dir = self.cache_dir / f".staging-{key}-{os.getpid()}"
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            try:
+                logger.info(f"Downloading model artifacts: {model_name} v{version}")
+                downloaded = mlflow.artifacts.download_artifacts(
+                    artifact_uri=f"models:/{model_name}/{version}",
+                    dst_path=str(staging_dir),
+                )
+                entry_dir.mkdir(parents=True)
+                os.rename(downloaded, model_dir)
+            finally:
+                shutil.rmtree(staging_dir, ignore_errors=True)
+            manifest = {
+                "model_name": model_name,
+                "version": str(version),
+                "run_id": run_id,
+                "size_bytes": self._dir_size(model_dir),
+                "created_at": time.time(),
+            }
+            with open(entry_dir / self.MANIFEST_FILE, "w") as f:
+                json.dump(manifest, f)
+        self.evict(keep=key)
+        return str(model_dir)
+    def update_size(self, model_path: str) -> None:
+        entry_dir = Path(model_path).parent
+        with self._file_lock(entry_dir.name):
+            manifest = self._read_manifest(entry_dir)
+            if manifest is None:
+                return
+            manifest["size_bytes"] = sum(
+                self._dir_size(path) for path in entry_dir.iterdir() if path.is_dir() and not path.name.startswith(".")
+            )
+            staging = entry_dir / f".{self.MANIFEST_FILE}-{os.getpid()}"
+            with open(staging, "w") as f:
+                json.dump(manifest, f)
+            os.replace(staging, entry_dir / self.MANIFEST_FILE)
+        self.evict(keep=entry_dir.name)
+    def list_entries(self) -> List[Dict[str, Any]]:
+        entries = []
+        if not self.cache_dir.exists():
+            return entries
+        for entry_dir in self.cache_dir.iterdir():
+            if not entry_dir.is_dir() or entry_dir.name.startswith("."):
+                continue
+            manifest = self._read_manifest(entry_dir)
+            if manifest is None:
+                continue
+            manifest["key"] = entry_dir.name
+            manifest["last_used_at"] = (entry_dir / self.MANIFEST_FILE).stat().st_mtime
+            entries.append(manifest)
+        return sorted(entries, key=lambda e: e["last_used_at"])
+    def evict(self, keep: Optional[str] = None) -> List[str]:
+        evicted = []
+        with self._file_lock("eviction"):
+            entries = self.list_entries()
+            total = sum(e["size_bytes"] for e in entries)
+            for entry in entries:
+                if total <= self.max_bytes:
+                    break
+                if entry["key"] == keep:
+                    continue
+                with self._file_lock(entry["key"]):
+                    shutil.rmtree(self.cache_dir / entry["key"], ignore_errors=True)
+                total -= entry["size_bytes"]
+                evicted.append(entry["key"])
+                logger.info(
+                    f"Evicted cached artifacts: {entry['model_name']} v{entry['version']}"
+                )
+        return evicted
+    def clear(self) -> None:
+        for entry in self.list_entries():
+            with self._file_lock(entry["key"]):
+                shutil.rmtree(self.cache_dir / entry["key"], ignore_errors=True)
+_artifact_cache: Optional[ArtifactCache] = None
+def get_artifact_cache() -> ArtifactCache:
+    global _artifact_cache
+    if _artifact_cache is None:
+        settings = get_settings()
+        _artifact_cache = ArtifactCache(
+            cache_dir=settings.model_cache_dir,
+            max_bytes=settings.model_cache_max_bytes,
+        )
+    return _artifact_cache
@@ -0,0 +1,91 @@
+import json
+import logging
+import time
+from typing import Any, Callable, Dict, Optional
+import redis
+from app.config import get_settings
+from app.metrics import DRIFT_EVALUATIONS_TOTAL
+from app.services.drift_service import DriftService, get_drift_service
+logger = logging.getLogger(__name__)
+def breach_key(model_name: str) -> str:
+    return f"drift:breach_since:{model_name}"
+def retrain_lock_key(model_name: str) -> str:
+    return f"drift:retrain:lock:{model_name}"
+def last_retrain_key(model_name: str) -> str:
+    return f"drift:retrain:last:{model_name}"
+class DriftMonitor:
+    def __init__(self, redis_client: Optional[redis.Redis] = None, drift_service: Optional[DriftService] = None):
+        self.settings = get_settings()
+        self._redis = redis_client
+        self.drift_service = drift_service or get_drift_service()
+    @property
+    def redis(self) -> redis.Redis:
+        if self._redis is None:
+            self._redis = redis.Redis(
+                host=self.settings.redis_host,
+                port=self.settings.redis_port,
+                db=0,
+                decode_responses=True,
+            )
+        return self._redis
+    def _record(self, result: Dict[str, Any], action: str, **fields: Any) -> Dict[str, Any]:
+        DRIFT_EVALUATIONS_TOTAL.labels(model_name=result["model_name"], action=action).inc()
+        return {**result, "action": action, **fields}
+    def evaluate(self, model_name: str, dispatch: Callable[[Dict[str, Any]], str], now: Optional[float] = None) -> Dict[str, Any]:
+        now = time.time() if now is None else now
+        status = self.drift_service.get_drift_status(
+            model_name=model_name,
+            baseline_hours=self.settings.drift_baseline_hours,
+            current_hours=self.settings.drift_current_hours,
+        )
+        psi = status.get("psi")
+        result = {"model_name": model_name, "psi": psi, "drift_status": status["status"]}
+        if psi is None or psi < self.settings.drift_psi_threshold:
+            self.redis.delete(breach_key(model_name))
+            return self._record(result, "none")
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.set(breach_key(model_name), str(now), nx=True)
+        pipe.expire(breach_key(model_name), self.settings.drift_sustained_seconds + 2 * self.settings.drift_check_interval_seconds)
+        pipe.get(breach_key(model_name))
+        breach_seconds = now - float(pipe.execute()[-1])
+        result["breach_seconds"] = round(breach_seconds, 1)
+        if breach_seconds < self.settings.drift_sustained_seconds:
+            return self._record(result, "pending")
+        cooldown = self.settings.drift_retrain_cooldown_seconds
+        if not self.redis.set(retrain_lock_key(model_name), "dispatching", nx=True, ex=cooldown):
+            return self._record(result, "cooldown", cooldown_remaining=self.redis.ttl(retrain_lock_key(model_name)))
+        try:
+            job_id = dispatch(result)
+        except Exception:
+            self.redis.delete(retrain_lock_key(model_name))
+            raise
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.set(retrain_lock_key(model_name), job_id, xx=True, keepttl=True)
+        pipe.delete(breach_key(model_name))
+        pipe.set(last_retrain_key(model_name), json.dumps({**result, "job_id": job_id, "dispatched_at": now}))
+        pipe.execute()
+        logger.info(f"Drift on {model_name} sustained for {breach_seconds:.0f}s (PSI {psi}); dispatched retraining job {job_id}")
+        return self._record(result, "retrain", job_id=job_id)
+    def get_state(self, model_name: str) -> Dict[str, Any]:
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.get(breach_key(model_name))
+        pipe.get(retrain_lock_key(model_name))
+        pipe.ttl(retrain_lock_key(model_name))
+        pipe.get(last_retrain_key(model_name))
+        breach_since, lock, lock_ttl, last = pipe.execute()
+        return {
+            "model_name": model_name,
+            "enabled": self.settings.drift_retrain_enabled,
+            "mode": self.settings.drift_retrain_mode,
+            "psi_threshold": self.settings.drift_psi_threshold,
+            "sustained_seconds": self.settings.drift_sustained_seconds,
+            "breach_since": float(breach_since) if breach_since else None,
+            "cooldown_remaining": lock_ttl if lock else 0,
+            "last_retrain": json.loads(last) if last else None,
+        }
+_drift_monitor: Optional[DriftMonitor] = None
+def get_drift_monitor() -> DriftMonitor:
+    global _drift_monitor
+    if _drift_monitor is None:
+        _drift_monitor = DriftMonitor()
+    return _drift_monitor
@@ -1,5 +1,7 @@
 import logging
-from typing import Optional, Dict, Any, List
+import os
+import time
+from typing import Optional, Dict, Any, List, Tuple
 from functools import lru_cache
 import numpy as np
 import mlflow
@@ -7,70 +9,165 @@ import mlflow.pyfunc
 from mlflow.exceptions import MlflowException
 from app.config import get_settings
 from app.services.mlflow_service import get_mlflow_service
+from app.services.artifact_cache import get_artifact_cache
+from app.services.shared_weights import share_model_weights
+from app.services.model_cache import ModelCache
 logger = logging.getLogger(__name__)
 class InferenceService:
     def __init__(self):
         self.settings = get_settings()
-        self._model_cache: Dict[str, Any] = {}
-        self._model_info_cache: Dict[str, Dict[str, Any]] = {}
+        self._model_cache = ModelCache(max_bytes=self.settings.model_memory_budget_bytes)
+        self._alias_table: Dict[str, Dict[str, Any]] = {}
+        self._version_info: Dict[str, Dict[str, Any]] = {}
+        self._artifact_cache = get_artifact_cache() if self.settings.model_cache_enabled else None
         mlflow.set_tracking_uri(self.settings.mlflow_tracking_uri)
-    def _get_cache_key(self, model_name: str, stage: str) -> str:
+    def _get_cache_key(self, model_name: str, version: str) -> str:
+        return f"{model_name}@{version}"
+    def _get_alias_key(self, model_name: str, stage: str) -> str:
         return f"{model_name}:{stage}"
-    def load_model(
+    def resolve_version(
         self,
         model_name: str,
         stage: str = "Production",
-        force_reload: bool = False,
-    ) -> Any:
-        cache_key = self._get_cache_key(model_name, stage)
-        if not force_reload and cache_key in self._model_cache:
-            logger.debug(f"Using cached model: {cache_key}")
-            return self._model_cache[cache_key]
-        model_uri = f"models:/{model_name}/{stage}"
-        try:
-            logger.info(f"Loading model from: {model_uri}")
-            model = mlflow.pyfunc.load_model(model_uri)
-            self._model_cache[cache_key] = model
-            self._update_model_info_cache(model_name, stage)
-            return model
-        except MlflowException as e:
-            logger.error(f"Failed to load model {model_uri}: {e}")
-            raise ValueError(f"No {stage} model found for '{model_name}'")
-    def _update_model_info_cache(self, model_name: str, stage: str) -> None:
+        force_refresh: bool = False,
+    ) -> Dict[str, Any]:
+        alias_key = self._get_alias_key(model_name, stage)
+        cached = self._alias_table.get(alias_key)
+        if (
+            cached is not None
+            and not force_refresh
+            and time.monotonic() - cached["resolved_at"] < self.settings.model_alias_ttl_seconds
+        ):
+            return cached
         try:
             mlflow_service = get_mlflow_service()
             versions = mlflow_service.client.get_latest_versions(
                 model_name, stages=[stage]
             )
-            if versions:
-                v = versions[0]
-                cache_key = self._get_cache_key(model_name, stage)
-                self._model_info_cache[cache_key] = {
-                    "version": v.version,
-                    "stage": v.current_stage,
-                    "run_id": v.run_id,
-                }
+        except MlflowException as e:
+            logger.error(f"Failed to resolve {stage} version of '{model_name}': {e}")
+            raise ValueError(f"No {stage} model found for '{model_name}'")
         except Exception as e:
-            logger.warning(f"Failed to cache model info: {e}")
+            if cached is None:
+                raise
+            logger.warning(f"Using stale {alias_key} -> v{cached['version']} mapping: {e}")
+            return cached
+        if not versions:
+            self._alias_table.pop(alias_key, None)
+            raise ValueError(f"No {stage} model found for '{model_name}'")
+        v = versions[0]
+        info = {
+            "model_name": model_name,
+            "version": str(v.version),
+            "stage": stage,
+            "run_id": v.run_id,
+            "resolved_at": time.monotonic(),
+        }
+        if cached is not None and cached["version"] != info["version"]:
+            logger.info(f"{alias_key} moved from v{cached['version']} to v{info['version']}")
+        self._alias_table[alias_key] = info
+        self._version_info[self._get_cache_key(model_name, info["version"])] = info
+        return info
+    def get_version_info(self, model_name: str, version: str) -> Dict[str, Any]:
+        cache_key = self._get_cache_key(model_name, version)
+        cached = self._version_info.get(cache_key)
+        if cached is not None and time.monotonic() - cached["resolved_at"] < self.settings.model_alias_ttl_seconds:
+            return cached
+        try:
+            mlflow_service = get_mlflow_service()
+            v = mlflow_service.client.get_model_version(model_name, str(version))
+        except MlflowException as e:
+            logger.error(f"Failed to look up {model_name} v{version}: {e}")
+            raise ValueError(f"Version {version} of '{model_name}' not found")
+        info = {
+            "model_name": model_name,
+            "version": str(v.version),
+            "stage": v.current_stage,
+            "run_id": v.run_id,
+            "resolved_at": time.monotonic(),
+        }
+        self._version_info[cache_key] = info
+        return info
+    def load_version(self, model_name: str, version: str, run_id: Optional[str] = None) -> Any:
+        cache_key = self._get_cache_key(model_name, version)
+        model_uri = f"models:/{model_name}/{version}"
+        def _load() -> Any:
+            logger.info(f"Loading model from: {model_uri}")
+            return self._load_pyfunc(model_uri, model_name, version, run_id)
+        try:
+            return self._model_cache.get_or_load(
+                cache_key,
+                _load,
+                model_name=model_name,
+                version=str(version),
+                run_id=run_id,
+            )
+        except MlflowException as e:
+            logger.error(f"Failed to load model {model_uri}: {e}")
+            raise ValueError(f"Failed to load version {version} of '{model_name}'")
+    def load_model(
+        self,
+        model_name: str,
+        stage: str = "Production",
+        force_reload: bool = False,
+    ) -> Any:
+        info = self.resolve_version(model_name, stage, force_refresh=force_reload)
+        if force_reload:
+            self._model_cache.invalidate(self._get_cache_key(model_name, info["version"]))
+        return self.load_version(model_name, info["version"], info["run_id"])
+    def _load_pyfunc(
+        self,
+        model_uri: str,
+        model_name: str,
+        version: str,
+        run_id: Optional[str],
+    ) -> Any:
+        if self._artifact_cache is None or not run_id:
+            return mlflow.pyfunc.load_model(model_uri)
+        try:
+            local_path = self._artifact_cache.get_or_download(model_name, version, run_id)
+        except OSError as e:
+            logger.warning(f"Artifact cache unavailable for {model_name} v{version}, loading directly: {e}")
+            return mlflow.pyfunc.load_model(model_uri)
+        model = mlflow.pyfunc.load_model(local_path)
+        if self.settings.model_shared_weights:
+            weights_dir = os.path.join(os.path.dirname(local_path), "weights")
+            try:
+                share_model_weights(model._model_impl, weights_dir)
+            except ValueError as e:
+                logger.warning(f"Shared weights unusable for {model_name} v{version}, keeping private copy: {e}")
+            self._artifact_cache.update_size(local_path)
+        return model
     def get_model_info(
         self,
         model_name: str,
         stage: str = "Production",
     ) -> Optional[Dict[str, Any]]:
-        cache_key = self._get_cache_key(model_name, stage)
-        return self._model_info_cache.get(cache_key)
+        return self._alias_table.get(self._get_alias_key(model_name, stage))
+    def _resolve_for_request(
+        self,
+        model_name: str,
+        stage: str,
+        version: Optional[str],
+    ) -> Tuple[Any, Dict[str, Any]]:
+        if version is not None:
+            info = self.get_version_info(model_name, version)
+        else:
+            info = self.resolve_version(model_name, stage)
+        model = self.load_version(model_name, info["version"], info["run_id"])
+        return model, info
     def predict(
         self,
         image_data: List[float],
         model_name: Optional[str] = None,
         stage: str = "Production",
+        version: Optional[str] = None,
     ) -> Dict[str, Any]:
         model_name = model_name or self.settings.model_name
-        model = self.load_model(model_name, stage)
-        input_array = np.array(image_data).reshape(1, -1)
+        model, model_info = self._resolve_for_request(model_name, stage, version)
+        input_array = np.asarray(image_data, dtype=self.settings.inference_dtype).reshape(1, -1)
         input_array = input_array / 255.0 if input_array.max() > 1.0 else input_array
         predictions = model.predict(input_array)
-        model_info = self.get_model_info(model_name, stage) or {}
         if hasattr(predictions, 'tolist'):
             prediction = int(predictions[0])
             probabilities = [0.0] * 10
@@ -94,21 +191,21 @@ class InferenceService:
             "confidence": confidence,
             "probabilities": probabilities,
             "model_name": model_name,
-            "model_version": model_info.get("version", "unknown"),
-            "model_stage": stage,
+            "model_version": model_info["version"],
+            "model_stage": stage if version is None else model_info.get("stage") or "None",
         }
     def predict_batch(
         self,
         images: List[List[float]],
         model_name: Optional[str] = None,
         stage: str = "Production",
+        version: Optional[str] = None,
     ) -> Dict[str, Any]:
         model_name = model_name or self.settings.model_name
-        model = self.load_model(model_name, stage)
-        input_array = np.array(images)
+        model, model_info = self._resolve_for_request(model_name, stage, version)
+        input_array = np.asarray(images, dtype=self.settings.inference_dtype)
         input_array = input_array / 255.0 if input_array.max() > 1.0 else input_array
         predictions = model.predict(input_array)
-        model_info = self.get_model_info(model_name, stage) or {}
         confidences = [1.0] * len(predictions)
         try:
             unwrapped = model._model_impl
@@ -121,12 +218,28 @@ class InferenceService:
             "predictions": [int(p) for p in predictions],
             "confidences": confidences,
             "model_name": model_name,
-            "model_version": model_info.get("version", "unknown"),
+            "model_version": model_info["version"],
             "batch_size": len(images),
         }
+    def list_cached_models(self) -> List[Dict[str, Any]]:
+        cached = []
+        for entry in self._model_cache.entries():
+            stages = [
+                alias["stage"]
+                for alias in self._alias_table.values()
+                if self._get_cache_key(alias["model_name"], alias["version"]) == entry["key"]
+            ]
+            cached.append({**entry, "stages": stages})
+        return cached
+    def get_cache_stats(self) -> Dict[str, Any]:
+        return {
+            "total_bytes": self._model_cache.total_bytes,
+            "max_bytes": self._model_cache.max_bytes,
+        }
     def clear_cache(self) -> None:
         self._model_cache.clear()
-        self._model_info_cache.clear()
+        self._alias_table.clear()
+        self._version_info.clear()
         logger.info("Model cache cleared")
 _inference_service: Optional[InferenceService] = None
 def get_inference_service() -> InferenceService:
@@ -0,0 +1,195 @@
+import json
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+import redis
+from app.config import get_settings
+from app.schemas.train import TrainingStatus
+logger = logging.getLogger(__name__)
+TERMINAL_STATUSES = (TrainingStatus.COMPLETED, TrainingStatus.FAILED, TrainingStatus.CANCELLED)
+@dataclass
+class TrainingJob:
+    job_id: str
+    run_id: Optional[str] = None
+    experiment_name: str = ""
+    status: TrainingStatus = TrainingStatus.PENDING
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    error: Optional[str] = None
+    params: Dict[str, Any] = field(default_factory=dict)
+@dataclass
+class SweepJob:
+    sweep_id: str
+    experiment_name: str
+    trials: List[Dict[str, Any]] = field(default_factory=list)
+    status: TrainingStatus = TrainingStatus.PENDING
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    summary: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+def job_key(job_id: str) -> str:
+    return f"training:job:{job_id}"
+def sweep_key(sweep_id: str) -> str:
+    return f"training:sweep:{sweep_id}"
+def cancel_key(job_id: str) -> str:
+    return f"training:cancel:{job_id}"
+def index_key(status: Optional[str] = None, experiment_name: Optional[str] = None) -> str:
+    key = "training:jobs:index"
+    if experiment_name:
+        key += f":experiment:{experiment_name}"
+    if status:
+        key += f":status:{_encode(status)}"
+    return key
+def _encode(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, TrainingStatus):
+        return value.value
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return str(value)
+def _decode_job(data: Dict[str, str]) -> TrainingJob:
+    return TrainingJob(
+        job_id=data["job_id"],
+        run_id=data.get("run_id") or None,
+        experiment_name=data.get("experiment_name", ""),
+        status=TrainingStatus(data.get("status") or TrainingStatus.PENDING.value),
+        started_at=datetime.fromisoformat(data["started_at"]) if data.get("started_at") else None,
+        completed_at=datetime.fromisoformat(data["completed_at"]) if data.get("completed_at") else None,
+        error=data.get("error") or None,
+        params=json.loads(data["params"]) if data.get("params") else {},
+    )
+def _decode_sweep(data: Dict[str, str]) -> SweepJob:
+    return SweepJob(
+        sweep_id=data["sweep_id"],
+        experiment_name=data.get("experiment_name", ""),
+        trials=json.loads(data["trials"]) if data.get("trials") else [],
+        status=TrainingStatus(data.get("status") or TrainingStatus.PENDING.value),
+        started_at=datetime.fromisoformat(data["started_at"]) if data.get("started_at") else None,
+        completed_at=datetime.fromisoformat(data["completed_at"]) if data.get("completed_at") else None,
+        summary=json.loads(data["summary"]) if data.get("summary") else None,
+        error=data.get("error") or None,
+    )
+class JobStore:
+    def __init__(self, redis_client: Optional[redis.Redis] = None):
+        self.settings = get_settings()
+        self._redis = redis_client
+    @property
+    def redis(self) -> redis.Redis:
+        if self._redis is None:
+            self._redis = redis.Redis(
+                host=self.settings.redis_host,
+                port=self.settings.redis_port,
+                db=0,
+                decode_responses=True,
+            )
+        return self._redis
+    def _index_keys(self, status: str, experiment_name: str) -> List[str]:
+        return [
+            index_key(),
+            index_key(status=status),
+            index_key(experiment_name=experiment_name),
+            index_key(status=status, experiment_name=experiment_name),
+        ]
+    def _queue_create(self, pipe, job: TrainingJob) -> None:
+        created_at = job.started_at or datetime.utcnow()
+        score = created_at.timestamp()
+        status = _encode(job.status)
+        pipe.hset(job_key(job.job_id), mapping={
+            "job_id": job.job_id,
+            "run_id": _encode(job.run_id),
+            "experiment_name": job.experiment_name,
+            "status": status,
+            "started_at": _encode(created_at),
+            "completed_at": _encode(job.completed_at),
+            "error": _encode(job.error),
+            "params": json.dumps(job.params),
+            "created_ts": str(score),
+        })
+        for key in self._index_keys(status, job.experiment_name):
+            pipe.zadd(key, {job.job_id: score})
+    def create(self, job: TrainingJob) -> TrainingJob:
+        pipe = self.redis.pipeline(transaction=True)
+        self._queue_create(pipe, job)
+        pipe.execute()
+        return job
+    def create_many(self, jobs: List[TrainingJob]) -> List[TrainingJob]:
+        pipe = self.redis.pipeline(transaction=True)
+        for job in jobs:
+            self._queue_create(pipe, job)
+        pipe.execute()
+        return jobs
+    def exists(self, job_id: str) -> bool:
+        return bool(self.redis.exists(job_key(job_id)))
+    def get(self, job_id: str) -> Optional[TrainingJob]:
+        data = self.redis.hgetall(job_key(job_id))
+        return _decode_job(data) if data else None
+    def update(self, job_id: str, **fields: Any) -> bool:
+        key = job_key(job_id)
+        def apply(pipe) -> bool:
+            current = pipe.hmget(key, "status", "experiment_name", "created_ts")
+            old_status, experiment_name, created_ts = current
+            if old_status is None:
+                return False
+            pipe.multi()
+            pipe.hset(key, mapping={name: _encode(value) for name, value in fields.items()})
+            new_status = _encode(fields.get("status")) or old_status
+            if new_status != old_status:
+                score = float(created_ts)
+                for old_key, new_key in zip(
+                    self._index_keys(old_status, experiment_name),
+                    self._index_keys(new_status, experiment_name),
+                ):
+                    if old_key != new_key:
+                        pipe.zrem(old_key, job_id)
+                        pipe.zadd(new_key, {job_id: score})
+            return True
+        return self.redis.transaction(apply, key, value_from_callable=True)
+    def create_sweep(self, sweep: SweepJob) -> SweepJob:
+        self.redis.hset(sweep_key(sweep.sweep_id), mapping={
+            "sweep_id": sweep.sweep_id,
+            "experiment_name": sweep.experiment_name,
+            "trials": json.dumps(sweep.trials),
+            "status": _encode(sweep.status),
+            "started_at": _encode(sweep.started_at),
+            "completed_at": _encode(sweep.completed_at),
+            "summary": _encode(sweep.summary),
+            "error": _encode(sweep.error),
+        })
+        return sweep
+    def get_sweep(self, sweep_id: str) -> Optional[SweepJob]:
+        data = self.redis.hgetall(sweep_key(sweep_id))
+        return _decode_sweep(data) if data else None
+    def update_sweep(self, sweep_id: str, **fields: Any) -> None:
+        self.redis.hset(sweep_key(sweep_id), mapping={name: _encode(value) for name, value in fields.items()})
+    def request_cancel(self, job_id: str) -> None:
+        self.redis.set(cancel_key(job_id), "1", ex=self.settings.progress_ttl_seconds)
+    def is_cancel_requested(self, job_id: str) -> bool:
+        return bool(self.redis.exists(cancel_key(job_id)))
+    def count(self, status: Optional[str] = None, experiment_name: Optional[str] = None) -> int:
+        return self.redis.zcard(index_key(status=status, experiment_name=experiment_name))
+    def list(
+        self,
+        status: Optional[str] = None,
+        experiment_name: Optional[str] = None,
+        offset: int = 0,
+        limit: int = 50,
+    ) -> List[TrainingJob]:
+        job_ids = self.redis.zrevrange(index_key(status=status, experiment_name=experiment_name), offset, offset + limit - 1)
+        return self.get_many(job_ids)
+    def get_many(self, job_ids: List[str]) -> List[TrainingJob]:
+        if not job_ids:
+            return []
+        pipe = self.redis.pipeline(transaction=False)
+        for job_id in job_ids:
+            pipe.hgetall(job_key(job_id))
+        return [_decode_job(data) for data in pipe.execute() if data]
+_job_store: Optional[JobStore] = None
+def get_job_store() -> JobStore:
+    global _job_store
+    if _job_store is None:
+        _job_store = JobStore()
+    return _job_store
@@ -0,0 +1,163 @@
+import logging
+import mmap
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from types import ModuleType
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import numpy as np
+from app.metrics import MODEL_LOAD_DURATION_SECONDS, MODEL_LOAD_COALESCED_TOTAL
+from app.services.single_flight import SingleFlight
+logger = logging.getLogger(__name__)
+def estimate_model_bytes(model: Any) -> Tuple[int, int]:
+    private_bytes = 0
+    shared_bytes = 0
+    seen = set()
+    stack = [model]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, (type, ModuleType)) or callable(obj) and not hasattr(obj, "get_params"):
+            continue
+        seen.add(id(obj))
+        if isinstance(obj, np.ndarray):
+            base = obj
+            while isinstance(base, np.ndarray) and base.base is not None and not isinstance(base, np.memmap):
+                base = base.base
+            if isinstance(base, (np.memmap, mmap.mmap)):
+                shared_bytes += obj.nbytes
+            else:
+                private_bytes += obj.nbytes
+            continue
+        private_bytes += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        elif hasattr(obj, "__dict__"):
+            stack.append(vars(obj))
+    return private_bytes, shared_bytes
+@dataclass
+class CacheEntry:
+    key: str
+    model: Any
+    size_bytes: int
+    shared_bytes: int = 0
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    loaded_at: datetime = field(default_factory=datetime.utcnow)
+    last_accessed_at: datetime = field(default_factory=datetime.utcnow)
+    hits: int = 0
+class ModelCache:
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._flight = SingleFlight()
+        self._generation = 0
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._entries
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+    @property
+    def total_bytes(self) -> int:
+        with self._lock:
+            return sum(e.size_bytes for e in self._entries.values())
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            entry.hits += 1
+            entry.last_accessed_at = datetime.utcnow()
+            return entry.model
+    def get_entry(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            return self._entries.get(key)
+    def put(self, key: str, model: Any, **metadata) -> CacheEntry:
+        size_bytes, shared_bytes = estimate_model_bytes(model)
+        entry = CacheEntry(
+            key=key,
+            model=model,
+            size_bytes=size_bytes,
+            shared_bytes=shared_bytes,
+            metadata=metadata,
+        )
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            self._evict(keep=key)
+        logger.info(
+            f"Cached model {key}: {size_bytes / 1024 / 1024:.1f} MB private, "
+            f"{shared_bytes / 1024 / 1024:.1f} MB shared"
+        )
+        return entry
+    def _evict(self, keep: str) -> None:
+        total = sum(e.size_bytes for e in self._entries.values())
+        for key in list(self._entries.keys()):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            evicted = self._entries.pop(key)
+            total -= evicted.size_bytes
+            logger.info(f"Evicted model {key} from memory cache ({evicted.hits} hits)")
+    def get_or_load(self, key: str, loader: Callable[[], Any], **metadata) -> Any:
+        model = self.get(key)
+        if model is not None:
+            return model
+        model_name = metadata.get("model_name", key)
+        with self._lock:
+            generation = self._generation
+        def _load_and_store() -> Any:
+            cached = self.get(key)
+            if cached is not None:
+                return cached
+            start = time.perf_counter()
+            try:
+                loaded = loader()
+            except Exception:
+                MODEL_LOAD_DURATION_SECONDS.labels(model_name=model_name, outcome="error").observe(
+                    time.perf_counter() - start
+                )
+                raise
+            MODEL_LOAD_DURATION_SECONDS.labels(model_name=model_name, outcome="success").observe(
+                time.perf_counter() - start
+            )
+            with self._lock:
+                if self._generation == generation:
+                    self.put(key, loaded, **metadata)
+            return loaded
+        model, coalesced = self._flight.do(key, _load_and_store)
+        if coalesced:
+            MODEL_LOAD_COALESCED_TOTAL.labels(model_name=model_name).inc()
+        return model
+    def in_flight(self) -> Dict[str, int]:
+        return self._flight.in_flight()
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.pop(key, None)
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+    def entries(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [
+                {
+                    "key": e.key,
+                    "size_bytes": e.size_bytes,
+                    "shared_bytes": e.shared_bytes,
+                    "hits": e.hits,
+                    "loaded_at": e.loaded_at,
+                    "last_accessed_at": e.last_accessed_at,
+                    **e.metadata,
+                }
+                for e in reversed(self._entries.values())
+            ]
@@ -0,0 +1,83 @@
+import json
+import logging
+from typing import Any, AsyncIterator, Dict, Optional
+import redis
+import redis.asyncio as aioredis
+from app.config import get_settings
+logger = logging.getLogger(__name__)
+TERMINAL_STATUSES = ("completed", "failed", "cancelled")
+def progress_channel(job_id: str) -> str:
+    return f"training:progress:{job_id}"
+def progress_snapshot_key(job_id: str) -> str:
+    return f"training:progress:last:{job_id}"
+class ProgressService:
+    def __init__(self, redis_client: Optional[redis.Redis] = None, async_redis_client: Optional[aioredis.Redis] = None):
+        self.settings = get_settings()
+        self._redis = redis_client
+        self._async_redis = async_redis_client
+    @property
+    def redis(self) -> redis.Redis:
+        if self._redis is None:
+            self._redis = redis.Redis(
+                host=self.settings.redis_host,
+                port=self.settings.redis_port,
+                db=0,
+                decode_responses=True,
+            )
+        return self._redis
+    @property
+    def async_redis(self) -> aioredis.Redis:
+        if self._async_redis is None:
+            self._async_redis = aioredis.Redis(
+                host=self.settings.redis_host,
+                port=self.settings.redis_port,
+                db=0,
+                decode_responses=True,
+            )
+        return self._async_redis
+    def publish(self, job_id: str, status: str, **fields: Any) -> None:
+        event = {"job_id": job_id, "status": status, **fields}
+        payload = json.dumps(event)
+        try:
+            pipe = self.redis.pipeline()
+            pipe.set(progress_snapshot_key(job_id), payload, ex=self.settings.progress_ttl_seconds)
+            pipe.publish(progress_channel(job_id), payload)
+            pipe.execute()
+        except Exception as e:
+            logger.warning(f"Failed to publish progress for job {job_id}: {e}")
+    def get_last(self, job_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            payload = self.redis.get(progress_snapshot_key(job_id))
+        except Exception as e:
+            logger.warning(f"Failed to read progress for job {job_id}: {e}")
+            return None
+        return json.loads(payload) if payload else None
+    async def stream(self, job_id: str, keepalive: Optional[float] = None) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        keepalive = keepalive or self.settings.progress_keepalive_seconds
+        pubsub = self.async_redis.pubsub()
+        await pubsub.subscribe(progress_channel(job_id))
+        try:
+            payload = await self.async_redis.get(progress_snapshot_key(job_id))
+            if payload:
+                event = json.loads(payload)
+                yield event
+                if event.get("status") in TERMINAL_STATUSES:
+                    return
+            while True:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=keepalive)
+                if message is None:
+                    yield None
+                    continue
+                event = json.loads(message["data"])
+                yield event
+                if event.get("status") in TERMINAL_STATUSES:
+                    return
+        finally:
+            await pubsub.unsubscribe(progress_channel(job_id))
+            await pubsub.aclose()
+_progress_service: Optional[ProgressService] = None
+def get_progress_service() -> ProgressService:
+    global _progress_service
+    if _progress_service is None:
+        _progress_service = ProgressService()
+    return _progress_service
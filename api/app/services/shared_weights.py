@@ -0,0 +1,83 @@
+import ctypes
+import json
+import logging
+import os
+import shutil
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, Dict, List, Optional
+import numpy as np
+logger = logging.getLogger(__name__)
+INDEX_FILE = "index.json"
+MIN_SHARED_BYTES = 64 * 1024
+def _walk_arrays(obj: Any, visit: Callable, seen: Dict[int, Any]) -> None:
+    if id(obj) in seen:
+        return
+    seen[id(obj)] = obj
+    if isinstance(obj, dict):
+        items = list(obj.items())
+    elif isinstance(obj, list):
+        items = list(enumerate(obj))
+    elif isinstance(obj, tuple):
+        items = [(None, value) for value in obj]
+    elif hasattr(obj, "__dict__") and not isinstance(obj, (type, ModuleType)):
+        items = list(vars(obj).items())
+        obj = vars(obj)
+    else:
+        return
+    for key, value in items:
+        if isinstance(value, np.ndarray):
+            if key is None or value.dtype == object or value.nbytes < MIN_SHARED_BYTES:
+                continue
+            if id(value) not in seen:
+                seen[id(value)] = visit(value)
+            if seen[id(value)] is not None:
+                obj[key] = seen[id(value)]
+        elif not callable(value) or hasattr(value, "get_params"):
+            _walk_arrays(value, visit, seen)
+def _collect_arrays(model: Any) -> List[np.ndarray]:
+    arrays = []
+    _walk_arrays(model, lambda array: arrays.append(array), {})
+    return arrays
+def export_weights(model: Any, weights_dir: str) -> int:
+    target = Path(weights_dir)
+    if (target / INDEX_FILE).exists():
+        return 0
+    staging = target.parent / f".{target.name}-{os.getpid()}"
+    shutil.rmtree(staging, ignore_errors=True)
+    staging.mkdir(parents=True)
+    index = []
+    for i, array in enumerate(_collect_arrays(model)):
+        np.save(staging / f"array_{i}.npy", np.ascontiguousarray(array))
+        index.append({"shape": list(array.shape), "dtype": str(array.dtype)})
+    with open(staging / INDEX_FILE, "w") as f:
+        json.dump(index, f)
+    try:
+        os.rename(staging, target)
+    except OSError:
+        shutil.rmtree(staging, ignore_errors=True)
+        return 0
+    return len(index)
+def attach_weights(model: Any, weights_dir: str) -> int:
+    target = Path(weights_dir)
+    with open(target / INDEX_FILE) as f:
+        index = json.load(f)
+    specs = [{"shape": list(array.shape), "dtype": str(array.dtype)} for array in _collect_arrays(model)]
+    if specs != index:
+        raise ValueError(f"Shared weights in {weights_dir} do not match the model")
+    counter = iter(range(len(index)))
+    _walk_arrays(model, lambda array: np.load(target / f"array_{next(counter)}.npy", mmap_mode="r"), {})
+    return len(index)
+def _release_freed_memory() -> None:
+    try:
+        ctypes.CDLL("libc.so.6").malloc_trim(0)
+    except (OSError, AttributeError):
+        pass
+def share_model_weights(model: Any, weights_dir: str) -> int:
+    exported = export_weights(model, weights_dir)
+    if exported:
+        logger.info(f"Exported {exported} weight arrays to {weights_dir}")
+    attached = attach_weights(model, weights_dir)
+    _release_freed_memory()
+    logger.info(f"Attached {attached} memory-mapped weight arrays from {weights_dir}")
+    return attached
@@ -1,27 +1,21 @@
 import logging
-from typing import Optional, Dict, Any
-from dataclasses import dataclass, field
+import uuid
+from typing import Optional, Dict, Any, List
 from datetime import datetime
-from celery.result import AsyncResult
+from celery import chord
 from app.config import get_settings
 from app.schemas.train import TrainingStatus
-from app.tasks import train_model_task
-from app.worker import celery_app
+from app.services.progress_service import get_progress_service
+from app.services.job_store import TERMINAL_STATUSES, JobStore, SweepJob, TrainingJob, get_job_store
+from app.tasks import train_model_task, finalize_sweep_task
+from app.signals import RESULT_STATUSES
+from app.worker import celery_app, route_for_priority
+from ml_core.experiments.run_experiments import build_sweep_trials
 logger = logging.getLogger(__name__)
-@dataclass
-class TrainingJob:
-    job_id: str
-    run_id: Optional[str] = None
-    experiment_name: str = ""
-    status: TrainingStatus = TrainingStatus.PENDING
-    started_at: Optional[datetime] = None
-    completed_at: Optional[datetime] = None
-    error: Optional[str] = None
-    params: Dict[str, Any] = field(default_factory=dict)
 class TrainingService:
-    def __init__(self):
+    def __init__(self, job_store: Optional[JobStore] = None):
         self.settings = get_settings()
-        self._jobs: Dict[str, TrainingJob] = {}
+        self.job_store = job_store or get_job_store()
     async def start_training(
         self,
         learning_rate: float,
@@ -31,6 +25,8 @@ class TrainingService:
         dropout: float,
         experiment_name: Optional[str] = None,
         run_name: Optional[str] = None,
+        priority: str = "normal",
+        warm_start: bool = False,
     ) -> TrainingJob:
         exp_name = experiment_name or self.settings.experiment_name
         params = {
@@ -40,47 +36,256 @@ class TrainingService:
             "hidden_size": hidden_size,
             "dropout": dropout,
             "run_name": run_name,
-            "random_seed": self.settings.random_seed
+            "random_seed": self.settings.random_seed,
+            "priority": priority,
+            "warm_start": warm_start,
         }
-        task = train_model_task.delay(
-            metrics={},
-            params=params,
-            experiment_name=exp_name,
-            run_name=run_name
-        )
-        job_id = task.id
         job = TrainingJob(
-            job_id=job_id,
+            job_id=str(uuid.uuid4()),
             experiment_name=exp_name,
             status=TrainingStatus.PENDING,
             params=params,
             started_at=datetime.utcnow()
         )
-        self._jobs[job_id] = job
-        logger.info(f"Dispatched training job {job_id} to Celery")
+        self.job_store.create(job)
+        try:
+            train_model_task.apply_async(
+                kwargs={
+                    "metrics": {},
+                    "params": params,
+                    "experiment_name": exp_name,
+                    "run_name": run_name,
+                },
+                task_id=job.job_id,
+                **route_for_priority(priority),
+            )
+        except Exception as e:
+            self.job_store.update(
+                job.job_id,
+                status=TrainingStatus.FAILED,
+                error=f"Dispatch failed: {e}",
+                completed_at=datetime.utcnow(),
+            )
+            raise
+        logger.info(f"Dispatched training job {job.job_id} to Celery")
+        return job
+    def has_job(self, job_id: str) -> bool:
+        return self.job_store.exists(job_id)
+    def _fetch_task_meta(self, task_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        if not task_ids:
+            return {}
+        backend = celery_app.backend
+        keys = [backend.get_key_for_task(task_id) for task_id in task_ids]
+        try:
+            values = backend.mget(keys)
+        except Exception as e:
+            logger.warning(f"Failed to fetch task states for {len(task_ids)} tasks: {e}")
+            return {}
+        return {
+            task_id: backend.decode_result(value)
+            for task_id, value in zip(task_ids, values)
+            if value
+        }
+    @staticmethod
+    def _updates_from_meta(meta: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        if not meta:
+            return {}
+        state = meta.get("status")
+        result = meta.get("result")
+        if state == 'SUCCESS':
+            result_data = result if isinstance(result, dict) else {}
+            return {
+                "status": RESULT_STATUSES.get(result_data.get("status"), TrainingStatus.FAILED),
+                "run_id": result_data.get("run_id"),
+                "error": result_data.get("error"),
+            }
+        if state == 'FAILURE':
+            return {"status": TrainingStatus.FAILED, "error": str(result)}
+        if state == 'REVOKED':
+            return {"status": TrainingStatus.CANCELLED, "error": str(result)}
+        if state in ['STARTED', 'RETRY']:
+            return {"status": TrainingStatus.RUNNING}
+        return {}
+    def _apply_updates(self, job: TrainingJob, updates: Dict[str, Any]) -> TrainingJob:
+        if updates.get("status", job.status) in TERMINAL_STATUSES and job.completed_at is None:
+            updates["completed_at"] = datetime.utcnow()
+        if updates and any(getattr(job, name) != value for name, value in updates.items()):
+            self.job_store.update(job.job_id, **updates)
+            for name, value in updates.items():
+                setattr(job, name, value)
         return job
+    def _refresh_jobs(self, jobs: List[TrainingJob]) -> List[TrainingJob]:
+        active = [job for job in jobs if job.status not in TERMINAL_STATUSES]
+        metas = self._fetch_task_meta([job.job_id for job in active])
+        for job in active:
+            self._apply_updates(job, self._updates_from_meta(metas.get(job.job_id)))
+        return jobs
     def get_job(self, job_id: str) -> Optional[TrainingJob]:
-        job = self._jobs.get(job_id)
-        if not job:
-            return None
-        task_result = AsyncResult(job_id, app=celery_app)
-        if task_result.state == 'SUCCESS':
-            job.status = TrainingStatus.COMPLETED
-            result_data = task_result.result
-            if isinstance(result_data, dict):
-                job.run_id = result_data.get("run_id")
-            job.completed_at = datetime.utcnow()
-        elif task_result.state == 'FAILURE':
-            job.status = TrainingStatus.FAILED
-            job.error = str(task_result.result)
-            job.completed_at = datetime.utcnow()
-        elif task_result.state in ['STARTED', 'RETRY']:
-            job.status = TrainingStatus.RUNNING
+        job = self.job_store.get(job_id)
+        if not job or job.status in TERMINAL_STATUSES:
+            return job
+        snapshot = get_progress_service().get_last(job_id)
+        if not snapshot:
+            return self._refresh_jobs([job])[0]
+        updates = {"status": TrainingStatus(snapshot["status"])}
+        if snapshot.get("run_id"):
+            updates["run_id"] = snapshot["run_id"]
+        if snapshot.get("error"):
+            updates["error"] = snapshot["error"]
+        return self._apply_updates(job, updates)
+    def cancel_job(self, job_id: str) -> Optional[TrainingJob]:
+        job = self.get_job(job_id)
+        if job is None or job.status in TERMINAL_STATUSES:
+            return job
+        self.job_store.request_cancel(job_id)
+        if not job.params.get("sweep_id"):
+            celery_app.control.revoke(job_id)
+        if job.status == TrainingStatus.PENDING:
+            self._apply_updates(job, {"status": TrainingStatus.CANCELLED, "error": "Cancelled before it started"})
+            get_progress_service().publish(job_id, TrainingStatus.CANCELLED.value, error=job.error)
+        logger.info(f"Cancellation requested for training job {job_id} ({job.status.value})")
         return job
-    def list_jobs(self) -> list:
-        for job_id in self._jobs:
-            self.get_job(job_id)
-        return list(self._jobs.values())
+    def list_jobs(
+        self,
+        status: Optional[TrainingStatus] = None,
+        experiment_name: Optional[str] = None,
+        offset: int = 0,
+        limit: int = 50,
+    ) -> List[TrainingJob]:
+        jobs = self.job_store.list(status=status, experiment_name=experiment_name, offset=offset, limit=limit)
+        return self._refresh_jobs(jobs)
+    def count_jobs(self, status: Optional[TrainingStatus] = None, experiment_name: Optional[str] = None) -> int:
+        return self.job_store.count(status=status, experiment_name=experiment_name)
+    async def start_sweep(
+        self,
+        num_runs: int,
+        search_strategy: str = "random",
+        epochs: int = 5,
+        experiment_name: Optional[str] = None,
+        metric: str = "accuracy",
+        register_best: bool = False,
+        model_name: Optional[str] = None,
+        stage: Optional[str] = None,
+    ) -> SweepJob:
+        exp_name = experiment_name or self.settings.experiment_name
+        sweep_id = str(uuid.uuid4())
+        trials = build_sweep_trials(
+            num_runs=num_runs,
+            experiment_name=exp_name,
+            epochs=epochs,
+            search_strategy=search_strategy,
+            random_seed=self.settings.random_seed,
+        )
+        started_at = datetime.utcnow()
+        header = []
+        trial_jobs = []
+        for trial in trials:
+            trial["job_id"] = str(uuid.uuid4())
+            params = {k: v for k, v in trial.items() if k not in ("experiment_name", "job_id")}
+            params["reuse_existing"] = True
+            trial_jobs.append(TrainingJob(
+                job_id=trial["job_id"],
+                experiment_name=exp_name,
+                status=TrainingStatus.PENDING,
+                params={**params, "priority": "low", "sweep_id": sweep_id},
+                started_at=started_at,
+            ))
+            header.append(
+                train_model_task.s(
+                    metrics={},
+                    params=params,
+                    experiment_name=exp_name,
+                    run_name=trial["run_name"],
+                    tags={"sweep_id": sweep_id},
+                    raise_on_failure=False,
+                ).set(task_id=trial["job_id"], **route_for_priority("low"))
+            )
+        callback = finalize_sweep_task.s(
+            sweep_id=sweep_id,
+            experiment_name=exp_name,
+            metric=metric,
+            register_best=register_best,
+            model_name=model_name or self.settings.model_name,
+            stage=stage,
+        ).set(task_id=sweep_id)
+        sweep = SweepJob(
+            sweep_id=sweep_id,
+            experiment_name=exp_name,
+            trials=trials,
+            started_at=started_at,
+        )
+        self.job_store.create_many(trial_jobs)
+        self.job_store.create_sweep(sweep)
+        try:
+            chord(header)(callback)
+        except Exception as e:
+            error = f"Dispatch failed: {e}"
+            for job in trial_jobs:
+                self.job_store.update(job.job_id, status=TrainingStatus.FAILED, error=error, completed_at=datetime.utcnow())
+            self.job_store.update_sweep(sweep_id, status=TrainingStatus.FAILED, error=error, completed_at=datetime.utcnow())
+            raise
+        logger.info(f"Dispatched sweep {sweep_id} with {len(trials)} trials to Celery")
+        return sweep
+    def _trial_status(self, trial: Dict[str, Any], job: Optional[TrainingJob]) -> Dict[str, Any]:
+        return {
+            "job_id": trial["job_id"],
+            "run_name": trial.get("run_name"),
+            "run_id": job.run_id if job else None,
+            "status": job.status if job else TrainingStatus.PENDING,
+            "params": {k: v for k, v in trial.items() if k not in ("experiment_name", "job_id", "run_name")},
+            "error": job.error if job else None,
+        }
+    def get_sweep(self, sweep_id: str) -> Optional[Dict[str, Any]]:
+        sweep = self.job_store.get_sweep(sweep_id)
+        if not sweep:
+            return None
+        jobs = {job.job_id: job for job in self.job_store.get_many([trial["job_id"] for trial in sweep.trials])}
+        active = [job for job in jobs.values() if job.status not in TERMINAL_STATUSES]
+        task_ids = [job.job_id for job in active]
+        if sweep.completed_at is None:
+            task_ids.append(sweep_id)
+        metas = self._fetch_task_meta(task_ids)
+        for job in active:
+            self._apply_updates(job, self._updates_from_meta(metas.get(job.job_id)))
+        trials = [self._trial_status(trial, jobs.get(trial["job_id"])) for trial in sweep.trials]
+        counts = {s: sum(1 for t in trials if t["status"] == s) for s in TrainingStatus}
+        if sweep.completed_at is None:
+            previous_status = sweep.status
+            callback_meta = metas.get(sweep_id) or {}
+            if callback_meta.get("status") == 'SUCCESS':
+                sweep.summary = callback_meta["result"] if isinstance(callback_meta.get("result"), dict) else {}
+                sweep.error = sweep.summary.get("error")
+                sweep.status = TrainingStatus.FAILED if sweep.error else TrainingStatus.COMPLETED
+                sweep.completed_at = datetime.utcnow()
+            elif callback_meta.get("status") == 'FAILURE':
+                sweep.status = TrainingStatus.FAILED
+                sweep.error = str(callback_meta.get("result"))
+                sweep.completed_at = datetime.utcnow()
+            elif counts[TrainingStatus.PENDING] < len(trials):
+                sweep.status = TrainingStatus.RUNNING
+            if sweep.completed_at is not None or sweep.status != previous_status:
+                self.job_store.update_sweep(
+                    sweep_id,
+                    status=sweep.status,
+                    completed_at=sweep.completed_at,
+                    summary=sweep.summary,
+                    error=sweep.error,
+                )
+        summary = sweep.summary or {}
+        return {
+            "sweep_id": sweep.sweep_id,
+            "experiment_name": sweep.experiment_name,
+            "status": sweep.status,
+            "total": len(trials),
+            "completed": counts[TrainingStatus.COMPLETED],
+            "failed": counts[TrainingStatus.FAILED],
+            "running": counts[TrainingStatus.RUNNING],
+            "trials": trials,
+            "best_run": summary.get("best_run"),
+            "model_name": summary.get("model_name"),
+            "model_version": summary.get("model_version"),
+            "error": sweep.error,
+        }
 _training_service: Optional[TrainingService] = None
 def get_training_service() -> TrainingService:
     global _training_service
@@ -0,0 +1,146 @@
+import logging
+import os
+import shutil
+import time
+from datetime import datetime
+from typing import Dict
+from celery.signals import (
+    before_task_publish,
+    task_failure,
+    task_postrun,
+    task_prerun,
+    task_revoked,
+    task_success,
+    worker_init,
+    worker_process_init,
+    worker_process_shutdown,
+)
+from app.config import get_settings
+from app.metrics import CELERY_TASK_QUEUE_WAIT_SECONDS, CELERY_TASK_RUNTIME_SECONDS
+from app.schemas.train import TrainingStatus
+from app.services.job_store import get_job_store
+from app.worker import PRIORITY_LEVELS
+logger = logging.getLogger(__name__)
+TRACKED_TASKS = ("train_model_task",)
+RESULT_STATUSES = {
+    "success": TrainingStatus.COMPLETED,
+    "failed": TrainingStatus.FAILED,
+    "cancelled": TrainingStatus.CANCELLED,
+}
+PRIORITY_NAMES = {level: name for name, level in PRIORITY_LEVELS.items()}
+_task_started: Dict[str, float] = {}
+def resolve_blas_threads(configured: int, concurrency: int) -> int:
+    if configured > 0:
+        return configured
+    return max(1, (os.cpu_count() or 1) // max(1, concurrency or os.cpu_count() or 1))
+def preload_dataset() -> None:
+    if not get_settings().worker_preload_dataset:
+        return
+    from ml_core.config import get_config
+    from ml_core.utils.data_utils import get_mnist_arrays
+    started = time.monotonic()
+    try:
+        arrays = get_mnist_arrays(get_config().data_dir)
+    except Exception as e:
+        logger.warning(f"Dataset preload failed, tasks will load it on demand: {e}")
+        return
+    logger.info(f"Process {os.getpid()} has dataset ready ({sum(a.nbytes for a in arrays) / 1e6:.0f} MB) "
+                f"in {time.monotonic() - started:.2f}s")
+def start_metrics_server() -> None:
+    settings = get_settings()
+    multiproc_dir = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if multiproc_dir:
+        shutil.rmtree(multiproc_dir, ignore_errors=True)
+        os.makedirs(multiproc_dir, exist_ok=True)
+    if not settings.worker_metrics_port:
+        return
+    from prometheus_client import REGISTRY, CollectorRegistry, multiprocess, start_http_server
+    registry = REGISTRY
+    if multiproc_dir:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    start_http_server(settings.worker_metrics_port, registry=registry)
+    logger.info(f"Worker metrics exported on port {settings.worker_metrics_port}")
+@worker_init.connect
+def on_worker_init(sender=None, **kwargs):
+    start_metrics_server()
+    preload_dataset()
+@worker_process_init.connect
+def on_worker_process_init(**kwargs):
+    from threadpoolctl import threadpool_limits
+    from app.worker import celery_app
+    threads = resolve_blas_threads(get_settings().worker_blas_threads, celery_app.conf.worker_concurrency)
+    threadpool_limits(limits=threads)
+    logger.info(f"Worker process {os.getpid()} limited to {threads} BLAS threads")
+    preload_dataset()
+@worker_process_shutdown.connect
+def on_worker_process_shutdown(pid=None, **kwargs):
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(pid or os.getpid())
+@before_task_publish.connect
+def on_before_task_publish(headers=None, **kwargs):
+    if headers is not None:
+        headers.setdefault("published_at", time.time())
+@task_prerun.connect
+def record_task_start(sender=None, task_id=None, **kwargs):
+    _task_started[task_id] = time.monotonic()
+    request = getattr(sender, "request", None)
+    published_at = getattr(request, "published_at", None)
+    if published_at is None:
+        return
+    delivery_info = getattr(request, "delivery_info", None) or {}
+    CELERY_TASK_QUEUE_WAIT_SECONDS.labels(
+        task=sender.name,
+        queue=delivery_info.get("routing_key") or "unknown",
+        priority=PRIORITY_NAMES.get(delivery_info.get("priority"), "default"),
+    ).observe(max(0.0, time.time() - float(published_at)))
+@task_postrun.connect
+def record_task_runtime(sender=None, task_id=None, state=None, **kwargs):
+    started = _task_started.pop(task_id, None)
+    if started is None:
+        return
+    CELERY_TASK_RUNTIME_SECONDS.labels(task=sender.name, state=state or "UNKNOWN").observe(time.monotonic() - started)
+def _update_job(job_id: str, **fields) -> None:
+    try:
+        get_job_store().update(job_id, **fields)
+    except Exception as e:
+        logger.warning(f"Failed to update job store for {job_id}: {e}")
+@task_prerun.connect
+def on_task_prerun(sender=None, task_id=None, **kwargs):
+    if getattr(sender, "name", None) not in TRACKED_TASKS:
+        return
+    _update_job(task_id, status=TrainingStatus.RUNNING)
+@task_success.connect
+def on_task_success(sender=None, result=None, **kwargs):
+    if getattr(sender, "name", None) not in TRACKED_TASKS:
+        return
+    result = result if isinstance(result, dict) else {}
+    status = RESULT_STATUSES.get(result.get("status"), TrainingStatus.FAILED)
+    _update_job(
+        sender.request.id,
+        status=status,
+        run_id=result.get("run_id"),
+        error=result.get("error"),
+        completed_at=datetime.utcnow(),
+    )
+@task_failure.connect
+def on_task_failure(sender=None, task_id=None, exception=None, **kwargs):
+    if getattr(sender, "name", None) not in TRACKED_TASKS:
+        return
+    _update_job(
+        task_id,
+        status=TrainingStatus.FAILED,
+        error=str(exception),
+        completed_at=datetime.utcnow(),
+    )
+@task_revoked.connect
+def on_task_revoked(sender=None, request=None, terminated=False, **kwargs):
+    if getattr(sender, "name", None) not in TRACKED_TASKS or request is None:
+        return
+    _update_job(
+        request.id,
+        status=TrainingStatus.CANCELLED,
+        error="Revoked before completion" if not terminated else "Terminated by revoke",
+        completed_at=datetime.utcnow(),
+    )
@@ -1,30 +1,195 @@
 import logging
-from app.worker import celery_app
-from ml_core.training.train import train_model
+import os
+import uuid
+from datetime import datetime
+from celery import chain
+from celery.exceptions import Ignore
+from app.config import get_settings
+from app.worker import celery_app, route_for_priority
+import app.signals  # noqa: F401
+from ml_core.config import get_config
+from ml_core.training.train import TrainingCancelled, train_model
+from ml_core.training.warm_start import refresh_model
+from ml_core.training.async_tracking import get_async_tracker
+from ml_core.experiments.run_experiments import find_best_run
+from ml_core.experiments.registry import register_model_from_run, transition_model_stage
 from app.services.mlflow_service import get_mlflow_service
+from app.services.progress_service import get_progress_service
+from app.services.job_store import TrainingJob, get_job_store
+from app.services.drift_monitor import get_drift_monitor
+from app.schemas.train import TrainingStatus
 logger = logging.getLogger(__name__)
 @celery_app.task(bind=True, name="train_model_task")
-def train_model_task(self, metrics: dict, params: dict, experiment_name: str, run_name: str = None):
+def train_model_task(
+    self,
+    metrics: dict,
+    params: dict,
+    experiment_name: str,
+    run_name: str = None,
+    tags: dict = None,
+    raise_on_failure: bool = True,
+):
     logger.info(f"Starting training task: {self.request.id}")
+    job_id = self.request.id
+    progress = get_progress_service()
+    job_store = get_job_store()
+    def on_epoch(event: dict) -> None:
+        progress.publish(job_id, "running", **event)
+        if job_store.is_cancel_requested(job_id):
+            raise TrainingCancelled(f"Training job {job_id} cancelled after epoch {event['epoch']}")
     try:
-        run_id = train_model(
-            learning_rate=params.get("learning_rate"),
-            epochs=params.get("epochs"),
-            batch_size=params.get("batch_size"),
-            hidden_size=params.get("hidden_size"),
-            dropout=params.get("dropout"),
-            random_seed=params.get("random_seed"),
-            experiment_name=experiment_name,
-            run_name=run_name
-        )
-        return {
-            "status": "success",
-            "run_id": run_id,
-            "message": "Training completed successfully"
-        }
+        if job_store.is_cancel_requested(job_id):
+            raise TrainingCancelled(f"Training job {job_id} cancelled before it started")
+        progress.publish(job_id, "running", epoch=0, epochs=params.get("epochs"))
+        if params.get("warm_start"):
+            run_id = refresh_model(
+                epochs=params.get("epochs"),
+                random_seed=params.get("random_seed"),
+                experiment_name=experiment_name,
+                run_name=run_name,
+                tags=tags,
+                progress_callback=on_epoch,
+            )
+        else:
+            run_id = train_model(
+                learning_rate=params.get("learning_rate"),
+                epochs=params.get("epochs"),
+                batch_size=params.get("batch_size"),
+                hidden_size=params.get("hidden_size"),
+                dropout=params.get("dropout"),
+                random_seed=params.get("random_seed"),
+                experiment_name=experiment_name,
+                run_name=run_name,
+                tags=tags,
+                reuse_existing=params.get("reuse_existing", False),
+                progress_callback=on_epoch,
+            )
+    except TrainingCancelled as e:
+        logger.info(str(e))
+        progress.publish(job_id, "cancelled", error=str(e))
+        job_store.update(job_id, status=TrainingStatus.CANCELLED, error=str(e), completed_at=datetime.utcnow())
+        if not raise_on_failure:
+            return {"status": "cancelled", "error": str(e)}
+        self.backend.mark_as_revoked(job_id, reason=str(e), request=self.request)
+        raise Ignore()
     except Exception as e:
         logger.error(f"Training task failed: {str(e)}")
-        return {
-            "status": "failed",
-            "error": str(e)
-        }
+        progress.publish(job_id, "failed", error=str(e))
+        if not raise_on_failure:
+            return {"status": "failed", "error": str(e)}
+        raise
+    result = {
+        "status": "success",
+        "run_id": run_id,
+        "message": "Training completed successfully"
+    }
+    if get_config().tracking_mode == "async":
+        result["tracking"] = get_async_tracker().stats()
+    progress.publish(job_id, "completed", run_id=run_id)
+    return result
+@celery_app.task(bind=True, name="finalize_sweep_task")
+def finalize_sweep_task(
+    self,
+    results: list,
+    sweep_id: str,
+    experiment_name: str,
+    metric: str = "accuracy",
+    register_best: bool = False,
+    model_name: str = None,
+    stage: str = None,
+):
+    run_ids = [r["run_id"] for r in results if isinstance(r, dict) and r.get("run_id")]
+    failed = len(results) - len(run_ids)
+    logger.info(f"Finalizing sweep {sweep_id}: {len(run_ids)} succeeded, {failed} failed")
+    summary = {
+        "sweep_id": sweep_id,
+        "run_ids": run_ids,
+        "succeeded": len(run_ids),
+        "failed": failed,
+        "best_run": None,
+        "model_name": None,
+        "model_version": None,
+        "stage": None,
+    }
+    if not run_ids:
+        summary["status"] = "failed"
+        summary["error"] = "No sweep trials completed successfully"
+        return summary
+    best_run = find_best_run(experiment_name, metric=metric, run_ids=run_ids)
+    summary["status"] = "success"
+    summary["best_run"] = best_run
+    if best_run is None or not register_best:
+        return summary
+    version = register_model_from_run(run_id=best_run["run_id"], model_name=model_name)
+    summary["model_name"] = model_name
+    summary["model_version"] = str(version)
+    if stage and stage != "None":
+        transition_model_stage(model_name, version, stage)
+        summary["stage"] = stage
+    logger.info(f"Sweep {sweep_id} registered {model_name} v{version} from run {best_run['run_id']}")
+    return summary
+@celery_app.task(name="register_retrained_model_task")
+def register_retrained_model_task(result: dict, model_name: str, stage: str = None):
+    run_id = result.get("run_id") if isinstance(result, dict) else None
+    if not run_id:
+        logger.warning(f"Retraining for {model_name} produced no run; skipping registration")
+        return {"status": "skipped", "model_name": model_name}
+    version = register_model_from_run(run_id=run_id, model_name=model_name)
+    if stage and stage != "None":
+        transition_model_stage(model_name, version, stage)
+    logger.info(f"Registered retrained {model_name} v{version} from run {run_id}" + (f" in {stage}" if stage else ""))
+    return {"status": "success", "model_name": model_name, "model_version": str(version), "run_id": run_id, "stage": stage}
+def dispatch_retraining(model_name: str, evaluation: dict) -> str:
+    settings = get_settings()
+    warm_start = settings.drift_retrain_mode == "warm_start"
+    if warm_start and not os.path.exists(get_config().refresh_data_path):
+        logger.warning(f"Refresh dataset {get_config().refresh_data_path} not found; falling back to a full retrain of {model_name}")
+        warm_start = False
+    mode = "warm_start" if warm_start else "full"
+    job_id = str(uuid.uuid4())
+    run_name = f"drift_{mode}_{datetime.utcnow():%Y%m%d_%H%M%S}"
+    params = {
+        "learning_rate": settings.default_learning_rate,
+        "epochs": get_config().refresh_epochs if warm_start else settings.default_epochs,
+        "batch_size": settings.default_batch_size,
+        "hidden_size": settings.default_hidden_size,
+        "dropout": settings.default_dropout,
+        "run_name": run_name,
+        "random_seed": settings.random_seed,
+        "priority": settings.drift_retrain_priority,
+        "warm_start": warm_start,
+    }
+    get_job_store().create(TrainingJob(
+        job_id=job_id,
+        experiment_name=settings.experiment_name,
+        status=TrainingStatus.PENDING,
+        params=params,
+        started_at=datetime.utcnow(),
+    ))
+    workflow = chain(
+        train_model_task.s(
+            metrics={},
+            params=params,
+            experiment_name=settings.experiment_name,
+            run_name=run_name,
+            tags={"trigger": "drift", "drift_psi": str(evaluation["psi"])},
+        ).set(task_id=job_id, **route_for_priority(settings.drift_retrain_priority)),
+        register_retrained_model_task.s(model_name=model_name, stage=settings.drift_retrain_stage),
+    )
+    try:
+        workflow.apply_async()
+    except Exception as e:
+        get_job_store().update(
+            job_id,
+            status=TrainingStatus.FAILED,
+            error=f"Dispatch failed: {e}",
+            completed_at=datetime.utcnow(),
+        )
+        raise
+    return job_id
+@celery_app.task(name="evaluate_drift_task")
+def evaluate_drift_task(model_name: str = None):
+    model_name = model_name or get_settings().model_name
+    result = get_drift_monitor().evaluate(model_name, dispatch=lambda evaluation: dispatch_retraining(model_name, evaluation))
+    logger.info(f"Drift evaluation for {model_name}: action={result['action']} psi={result['psi']}")
+    return result
@@ -1,7 +1,10 @@
 import os
+from typing import Any, Dict
 from celery import Celery
+from kombu import Queue
 from app.config import get_settings
 settings = get_settings()
+PRIORITY_LEVELS = {"high": 0, "normal": 3, "low": 6}
 celery_app = Celery(
     "worker",
     broker=f"redis://{settings.redis_host}:{settings.redis_port}/0",
@@ -14,4 +17,42 @@ celery_app.conf.update(
     result_serializer="json",
     timezone="UTC",
     enable_utc=True,
+    task_default_queue="celery",
+    task_queues=(
+        Queue("celery"),
+        Queue(settings.training_interactive_queue),
+        Queue(settings.training_bulk_queue),
+    ),
+    task_routes={
+        "train_model_task": {"queue": settings.training_interactive_queue},
+    },
+    task_default_priority=PRIORITY_LEVELS["normal"],
+    task_annotations={
+        "train_model_task": {
+            "soft_time_limit": settings.training_soft_time_limit,
+            "time_limit": settings.training_time_limit,
+        },
+    },
+    task_acks_late=True,
+    worker_concurrency=settings.worker_concurrency or None,
+    worker_prefetch_multiplier=settings.worker_prefetch_multiplier,
+    worker_max_tasks_per_child=settings.worker_max_tasks_per_child,
+    worker_max_memory_per_child=settings.worker_max_memory_per_child_kb,
+    broker_transport_options={"visibility_timeout": settings.training_time_limit + 600},
 )
+if settings.broker_priorities_enabled:
+    celery_app.conf.broker_transport_options.update({
+        "priority_steps": sorted(PRIORITY_LEVELS.values()),
+        "queue_order_strategy": "priority",
+    })
+if settings.drift_retrain_enabled:
+    celery_app.conf.beat_schedule = {
+        "evaluate-drift": {
+            "task": "evaluate_drift_task",
+            "schedule": float(settings.drift_check_interval_seconds),
+            "options": {"expires": settings.drift_check_interval_seconds},
+        },
+    }
+def route_for_priority(priority: str) -> Dict[str, Any]:
+    queue = settings.training_bulk_queue if priority == "low" else settings.training_interactive_queue
+    return {"queue": queue, "priority": PRIORITY_LEVELS[priority]}
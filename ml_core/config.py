@@ -36,6 +36,42 @@ class MLConfig:
     artifact_dir: str = field(
         default_factory=lambda: os.getenv("ARTIFACT_DIR", "./mlruns")
     )
+    sweep_workers: int = field(
+        default_factory=lambda: int(os.getenv("SWEEP_WORKERS", "1"))
+    )
+    sweep_blas_threads: int = field(
+        default_factory=lambda: int(os.getenv("SWEEP_BLAS_THREADS", "1"))
+    )
+    artifact_mode: str = field(
+        default_factory=lambda: os.getenv("ARTIFACT_MODE", "full")
+    )
+    artifact_render_workers: int = field(
+        default_factory=lambda: int(os.getenv("ARTIFACT_RENDER_WORKERS", "2"))
+    )
+    tracking_mode: str = field(
+        default_factory=lambda: os.getenv("TRACKING_MODE", "sync")
+    )
+    tracking_queue_size: int = field(
+        default_factory=lambda: int(os.getenv("TRACKING_QUEUE_SIZE", "1000"))
+    )
+    tracking_max_retries: int = field(
+        default_factory=lambda: int(os.getenv("TRACKING_MAX_RETRIES", "5"))
+    )
+    tracking_flush_timeout: float = field(
+        default_factory=lambda: float(os.getenv("TRACKING_FLUSH_TIMEOUT", "120"))
+    )
+    refresh_data_path: str = field(
+        default_factory=lambda: os.getenv("REFRESH_DATA_PATH", "./data/refresh/latest.npz")
+    )
+    refresh_epochs: int = field(
+        default_factory=lambda: int(os.getenv("REFRESH_EPOCHS", "3"))
+    )
+    refresh_replay_ratio: float = field(
+        default_factory=lambda: float(os.getenv("REFRESH_REPLAY_RATIO", "1.0"))
+    )
+    model_dtype: str = field(
+        default_factory=lambda: os.getenv("MODEL_DTYPE", "float32")
+    )
 def get_config(**overrides) -> MLConfig:
     config = MLConfig()
     for key, value in overrides.items():
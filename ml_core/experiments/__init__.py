@@ -1,5 +1,6 @@
 from ml_core.experiments.run_experiments import (
     run_experiments,
+    build_sweep_trials,
     find_best_run,
     run_and_register_best,
 )
@@ -12,6 +13,7 @@ from ml_core.experiments.registry import (
 )
 __all__ = [
     "run_experiments",
+    "build_sweep_trials",
     "find_best_run",
     "run_and_register_best",
     "register_model_from_run",
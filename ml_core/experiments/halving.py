@@ -0,0 +1,105 @@
+import math
+import sys
+from pathlib import Path
+from typing import List, Dict, Any
+import numpy as np
+import mlflow
+from sklearn.model_selection import train_test_split
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from ml_core.config import get_config
+from ml_core.models.mnist_cnn import MNISTClassifier
+from ml_core.training.train import load_mnist_data, log_model_outputs, set_seeds
+from ml_core.training.tracking import BatchedRunLogger
+def compute_rung_epochs(min_epochs: int, max_epochs: int, eta: int) -> List[int]:
+    rungs = []
+    epochs = max(1, min_epochs)
+    while epochs < max_epochs:
+        rungs.append(epochs)
+        epochs *= eta
+    rungs.append(max_epochs)
+    return rungs
+def _trial_params(trial: Dict[str, Any], max_epochs: int) -> Dict[str, Any]:
+    hidden_size = trial["hidden_size"]
+    return {
+        "learning_rate": trial["learning_rate"],
+        "epochs": max_epochs,
+        "batch_size": trial["batch_size"],
+        "hidden_size": hidden_size,
+        "dropout": trial["dropout"],
+        "random_seed": trial["random_seed"],
+        "model_type": "MLPClassifier",
+        "hidden_layer_sizes": f"({hidden_size}, {hidden_size // 2})",
+    }
+def run_successive_halving(
+    trials: List[Dict[str, Any]],
+    experiment_name: str = "MNIST_Experiments",
+    max_epochs: int = 9,
+    min_epochs: int = 1,
+    eta: int = 3,
+    validation_fraction: float = 0.1,
+    random_seed: int = 42,
+) -> List[str]:
+    config = get_config()
+    mlflow.set_tracking_uri(config.mlflow_tracking_uri)
+    mlflow.set_experiment(experiment_name)
+    set_seeds(random_seed)
+    X_train, X_test, y_train, y_test = load_mnist_data(config.data_dir)
+    X_fit, X_val, y_fit, y_val = train_test_split(
+        X_train, y_train, test_size=validation_fraction,
+        random_state=random_seed, stratify=y_train,
+    )
+    classes = np.unique(y_train)
+    rungs = compute_rung_epochs(min_epochs, max_epochs, eta)
+    print(f"Successive halving: {len(trials)} configs, rungs at epochs {rungs}, eta={eta}")
+    active = []
+    for trial in trials:
+        with mlflow.start_run(
+            run_name=trial["run_name"],
+            tags={"search_strategy": "halving"},
+        ) as run:
+            with BatchedRunLogger(run.info.run_id) as run_logger:
+                run_logger.log_params(_trial_params(trial, max_epochs))
+                run_logger.log_param("halving_eta", eta)
+        active.append({
+            "trial": trial,
+            "run_id": run.info.run_id,
+            "epochs": 0,
+            "score": 0.0,
+            "model": MNISTClassifier(
+                hidden_layer_sizes=(trial["hidden_size"], trial["hidden_size"] // 2),
+                learning_rate_init=trial["learning_rate"],
+                batch_size=trial["batch_size"],
+                alpha=trial["dropout"],
+                random_state=trial["random_seed"],
+            ),
+        })
+    for rung, rung_epochs in enumerate(rungs):
+        for state in active:
+            model = state["model"]
+            with BatchedRunLogger(state["run_id"]) as run_logger:
+                while state["epochs"] < rung_epochs:
+                    model.partial_fit(X_fit, y_fit, classes=classes)
+                    state["epochs"] += 1
+                    run_logger.log_metric("train_loss", model.loss_, step=state["epochs"])
+                state["score"] = float(model.score(X_val, y_val))
+                run_logger.log_metric("val_accuracy", state["score"], step=state["epochs"])
+                run_logger.log_metric("rung", rung, step=state["epochs"])
+            print(f"  [rung {rung}] {state['trial']['run_name']}: "
+                  f"epochs={state['epochs']} val_accuracy={state['score']:.4f}")
+        active.sort(key=lambda s: s["score"], reverse=True)
+        if rung == len(rungs) - 1:
+            break
+        keep = max(1, math.ceil(len(active) / eta))
+        for state in active[keep:]:
+            with BatchedRunLogger(state["run_id"]) as run_logger:
+                run_logger.set_tag("halving_pruned_at_rung", rung)
+            state["model"] = None
+        active = active[:keep]
+    run_ids = []
+    for state in active:
+        with mlflow.start_run(run_id=state["run_id"]):
+            print(f"\nFinal evaluation for {state['trial']['run_name']} ({state['run_id']}):")
+            log_model_outputs(state["model"], X_test, y_test, state["run_id"])
+            mlflow.set_tag("halving_survivor", "true")
+        run_ids.append(state["run_id"])
+    return run_ids
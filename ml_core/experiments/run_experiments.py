@@ -1,15 +1,27 @@
 import argparse
+import multiprocessing as mp
 import os
 import sys
 import itertools
 import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+import numpy as np
 import mlflow
 from mlflow.tracking import MlflowClient
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from ml_core.config import get_config
 from ml_core.training.train import train_model
+from ml_core.utils.data_utils import load_mnist_arrays
+from ml_core.utils.fingerprint import (
+    compute_fingerprint,
+    find_existing_run,
+    get_data_version,
+    load_fingerprint_index,
+)
+from ml_core.experiments.halving import run_successive_halving
+from ml_core.experiments.tpe import load_search_history, suggest_configs
 from ml_core.experiments.registry import (
     register_model_from_run,
     transition_model_stage,
@@ -32,51 +44,194 @@ def generate_hyperparameter_grid() -> List[Dict[str, Any]]:
         }
         for lr, hs, bs, dr in combinations
     ]
-def generate_random_hyperparameters(n_samples: int = 10) -> List[Dict[str, Any]]:
+def generate_random_hyperparameters(n_samples: int = 10, rng: random.Random = None) -> List[Dict[str, Any]]:
+    rng = rng or random
     configs = []
     for i in range(n_samples):
         config = {
-            "learning_rate": random.choice([0.0001, 0.0005, 0.001, 0.005, 0.01]),
-            "hidden_size": random.choice([64, 96, 128, 192, 256]),
-            "batch_size": random.choice([32, 64, 128]),
-            "dropout": random.uniform(0.1, 0.4),
-            "epochs": random.choice([5, 10, 15]),
+            "learning_rate": rng.choice([0.0001, 0.0005, 0.001, 0.005, 0.01]),
+            "hidden_size": rng.choice([64, 96, 128, 192, 256]),
+            "batch_size": rng.choice([32, 64, 128]),
+            "dropout": rng.uniform(0.1, 0.4),
+            "epochs": rng.choice([5, 10, 15]),
         }
         configs.append(config)
     return configs
-def run_experiments(
+_thread_limits = None
+def _init_sweep_worker(blas_threads: int) -> None:
+    global _thread_limits
+    from threadpoolctl import threadpool_limits
+    for var in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS"):
+        os.environ[var] = str(blas_threads)
+    _thread_limits = threadpool_limits(limits=blas_threads)
+def _run_trial(trial: Dict[str, Any]) -> str:
+    return train_model(**trial)
+def resolve_sweep_workers(n_jobs: int, blas_threads: int, num_trials: int) -> int:
+    if n_jobs <= 0:
+        n_jobs = max(1, (os.cpu_count() or 1) // max(1, blas_threads))
+    return max(1, min(n_jobs, num_trials))
+def _run_trials_parallel(
+    trials: List[Dict[str, Any]],
+    n_jobs: int,
+    blas_threads: int,
+) -> List[str]:
+    config = get_config()
+    load_mnist_arrays(config.data_dir)
+    mlflow.set_tracking_uri(config.mlflow_tracking_uri)
+    mlflow.set_experiment(trials[0]["experiment_name"])
+    print(f"Running sweep on {n_jobs} workers ({blas_threads} BLAS threads each)")
+    run_ids = []
+    with ProcessPoolExecutor(
+        max_workers=n_jobs,
+        mp_context=mp.get_context("spawn"),
+        initializer=_init_sweep_worker,
+        initargs=(blas_threads,),
+    ) as executor:
+        futures = {executor.submit(_run_trial, trial): trial for trial in trials}
+        for future in as_completed(futures):
+            trial = futures[future]
+            try:
+                run_id = future.result()
+            except Exception as e:
+                print(f"  Failed: {trial['run_name']}: {e}")
+                continue
+            run_ids.append(run_id)
+            print(f"  Completed [{len(run_ids)}/{len(trials)}] {trial['run_name']}: {run_id}")
+    return run_ids
+def build_sweep_trials(
     num_runs: int = 10,
     experiment_name: str = "MNIST_Experiments",
     epochs: int = 5,
     search_strategy: str = "random",
     random_seed: int = 42,
-) -> List[str]:
-    random.seed(random_seed)
+) -> List[Dict[str, Any]]:
+    rng = random.Random(random_seed)
     if search_strategy == "grid":
         all_configs = generate_hyperparameter_grid()
-        configs = random.sample(all_configs, min(num_runs, len(all_configs)))
+        configs = rng.sample(all_configs, min(num_runs, len(all_configs)))
     else:
-        configs = generate_random_hyperparameters(num_runs)
+        configs = generate_random_hyperparameters(num_runs, rng=rng)
+    return [
+        {
+            "learning_rate": config["learning_rate"],
+            "epochs": config.get("epochs", epochs),
+            "batch_size": config["batch_size"],
+            "hidden_size": config["hidden_size"],
+            "dropout": config["dropout"],
+            "random_seed": random_seed + i,
+            "experiment_name": experiment_name,
+            "run_name": f"run_{i+1:03d}_lr{config['learning_rate']}_hs{config['hidden_size']}",
+        }
+        for i, config in enumerate(configs)
+    ]
+def _run_tpe_search(
+    num_runs: int,
+    experiment_name: str,
+    epochs: int,
+    random_seed: int,
+    n_jobs: int,
+    blas_threads: int,
+    metric: str = "accuracy",
+) -> List[str]:
+    rng = np.random.RandomState(random_seed)
+    batch_size = resolve_sweep_workers(n_jobs, blas_threads, num_runs)
     run_ids = []
+    while len(run_ids) < num_runs:
+        history = load_search_history(experiment_name, metric=metric)
+        n = min(batch_size, num_runs - len(run_ids))
+        print(f"\nTPE: proposing {n} configs from {len(history)} past runs")
+        trials = [
+            {
+                "learning_rate": config["learning_rate"],
+                "epochs": epochs,
+                "batch_size": config["batch_size"],
+                "hidden_size": config["hidden_size"],
+                "dropout": config["dropout"],
+                "random_seed": random_seed + len(run_ids) + i,
+                "experiment_name": experiment_name,
+                "run_name": f"tpe_{len(run_ids)+i+1:03d}_lr{config['learning_rate']:.2g}_hs{config['hidden_size']}",
+                "tags": {"search_strategy": "tpe"},
+            }
+            for i, config in enumerate(suggest_configs(history, n, rng))
+        ]
+        if n > 1:
+            batch_run_ids = _run_trials_parallel(trials, n, blas_threads)
+        else:
+            batch_run_ids = [train_model(**trials[0])]
+        if not batch_run_ids:
+            print("TPE: every trial in the batch failed, stopping search")
+            break
+        run_ids.extend(batch_run_ids)
+    return run_ids
+def dedupe_trials(
+    trials: List[Dict[str, Any]],
+    experiment_name: str,
+) -> Tuple[List[Dict[str, Any]], List[str]]:
+    config = get_config()
+    data_version = get_data_version(config.data_dir)
+    index = load_fingerprint_index(experiment_name)
+    pending = []
+    reused = []
+    seen = set()
+    for trial in trials:
+        fingerprint = compute_fingerprint({**trial, "dtype": config.model_dtype}, data_version)
+        if fingerprint in seen:
+            continue
+        seen.add(fingerprint)
+        run_id = find_existing_run(fingerprint, experiment_name, index)
+        if run_id:
+            print(f"  Skipping {trial['run_name']}: already trained as run {run_id}")
+            reused.append(run_id)
+        else:
+            pending.append(trial)
+    return pending, reused
+def run_experiments(
+    num_runs: int = 10,
+    experiment_name: str = "MNIST_Experiments",
+    epochs: int = 5,
+    search_strategy: str = "random",
+    random_seed: int = 42,
+    n_jobs: Optional[int] = None,
+    blas_threads: Optional[int] = None,
+    eta: int = 3,
+    min_epochs: int = 1,
+    skip_existing: bool = True,
+) -> List[str]:
+    ml_config = get_config()
+    n_jobs = ml_config.sweep_workers if n_jobs is None else n_jobs
+    blas_threads = ml_config.sweep_blas_threads if blas_threads is None else blas_threads
+    if search_strategy == "tpe":
+        return _run_tpe_search(num_runs, experiment_name, epochs, random_seed, n_jobs, blas_threads)
+    trials = build_sweep_trials(num_runs, experiment_name, epochs, search_strategy, random_seed)
     print(f"\n{'='*60}")
-    print(f"Running {len(configs)} experiments")
+    print(f"Running {len(trials)} experiments")
     print(f"Experiment: {experiment_name}")
     print(f"{'='*60}\n")
-    for i, config in enumerate(configs):
-        print(f"\n[{i+1}/{len(configs)}] Running experiment with config:")
-        for key, value in config.items():
-            print(f"  {key}: {value}")
-        run_name = f"run_{i+1:03d}_lr{config['learning_rate']}_hs{config['hidden_size']}"
-        run_id = train_model(
-            learning_rate=config["learning_rate"],
-            epochs=config.get("epochs", epochs),
-            batch_size=config["batch_size"],
-            hidden_size=config["hidden_size"],
-            dropout=config["dropout"],
-            random_seed=random_seed + i,
+    reused = []
+    if skip_existing and search_strategy != "halving":
+        trials, reused = dedupe_trials(trials, experiment_name)
+        if reused:
+            print(f"Reusing {len(reused)} existing runs, training {len(trials)} new configs")
+        if not trials:
+            return reused
+    if search_strategy == "halving":
+        return run_successive_halving(
+            trials,
             experiment_name=experiment_name,
-            run_name=run_name,
+            max_epochs=epochs,
+            min_epochs=min_epochs,
+            eta=eta,
+            random_seed=random_seed,
         )
+    workers = resolve_sweep_workers(n_jobs, blas_threads, len(trials)) if trials else 1
+    if workers > 1:
+        return reused + _run_trials_parallel(trials, workers, blas_threads)
+    run_ids = list(reused)
+    for i, trial in enumerate(trials):
+        print(f"\n[{i+1}/{len(trials)}] Running experiment with config:")
+        for key, value in trial.items():
+            print(f"  {key}: {value}")
+        run_id = train_model(**trial)
         run_ids.append(run_id)
         print(f"  Completed: {run_id}")
     return run_ids
@@ -84,6 +239,7 @@ def find_best_run(
     experiment_name: str,
     metric: str = "accuracy",
     ascending: bool = False,
+    run_ids: Optional[List[str]] = None,
 ) -> Optional[Dict[str, Any]]:
     config = get_config()
     mlflow.set_tracking_uri(config.mlflow_tracking_uri)
@@ -93,9 +249,14 @@ def find_best_run(
         print(f"Experiment '{experiment_name}' not found")
         return None
     order = "ASC" if ascending else "DESC"
+    filter_string = ""
+    if run_ids:
+        filter_string = "attributes.run_id IN ({})".format(
+            ", ".join(f"'{run_id}'" for run_id in run_ids)
+        )
     runs = client.search_runs(
         experiment_ids=[experiment.experiment_id],
-        filter_string="",
+        filter_string=filter_string,
         order_by=[f"metrics.{metric} {order}"],
         max_results=1,
     )
@@ -117,11 +278,17 @@ def run_and_register_best(
     epochs: int = 5,
     metric: str = "accuracy",
     stage: str = "Staging",
+    n_jobs: Optional[int] = None,
+    blas_threads: Optional[int] = None,
+    search_strategy: str = "random",
 ) -> Dict[str, Any]:
     run_ids = run_experiments(
         num_runs=num_runs,
         experiment_name=experiment_name,
         epochs=epochs,
+        search_strategy=search_strategy,
+        n_jobs=n_jobs,
+        blas_threads=blas_threads,
     )
     print(f"\n{'='*60}")
     print("Finding best run...")
@@ -196,9 +363,39 @@ def parse_args():
         "--search-strategy",
         type=str,
         default="random",
-        choices=["random", "grid"],
+        choices=["random", "grid", "halving", "tpe"],
         help="Hyperparameter search strategy"
     )
+    parser.add_argument(
+        "--no-skip-existing",
+        dest="skip_existing",
+        action="store_false",
+        help="Retrain configs even if an identical run already exists"
+    )
+    parser.add_argument(
+        "--eta",
+        type=int,
+        default=3,
+        help="Successive halving reduction factor"
+    )
+    parser.add_argument(
+        "--min-epochs",
+        type=int,
+        default=1,
+        help="Epoch budget of the first successive halving rung"
+    )
+    parser.add_argument(
+        "--n-jobs", "-j",
+        type=int,
+        default=None,
+        help="Parallel sweep workers (0 or less uses all cores)"
+    )
+    parser.add_argument(
+        "--blas-threads",
+        type=int,
+        default=None,
+        help="BLAS/OpenMP threads per sweep worker"
+    )
     return parser.parse_args()
 if __name__ == "__main__":
     args = parse_args()
@@ -210,6 +407,9 @@ if __name__ == "__main__":
             epochs=args.epochs,
             metric=args.metric,
             stage=args.stage,
+            n_jobs=args.n_jobs,
+            blas_threads=args.blas_threads,
+            search_strategy=args.search_strategy,
         )
         print(f"\n{'='*60}")
         print("EXPERIMENT RESULTS")
@@ -225,6 +425,11 @@ if __name__ == "__main__":
             experiment_name=args.experiment_name,
             epochs=args.epochs,
             search_strategy=args.search_strategy,
+            n_jobs=args.n_jobs,
+            blas_threads=args.blas_threads,
+            eta=args.eta,
+            min_epochs=args.min_epochs,
+            skip_existing=args.skip_existing,
         )
         print(f"\n{'='*60}")
         print(f"Completed {len(run_ids)} runs")
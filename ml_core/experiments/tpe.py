@@ -0,0 +1,136 @@
+import math
+import sys
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+import numpy as np
+import mlflow
+from mlflow.tracking import MlflowClient
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from ml_core.config import get_config
+SEARCH_SPACE = {
+    "learning_rate": ("log", 0.0001, 0.01),
+    "hidden_size": ("choice", [64, 96, 128, 192, 256]),
+    "batch_size": ("choice", [32, 64, 128]),
+    "dropout": ("float", 0.1, 0.4),
+}
+def _to_internal(name: str, value: float) -> float:
+    kind = SEARCH_SPACE[name][0]
+    return math.log(value) if kind == "log" else value
+def _from_internal(name: str, value: float) -> Any:
+    kind = SEARCH_SPACE[name][0]
+    return float(math.exp(value)) if kind == "log" else float(value)
+def _bounds(name: str) -> Tuple[float, float]:
+    _, low, high = SEARCH_SPACE[name]
+    return _to_internal(name, low), _to_internal(name, high)
+def _parse_params(params: Dict[str, str]) -> Optional[Dict[str, Any]]:
+    config = {}
+    for name, spec in SEARCH_SPACE.items():
+        if name not in params:
+            return None
+        try:
+            value = float(params[name])
+        except (TypeError, ValueError):
+            return None
+        if spec[0] == "choice":
+            if int(value) not in spec[1]:
+                return None
+            config[name] = int(value)
+        else:
+            config[name] = min(max(value, spec[1]), spec[2])
+    return config
+def load_search_history(
+    experiment_name: str,
+    metric: str = "accuracy",
+    max_results: int = 1000,
+) -> List[Tuple[Dict[str, Any], float]]:
+    config = get_config()
+    mlflow.set_tracking_uri(config.mlflow_tracking_uri)
+    client = MlflowClient()
+    experiment = client.get_experiment_by_name(experiment_name)
+    if experiment is None:
+        return []
+    runs = client.search_runs(
+        experiment_ids=[experiment.experiment_id],
+        filter_string="attributes.status = 'FINISHED'",
+        max_results=max_results,
+    )
+    history = []
+    for run in runs:
+        score = run.data.metrics.get(metric)
+        params = _parse_params(run.data.params)
+        if score is None or params is None:
+            continue
+        history.append((params, float(score)))
+    return history
+def _random_config(rng: np.random.RandomState) -> Dict[str, Any]:
+    config = {}
+    for name, spec in SEARCH_SPACE.items():
+        if spec[0] == "choice":
+            config[name] = int(rng.choice(spec[1]))
+        else:
+            low, high = _bounds(name)
+            config[name] = _from_internal(name, rng.uniform(low, high))
+    return config
+def _parzen(values: np.ndarray, low: float, high: float) -> Tuple[np.ndarray, np.ndarray]:
+    means = np.append(values, (low + high) / 2)
+    spread = values.std() if len(values) > 1 else high - low
+    bandwidth = 1.06 * spread * max(len(values), 1) ** (-1 / 5)
+    sigmas = np.full(len(means), min(max(bandwidth, (high - low) * 0.02), high - low))
+    sigmas[-1] = high - low
+    return means, sigmas
+def _parzen_logpdf(x: np.ndarray, means: np.ndarray, sigmas: np.ndarray) -> np.ndarray:
+    z = (x[:, None] - means[None, :]) / sigmas[None, :]
+    log_components = -0.5 * z ** 2 - np.log(sigmas[None, :] * math.sqrt(2 * math.pi))
+    peak = log_components.max(axis=1, keepdims=True)
+    return (peak + np.log(np.exp(log_components - peak).mean(axis=1, keepdims=True)))[:, 0]
+def _categorical_probs(values: List[int], choices: List[int]) -> np.ndarray:
+    counts = np.array([values.count(c) for c in choices], dtype=float) + 1.0
+    return counts / counts.sum()
+def suggest_configs(
+    history: List[Tuple[Dict[str, Any], float]],
+    n: int,
+    rng: np.random.RandomState,
+    gamma: float = 0.25,
+    n_startup: int = 5,
+    n_candidates: int = 24,
+) -> List[Dict[str, Any]]:
+    history = list(history)
+    suggestions = []
+    for _ in range(n):
+        if len(history) < n_startup:
+            config = _random_config(rng)
+        else:
+            ranked = sorted(history, key=lambda item: item[1], reverse=True)
+            n_good = max(1, int(math.ceil(gamma * len(ranked))))
+            good = [params for params, _ in ranked[:n_good]]
+            bad = [params for params, _ in ranked[n_good:]] or good
+            candidates = [dict() for _ in range(n_candidates)]
+            scores = np.zeros(n_candidates)
+            for name, spec in SEARCH_SPACE.items():
+                if spec[0] == "choice":
+                    choices = spec[1]
+                    good_probs = _categorical_probs([p[name] for p in good], choices)
+                    bad_probs = _categorical_probs([p[name] for p in bad], choices)
+                    picks = rng.choice(len(choices), size=n_candidates, p=good_probs)
+                    scores += np.log(good_probs[picks]) - np.log(bad_probs[picks])
+                    for candidate, pick in zip(candidates, picks):
+                        candidate[name] = int(choices[pick])
+                    continue
+                low, high = _bounds(name)
+                good_means, good_sigmas = _parzen(
+                    np.array([_to_internal(name, p[name]) for p in good]), low, high
+                )
+                bad_means, bad_sigmas = _parzen(
+                    np.array([_to_internal(name, p[name]) for p in bad]), low, high
+                )
+                components = rng.randint(len(good_means), size=n_candidates)
+                samples = np.clip(rng.normal(good_means[components], good_sigmas[components]), low, high)
+                scores += _parzen_logpdf(samples, good_means, good_sigmas)
+                scores -= _parzen_logpdf(samples, bad_means, bad_sigmas)
+                for candidate, sample in zip(candidates, samples):
+                    candidate[name] = _from_internal(name, sample)
+            config = candidates[int(np.argmax(scores))]
+        suggestions.append(config)
+        worst = min((score for _, score in history), default=0.0)
+        history.append((config, worst))
+    return suggestions
@@ -3,6 +3,7 @@ from sklearn.base import BaseEstimator, ClassifierMixin
 from sklearn.neural_network import MLPClassifier
 from sklearn.preprocessing import StandardScaler
 from sklearn.pipeline import Pipeline
+from sklearn.model_selection import train_test_split
 class MNISTClassifier(BaseEstimator, ClassifierMixin):
     def __init__(
         self,
@@ -14,6 +15,7 @@ class MNISTClassifier(BaseEstimator, ClassifierMixin):
         random_state: int = 42,
         early_stopping: bool = True,
         validation_fraction: float = 0.1,
+        dtype: str = "float32",
     ):
         self.hidden_layer_sizes = hidden_layer_sizes
         self.learning_rate_init = learning_rate_init
@@ -23,8 +25,10 @@ class MNISTClassifier(BaseEstimator, ClassifierMixin):
         self.random_state = random_state
         self.early_stopping = early_stopping
         self.validation_fraction = validation_fraction
+        self.dtype = dtype
         self._pipeline = None
         self._classes = None
+        self._validation_scores = None
     def _build_pipeline(self):
         classifier = MLPClassifier(
             hidden_layer_sizes=self.hidden_layer_sizes,
@@ -44,21 +48,108 @@ class MNISTClassifier(BaseEstimator, ClassifierMixin):
             ('classifier', classifier)
         ])
         return self._pipeline
-    def fit(self, X, y):
+    def _prepare(self, X):
         X_flat = X.reshape(X.shape[0], -1) if len(X.shape) > 2 else X
+        dtype = getattr(self, 'dtype', None)
+        return np.asarray(X_flat, dtype=dtype) if dtype else X_flat
+    def astype(self, dtype):
+        self.dtype = dtype
+        if self._pipeline is None:
+            return self
+        scaler = self._pipeline.named_steps['scaler']
+        for name in ('mean_', 'var_', 'scale_'):
+            if getattr(scaler, name, None) is not None:
+                setattr(scaler, name, getattr(scaler, name).astype(dtype, copy=False))
+        classifier = self._pipeline.named_steps['classifier']
+        if hasattr(classifier, 'coefs_'):
+            classifier.coefs_ = [c.astype(dtype, copy=False) for c in classifier.coefs_]
+            classifier.intercepts_ = [i.astype(dtype, copy=False) for i in classifier.intercepts_]
+            optimizer = getattr(classifier, '_optimizer', None)
+            for name in ('ms', 'vs', 'velocities'):
+                if hasattr(optimizer, name):
+                    setattr(optimizer, name, [v.astype(dtype, copy=False) for v in getattr(optimizer, name)])
+        return self
+    def fit(self, X, y):
+        X_flat = self._prepare(X)
         self._classes = np.unique(y)
+        self._validation_scores = None
         if self._pipeline is None:
             self._build_pipeline()
         self._pipeline.fit(X_flat, y)
+        if getattr(self, 'dtype', None):
+            self.astype(self.dtype)
+        return self
+    def partial_fit(self, X, y, classes=None):
+        X_flat = self._prepare(X)
+        if self._pipeline is None:
+            self._build_pipeline()
+            self._pipeline.named_steps['classifier'].set_params(early_stopping=False)
+            self._pipeline.named_steps['scaler'].fit(X_flat)
+            if getattr(self, 'dtype', None):
+                self.astype(self.dtype)
+            self._classes = np.unique(y) if classes is None else np.asarray(classes)
+        X_scaled = self._pipeline.named_steps['scaler'].transform(X_flat)
+        self._pipeline.named_steps['classifier'].partial_fit(X_scaled, y, classes=self._classes)
         return self
+    def fit_epochs(self, X, y, callback=None, n_iter_no_change: int = 10, tol: float = 1e-4, warm_start: bool = False):
+        X_flat = self._prepare(X)
+        warm_start = warm_start and self._pipeline is not None
+        classes = self._classes if warm_start else np.unique(y)
+        X_val = y_val = None
+        if self.early_stopping:
+            X_flat, X_val, y, y_val = train_test_split(
+                X_flat, y, test_size=self.validation_fraction,
+                random_state=self.random_state, stratify=y,
+            )
+        if not warm_start:
+            self._pipeline = None
+        self._validation_scores = [] if self.early_stopping else None
+        best_score, best_weights, no_improvement = -np.inf, None, 0
+        if warm_start and self.early_stopping:
+            classifier = self._pipeline.named_steps['classifier']
+            best_score = float(self.score(X_val, y_val))
+            best_weights = ([c.copy() for c in classifier.coefs_], [i.copy() for i in classifier.intercepts_])
+        for epoch in range(1, self.max_iter + 1):
+            self.partial_fit(X_flat, y, classes=classes)
+            progress = {"epoch": epoch, "epochs": self.max_iter, "loss": float(self.loss_)}
+            if self.early_stopping:
+                val_score = float(self.score(X_val, y_val))
+                self._validation_scores.append(val_score)
+                progress["val_accuracy"] = val_score
+                classifier = self._pipeline.named_steps['classifier']
+                if val_score > best_score + tol:
+                    no_improvement = 0
+                else:
+                    no_improvement += 1
+                if val_score > best_score:
+                    best_score = val_score
+                    best_weights = ([c.copy() for c in classifier.coefs_], [i.copy() for i in classifier.intercepts_])
+            if callback is not None:
+                callback(progress)
+            if self.early_stopping and no_improvement > n_iter_no_change:
+                break
+        if best_weights is not None:
+            classifier.coefs_, classifier.intercepts_ = best_weights
+        return self
+    @property
+    def loss_(self):
+        return self._pipeline.named_steps['classifier'].loss_
+    @property
+    def loss_curve_(self):
+        return self._pipeline.named_steps['classifier'].loss_curve_
+    @property
+    def validation_scores_(self):
+        if getattr(self, '_validation_scores', None) is not None:
+            return self._validation_scores
+        return getattr(self._pipeline.named_steps['classifier'], 'validation_scores_', None)
     def predict(self, X):
-        X_flat = X.reshape(X.shape[0], -1) if len(X.shape) > 2 else X
+        X_flat = self._prepare(X)
         return self._pipeline.predict(X_flat)
     def predict_proba(self, X):
-        X_flat = X.reshape(X.shape[0], -1) if len(X.shape) > 2 else X
+        X_flat = self._prepare(X)
         return self._pipeline.predict_proba(X_flat)
     def score(self, X, y):
-        X_flat = X.reshape(X.shape[0], -1) if len(X.shape) > 2 else X
+        X_flat = self._prepare(X)
         return self._pipeline.score(X_flat, y)
     @property
     def classes_(self):
@@ -73,9 +164,11 @@ class MNISTClassifier(BaseEstimator, ClassifierMixin):
             'random_state': self.random_state,
             'early_stopping': self.early_stopping,
             'validation_fraction': self.validation_fraction,
+            'dtype': getattr(self, 'dtype', None),
         }
     def set_params(self, **params):
         for key, value in params.items():
             setattr(self, key, value)
         self._pipeline = None
+        self._validation_scores = None
         return self
@@ -1,9 +1,12 @@
-from ml_core.training.train import train_model, load_mnist_data
+from ml_core.training.train import train_model, load_mnist_data, TrainingCancelled
+from ml_core.training.warm_start import refresh_model
 from ml_core.training.evaluate import evaluate_model, generate_classification_report
 from ml_core.training.artifacts import save_training_artifacts
 __all__ = [
     "train_model",
     "load_mnist_data",
+    "TrainingCancelled",
+    "refresh_model",
     "evaluate_model",
     "generate_classification_report",
     "save_training_artifacts",
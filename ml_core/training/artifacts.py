@@ -1,25 +1,26 @@
 import os
 import json
-from pathlib import Path
-from typing import Optional
+import multiprocessing as mp
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, Optional
 import numpy as np
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
-import seaborn as sns
+from ml_core.config import get_config
 from ml_core.training.evaluate import (
-    compute_confusion_matrix,
-    generate_classification_report,
+    EvaluationResult,
+    classification_report_from_confusion,
     compute_per_class_accuracy,
+    evaluate_predictions,
 )
-def save_confusion_matrix_plot(
-    model,
-    X_test: np.ndarray,
-    y_test: np.ndarray,
-    output_path: str,
-) -> str:
-    cm = compute_confusion_matrix(model, X_test, y_test)
-    plt.figure(figsize=(10, 8))
+ARTIFACT_MODES = ("full", "metrics", "none")
+_render_executor: Optional[Executor] = None
+def _new_figure(figsize):
+    from matplotlib.figure import Figure
+    return Figure(figsize=figsize)
+def render_confusion_matrix(cm: np.ndarray, output_path: str) -> str:
+    import seaborn as sns
+    fig = _new_figure((10, 8))
+    ax = fig.add_subplot()
     sns.heatmap(
         cm,
         annot=True,
@@ -27,27 +28,22 @@ def save_confusion_matrix_plot(
         cmap='Blues',
         xticklabels=range(10),
         yticklabels=range(10),
+        ax=ax,
     )
-    plt.title('Confusion Matrix', fontsize=14)
-    plt.xlabel('Predicted Label', fontsize=12)
-    plt.ylabel('True Label', fontsize=12)
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=150, bbox_inches='tight')
-    plt.close()
+    ax.set_title('Confusion Matrix', fontsize=14)
+    ax.set_xlabel('Predicted Label', fontsize=12)
+    ax.set_ylabel('True Label', fontsize=12)
+    fig.tight_layout()
+    fig.savefig(output_path, dpi=150, bbox_inches='tight')
     return output_path
-def save_per_class_accuracy_plot(
-    model,
-    X_test: np.ndarray,
-    y_test: np.ndarray,
-    output_path: str,
-) -> str:
-    per_class_acc = compute_per_class_accuracy(model, X_test, y_test)
+def render_per_class_accuracy(per_class_acc: Dict[int, float], output_path: str) -> str:
     classes = list(per_class_acc.keys())
     accuracies = list(per_class_acc.values())
-    plt.figure(figsize=(10, 6))
-    bars = plt.bar(classes, accuracies, color='steelblue', edgecolor='navy')
+    fig = _new_figure((10, 6))
+    ax = fig.add_subplot()
+    bars = ax.bar(classes, accuracies, color='steelblue', edgecolor='navy')
     for bar, acc in zip(bars, accuracies):
-        plt.text(
+        ax.text(
             bar.get_x() + bar.get_width() / 2,
             bar.get_height() + 0.01,
             f'{acc:.2%}',
@@ -55,73 +51,187 @@ def save_per_class_accuracy_plot(
             va='bottom',
             fontsize=9,
         )
-    plt.xlabel('Digit Class', fontsize=12)
-    plt.ylabel('Accuracy', fontsize=12)
-    plt.title('Per-Class Accuracy', fontsize=14)
-    plt.ylim(0, 1.1)
-    plt.xticks(range(10))
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=150, bbox_inches='tight')
-    plt.close()
+    ax.set_xlabel('Digit Class', fontsize=12)
+    ax.set_ylabel('Accuracy', fontsize=12)
+    ax.set_title('Per-Class Accuracy', fontsize=14)
+    ax.set_ylim(0, 1.1)
+    ax.set_xticks(range(10))
+    fig.tight_layout()
+    fig.savefig(output_path, dpi=150, bbox_inches='tight')
     return output_path
-def save_sample_predictions(
-    model,
-    X_test: np.ndarray,
-    y_test: np.ndarray,
+def render_sample_predictions(
+    images: np.ndarray,
+    y_true: np.ndarray,
+    y_pred: np.ndarray,
     output_path: str,
     n_samples: int = 25,
 ) -> str:
-    indices = np.random.choice(len(X_test), min(n_samples, len(X_test)), replace=False)
-    X_sample = X_test[indices]
-    y_true = y_test[indices]
-    y_pred = model.predict(X_sample)
     n_cols = 5
     n_rows = (n_samples + n_cols - 1) // n_cols
-    fig, axes = plt.subplots(n_rows, n_cols, figsize=(12, 2.5 * n_rows))
-    axes = axes.flatten()
-    for i, (img, true_label, pred_label) in enumerate(zip(X_sample, y_true, y_pred)):
+    fig = _new_figure((12, 2.5 * n_rows))
+    axes = fig.subplots(n_rows, n_cols).flatten()
+    for i, (img, true_label, pred_label) in enumerate(zip(images, y_true, y_pred)):
         ax = axes[i]
         img_2d = img.reshape(28, 28)
         ax.imshow(img_2d, cmap='gray')
         color = 'green' if true_label == pred_label else 'red'
         ax.set_title(f'True: {true_label}, Pred: {pred_label}', color=color, fontsize=10)
         ax.axis('off')
-    for i in range(len(indices), len(axes)):
+    for i in range(len(images), len(axes)):
         axes[i].axis('off')
-    plt.suptitle('Sample Predictions', fontsize=14, y=1.02)
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=150, bbox_inches='tight')
-    plt.close()
+    fig.suptitle('Sample Predictions', fontsize=14, y=1.02)
+    fig.tight_layout()
+    fig.savefig(output_path, dpi=150, bbox_inches='tight')
     return output_path
+def save_confusion_matrix_plot(
+    model,
+    X_test: np.ndarray,
+    y_test: np.ndarray,
+    output_path: str,
+    evaluation: Optional[EvaluationResult] = None,
+) -> str:
+    if evaluation is None:
+        evaluation = evaluate_predictions(model, X_test, y_test)
+    return render_confusion_matrix(evaluation.confusion_matrix[:10, :10], output_path)
+def save_per_class_accuracy_plot(
+    model,
+    X_test: np.ndarray,
+    y_test: np.ndarray,
+    output_path: str,
+    evaluation: Optional[EvaluationResult] = None,
+) -> str:
+    if evaluation is None:
+        evaluation = evaluate_predictions(model, X_test, y_test)
+    per_class_acc = compute_per_class_accuracy(model, X_test, y_test, y_pred=evaluation.y_pred)
+    return render_per_class_accuracy(per_class_acc, output_path)
+def _sample_indices(n_total: int, n_samples: int) -> np.ndarray:
+    return np.random.choice(n_total, min(n_samples, n_total), replace=False)
+def save_sample_predictions(
+    model,
+    X_test: np.ndarray,
+    y_test: np.ndarray,
+    output_path: str,
+    n_samples: int = 25,
+    evaluation: Optional[EvaluationResult] = None,
+) -> str:
+    indices = _sample_indices(len(X_test), n_samples)
+    X_sample = np.asarray(X_test[indices])
+    y_true = y_test[indices]
+    y_pred = evaluation.y_pred[indices] if evaluation is not None else model.predict(X_sample)
+    return render_sample_predictions(X_sample, y_true, y_pred, output_path, n_samples)
 def save_classification_report(
     model,
     X_test: np.ndarray,
     y_test: np.ndarray,
     output_path: str,
+    evaluation: Optional[EvaluationResult] = None,
 ) -> str:
-    report = generate_classification_report(model, X_test, y_test, output_dict=True)
+    if evaluation is None:
+        evaluation = evaluate_predictions(model, X_test, y_test)
+    report = classification_report_from_confusion(evaluation.confusion_matrix)
     with open(output_path, 'w') as f:
         json.dump(report, f, indent=2)
     return output_path
-def save_training_artifacts(
+def get_render_executor() -> Executor:
+    global _render_executor
+    if _render_executor is None:
+        workers = max(1, get_config().artifact_render_workers)
+        if mp.current_process().daemon:
+            _render_executor = ThreadPoolExecutor(max_workers=workers)
+        else:
+            _render_executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=mp.get_context("spawn"),
+            )
+    return _render_executor
+class PendingArtifacts:
+    def __init__(self, artifacts: Dict[str, str], futures: Dict[str, Future]):
+        self.artifacts = artifacts
+        self.futures = futures
+    def wait(self) -> Dict[str, str]:
+        for name, future in self.futures.items():
+            try:
+                self.artifacts[name] = future.result()
+            except Exception as e:
+                print(f"Failed to render {name}: {e}")
+        self.futures = {}
+        return self.artifacts
+    def add_done_callback(self, fn: Callable[[], None]) -> None:
+        futures = list(self.futures.values())
+        if not futures:
+            fn()
+            return
+        remaining = [len(futures)]
+        lock = threading.Lock()
+        def _on_done(_: Future) -> None:
+            with lock:
+                remaining[0] -= 1
+                finished = remaining[0] == 0
+            if finished:
+                fn()
+        for future in futures:
+            future.add_done_callback(_on_done)
+def start_training_artifacts(
     model,
     X_test: np.ndarray,
     y_test: np.ndarray,
     output_dir: str,
     run_id: Optional[str] = None,
-) -> dict:
+    evaluation: Optional[EvaluationResult] = None,
+    mode: Optional[str] = None,
+    executor: Optional[Executor] = None,
+) -> PendingArtifacts:
+    mode = mode or get_config().artifact_mode
+    if mode not in ARTIFACT_MODES:
+        raise ValueError(f"Unknown artifact mode '{mode}', expected one of {ARTIFACT_MODES}")
+    if mode == "none":
+        return PendingArtifacts({}, {})
     os.makedirs(output_dir, exist_ok=True)
+    if evaluation is None:
+        evaluation = evaluate_predictions(model, X_test, y_test)
     artifacts = {}
-    cm_path = os.path.join(output_dir, "confusion_matrix.png")
-    save_confusion_matrix_plot(model, X_test, y_test, cm_path)
-    artifacts["confusion_matrix"] = cm_path
-    acc_path = os.path.join(output_dir, "per_class_accuracy.png")
-    save_per_class_accuracy_plot(model, X_test, y_test, acc_path)
-    artifacts["per_class_accuracy"] = acc_path
-    samples_path = os.path.join(output_dir, "sample_predictions.png")
-    save_sample_predictions(model, X_test, y_test, samples_path)
-    artifacts["sample_predictions"] = samples_path
     report_path = os.path.join(output_dir, "classification_report.json")
-    save_classification_report(model, X_test, y_test, report_path)
+    save_classification_report(model, X_test, y_test, report_path, evaluation=evaluation)
     artifacts["classification_report"] = report_path
-    return artifacts
+    if mode == "metrics":
+        return PendingArtifacts(artifacts, {})
+    executor = executor or get_render_executor()
+    indices = _sample_indices(len(X_test), 25)
+    per_class_acc = compute_per_class_accuracy(model, X_test, y_test, y_pred=evaluation.y_pred)
+    futures = {
+        "confusion_matrix": executor.submit(
+            render_confusion_matrix,
+            evaluation.confusion_matrix[:10, :10],
+            os.path.join(output_dir, "confusion_matrix.png"),
+        ),
+        "per_class_accuracy": executor.submit(
+            render_per_class_accuracy,
+            per_class_acc,
+            os.path.join(output_dir, "per_class_accuracy.png"),
+        ),
+        "sample_predictions": executor.submit(
+            render_sample_predictions,
+            np.asarray(X_test[indices]),
+            np.asarray(y_test[indices]),
+            evaluation.y_pred[indices],
+            os.path.join(output_dir, "sample_predictions.png"),
+        ),
+    }
+    return PendingArtifacts(artifacts, futures)
+def save_training_artifacts(
+    model,
+    X_test: np.ndarray,
+    y_test: np.ndarray,
+    output_dir: str,
+    run_id: Optional[str] = None,
+    evaluation: Optional[EvaluationResult] = None,
+    mode: Optional[str] = None,
+    executor: Optional[Executor] = None,
+) -> dict:
+    return start_training_artifacts(
+        model, X_test, y_test, output_dir,
+        run_id=run_id,
+        evaluation=evaluation,
+        mode=mode,
+        executor=executor,
+    ).wait()
@@ -0,0 +1,166 @@
+import atexit
+import queue
+import shutil
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+from mlflow.entities import Metric, Param, RunTag
+from mlflow.tracking import MlflowClient
+from tenacity import Retrying, stop_after_attempt, wait_exponential
+from ml_core.config import get_config
+from ml_core.training.artifacts import PendingArtifacts
+@dataclass
+class TrackingOp:
+    description: str
+    fn: Callable[[], Any]
+    cleanup: Optional[Callable[[], None]] = None
+    enqueued_at: float = field(default_factory=time.monotonic)
+class AsyncRunTracker:
+    def __init__(
+        self,
+        client: Optional[MlflowClient] = None,
+        max_queue_size: int = 1000,
+        max_retries: int = 5,
+        retry_max_wait: float = 30.0,
+    ):
+        self.client = client or MlflowClient()
+        self.max_retries = max_retries
+        self.retry_max_wait = retry_max_wait
+        self._queue: "queue.Queue[TrackingOp]" = queue.Queue(maxsize=max_queue_size)
+        self._lock = threading.Condition()
+        self._in_flight: Optional[TrackingOp] = None
+        self._pending = 0
+        self._completed = 0
+        self._failed = 0
+        self._errors: List[str] = []
+        self._thread = threading.Thread(target=self._run, name="mlflow-async-tracker", daemon=True)
+        self._thread.start()
+    def _run(self) -> None:
+        while True:
+            op = self._queue.get()
+            with self._lock:
+                self._in_flight = op
+            try:
+                for attempt in Retrying(
+                    stop=stop_after_attempt(self.max_retries),
+                    wait=wait_exponential(multiplier=0.5, min=0.5, max=self.retry_max_wait),
+                    reraise=True,
+                ):
+                    with attempt:
+                        op.fn()
+                succeeded = True
+            except Exception as e:
+                succeeded = False
+                print(f"Async tracking operation '{op.description}' failed: {e}")
+                error = f"{op.description}: {e}"
+            finally:
+                if op.cleanup is not None:
+                    op.cleanup()
+            with self._lock:
+                self._in_flight = None
+                self._pending -= 1
+                if succeeded:
+                    self._completed += 1
+                else:
+                    self._failed += 1
+                    self._errors = (self._errors + [error])[-20:]
+                self._lock.notify_all()
+            self._queue.task_done()
+    def submit(self, description: str, fn: Callable[[], Any], cleanup: Optional[Callable[[], None]] = None) -> None:
+        with self._lock:
+            self._pending += 1
+        self._queue.put(TrackingOp(description=description, fn=fn, cleanup=cleanup))
+    def create_run(self, experiment_name: str, run_name: Optional[str] = None, tags: Optional[Dict[str, str]] = None) -> str:
+        experiment = self.client.get_experiment_by_name(experiment_name)
+        experiment_id = experiment.experiment_id if experiment else self.client.create_experiment(experiment_name)
+        run = self.client.create_run(experiment_id, run_name=run_name, tags=tags or {})
+        return run.info.run_id
+    def log_batch(
+        self,
+        run_id: str,
+        metrics: List[Metric] = (),
+        params: List[Param] = (),
+        tags: List[RunTag] = (),
+    ) -> None:
+        metrics, params, tags = list(metrics), list(params), list(tags)
+        self.submit(
+            f"log_batch({run_id}, {len(metrics)} metrics, {len(params)} params)",
+            lambda: self.client.log_batch(run_id, metrics=metrics, params=params, tags=tags),
+        )
+    def log_artifacts(self, run_id: str, local_dir: str, artifact_path: Optional[str] = None) -> None:
+        staging = tempfile.mkdtemp(prefix="mlflow-upload-")
+        target = Path(staging) / Path(local_dir).name
+        shutil.copytree(local_dir, target)
+        self.submit(
+            f"log_artifacts({run_id}, {artifact_path or '.'})",
+            lambda: self.client.log_artifacts(run_id, str(target), artifact_path),
+            cleanup=lambda: shutil.rmtree(staging, ignore_errors=True),
+        )
+    def log_pending_artifacts(self, run_id: str, pending: PendingArtifacts, local_dir: str) -> None:
+        def _upload() -> None:
+            if pending.wait():
+                self.client.log_artifacts(run_id, local_dir)
+        pending.add_done_callback(lambda: self.submit(
+            f"log_artifacts({run_id}, rendered figures)",
+            _upload,
+            cleanup=lambda: shutil.rmtree(local_dir, ignore_errors=True),
+        ))
+    def log_model(self, run_id: str, model: Any, artifact_path: str = "model") -> None:
+        import mlflow.sklearn
+        staging = tempfile.mkdtemp(prefix="mlflow-model-")
+        model_dir = Path(staging) / artifact_path
+        try:
+            mlflow.sklearn.save_model(model, str(model_dir))
+        except Exception:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        self.submit(
+            f"log_model({run_id}, {artifact_path})",
+            lambda: self.client.log_artifacts(run_id, str(model_dir), artifact_path),
+            cleanup=lambda: shutil.rmtree(staging, ignore_errors=True),
+        )
+    def set_terminated(self, run_id: str, status: str = "FINISHED") -> None:
+        self.submit(
+            f"set_terminated({run_id}, {status})",
+            lambda: self.client.set_terminated(run_id, status),
+        )
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            while self._pending > 0:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._lock.wait(remaining)
+        return True
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            oldest = self._in_flight.enqueued_at if self._in_flight else None
+            with self._queue.mutex:
+                if self._queue.queue:
+                    queued_oldest = self._queue.queue[0].enqueued_at
+                    oldest = queued_oldest if oldest is None else min(oldest, queued_oldest)
+            return {
+                "queue_depth": self._pending,
+                "lag_seconds": time.monotonic() - oldest if oldest is not None else 0.0,
+                "completed": self._completed,
+                "failed": self._failed,
+                "recent_errors": list(self._errors),
+            }
+_async_tracker: Optional[AsyncRunTracker] = None
+_tracker_lock = threading.Lock()
+def get_async_tracker() -> AsyncRunTracker:
+    global _async_tracker
+    with _tracker_lock:
+        if _async_tracker is None:
+            config = get_config()
+            _async_tracker = AsyncRunTracker(
+                client=MlflowClient(config.mlflow_tracking_uri),
+                max_queue_size=config.tracking_queue_size,
+                max_retries=config.tracking_max_retries,
+            )
+            atexit.register(_async_tracker.flush, config.tracking_flush_timeout)
+        return _async_tracker
@@ -1,50 +1,143 @@
 import numpy as np
-from sklearn.metrics import (
-    accuracy_score,
-    precision_score,
-    recall_score,
-    f1_score,
-    confusion_matrix,
-    classification_report,
-)
-from typing import Dict, Any
-def evaluate_model(model, X_test: np.ndarray, y_test: np.ndarray) -> Dict[str, float]:
-    y_pred = model.predict(X_test)
-    metrics = {
-        "accuracy": accuracy_score(y_test, y_pred),
-        "precision_macro": precision_score(y_test, y_pred, average='macro', zero_division=0),
-        "recall_macro": recall_score(y_test, y_pred, average='macro', zero_division=0),
-        "f1_macro": f1_score(y_test, y_pred, average='macro', zero_division=0),
-        "precision_weighted": precision_score(y_test, y_pred, average='weighted', zero_division=0),
-        "recall_weighted": recall_score(y_test, y_pred, average='weighted', zero_division=0),
-        "f1_weighted": f1_score(y_test, y_pred, average='weighted', zero_division=0),
+from dataclasses import dataclass, field
+from sklearn.metrics import classification_report
+from typing import Dict, Any, Optional
+NUM_CLASSES = 10
+@dataclass
+class EvaluationResult:
+    y_true: np.ndarray
+    y_pred: np.ndarray
+    y_proba: Optional[np.ndarray]
+    confusion_matrix: np.ndarray
+    metrics: Dict[str, float] = field(default_factory=dict)
+def predict_with_proba(model, X_test: np.ndarray):
+    if hasattr(model, "predict_proba"):
+        y_proba = np.asarray(model.predict_proba(X_test))
+        classes = getattr(model, "classes_", None)
+        if classes is None:
+            classes = np.arange(y_proba.shape[1])
+        return np.asarray(classes)[y_proba.argmax(axis=1)], y_proba
+    return np.asarray(model.predict(X_test)), None
+def confusion_from_predictions(y_true: np.ndarray, y_pred: np.ndarray) -> np.ndarray:
+    y_true = np.asarray(y_true).astype(np.int64)
+    y_pred = np.asarray(y_pred).astype(np.int64)
+    n_classes = max(NUM_CLASSES, int(y_true.max(initial=-1)) + 1, int(y_pred.max(initial=-1)) + 1)
+    counts = np.bincount(y_true * n_classes + y_pred, minlength=n_classes * n_classes)
+    return counts.reshape(n_classes, n_classes)
+def _per_class_scores(cm: np.ndarray) -> Dict[str, np.ndarray]:
+    tp = np.diag(cm).astype(np.float64)
+    support = cm.sum(axis=1).astype(np.float64)
+    predicted = cm.sum(axis=0).astype(np.float64)
+    precision = np.divide(tp, predicted, out=np.zeros_like(tp), where=predicted > 0)
+    recall = np.divide(tp, support, out=np.zeros_like(tp), where=support > 0)
+    denom = precision + recall
+    f1 = np.divide(2 * precision * recall, denom, out=np.zeros_like(tp), where=denom > 0)
+    return {
+        "precision": precision,
+        "recall": recall,
+        "f1": f1,
+        "support": support,
+        "present": (support > 0) | (predicted > 0),
     }
-    return metrics
-def compute_confusion_matrix(model, X_test: np.ndarray, y_test: np.ndarray) -> np.ndarray:
-    y_pred = model.predict(X_test)
-    return confusion_matrix(y_test, y_pred)
+def metrics_from_confusion(cm: np.ndarray) -> Dict[str, float]:
+    scores = _per_class_scores(cm)
+    present = scores["present"]
+    support = scores["support"]
+    total = support.sum()
+    weights = support / total if total else support
+    metrics = {"accuracy": float(np.trace(cm) / total) if total else 0.0}
+    for name in ("precision", "recall", "f1"):
+        values = scores[name]
+        metrics[f"{name}_macro"] = float(values[present].mean()) if present.any() else 0.0
+        metrics[f"{name}_weighted"] = float((values * weights).sum())
+    return {
+        key: metrics[key]
+        for key in (
+            "accuracy",
+            "precision_macro",
+            "recall_macro",
+            "f1_macro",
+            "precision_weighted",
+            "recall_weighted",
+            "f1_weighted",
+        )
+    }
+def evaluate_predictions(model, X_test: np.ndarray, y_test: np.ndarray) -> EvaluationResult:
+    y_pred, y_proba = predict_with_proba(model, X_test)
+    cm = confusion_from_predictions(y_test, y_pred)
+    return EvaluationResult(
+        y_true=np.asarray(y_test),
+        y_pred=y_pred,
+        y_proba=y_proba,
+        confusion_matrix=cm,
+        metrics=metrics_from_confusion(cm),
+    )
+def evaluate_model(
+    model,
+    X_test: np.ndarray,
+    y_test: np.ndarray,
+    y_pred: Optional[np.ndarray] = None,
+) -> Dict[str, float]:
+    if y_pred is None:
+        y_pred, _ = predict_with_proba(model, X_test)
+    return metrics_from_confusion(confusion_from_predictions(y_test, y_pred))
+def compute_confusion_matrix(
+    model,
+    X_test: np.ndarray,
+    y_test: np.ndarray,
+    y_pred: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    if y_pred is None:
+        y_pred, _ = predict_with_proba(model, X_test)
+    return confusion_from_predictions(y_test, y_pred)[:NUM_CLASSES, :NUM_CLASSES]
+def classification_report_from_confusion(cm: np.ndarray) -> Dict[str, Any]:
+    scores = _per_class_scores(cm)
+    metrics = metrics_from_confusion(cm)
+    total = int(scores["support"].sum())
+    report = {}
+    for label in range(NUM_CLASSES):
+        report[f"Digit {label}"] = {
+            "precision": float(scores["precision"][label]),
+            "recall": float(scores["recall"][label]),
+            "f1-score": float(scores["f1"][label]),
+            "support": float(scores["support"][label]),
+        }
+    report["accuracy"] = metrics["accuracy"]
+    for prefix, suffix in (("macro avg", "macro"), ("weighted avg", "weighted")):
+        report[prefix] = {
+            "precision": metrics[f"precision_{suffix}"],
+            "recall": metrics[f"recall_{suffix}"],
+            "f1-score": metrics[f"f1_{suffix}"],
+            "support": float(total),
+        }
+    return report
 def generate_classification_report(
     model,
     X_test: np.ndarray,
     y_test: np.ndarray,
-    output_dict: bool = False
+    output_dict: bool = False,
+    y_pred: Optional[np.ndarray] = None,
 ) -> Any:
-    y_pred = model.predict(X_test)
+    if y_pred is None:
+        y_pred, _ = predict_with_proba(model, X_test)
+    if output_dict:
+        return classification_report_from_confusion(confusion_from_predictions(y_test, y_pred))
     target_names = [f"Digit {i}" for i in range(10)]
     return classification_report(
         y_test,
         y_pred,
+        labels=list(range(10)),
         target_names=target_names,
-        output_dict=output_dict,
+        output_dict=False,
         zero_division=0
     )
-def compute_per_class_accuracy(model, X_test: np.ndarray, y_test: np.ndarray) -> Dict[int, float]:
-    y_pred = model.predict(X_test)
-    per_class_acc = {}
-    for label in range(10):
-        mask = y_test == label
-        if mask.sum() > 0:
-            per_class_acc[label] = accuracy_score(y_test[mask], y_pred[mask])
-        else:
-            per_class_acc[label] = 0.0
-    return per_class_acc
+def compute_per_class_accuracy(
+    model,
+    X_test: np.ndarray,
+    y_test: np.ndarray,
+    y_pred: Optional[np.ndarray] = None,
+) -> Dict[int, float]:
+    if y_pred is None:
+        y_pred, _ = predict_with_proba(model, X_test)
+    scores = _per_class_scores(confusion_from_predictions(y_test, y_pred))
+    return {label: float(scores["recall"][label]) for label in range(NUM_CLASSES)}
@@ -0,0 +1,55 @@
+import time
+from typing import Any, Dict, List, Optional, Sequence
+from mlflow.entities import Metric, Param, RunTag
+from mlflow.tracking import MlflowClient
+MAX_METRICS_PER_BATCH = 1000
+MAX_PARAMS_PER_BATCH = 100
+MAX_TAGS_PER_BATCH = 100
+MAX_ENTITIES_PER_BATCH = 1000
+class BatchedRunLogger:
+    def __init__(self, run_id: str, client: Optional[MlflowClient] = None):
+        self.run_id = run_id
+        self.client = client or MlflowClient()
+        self.request_count = 0
+        self._metrics: List[Metric] = []
+        self._params: List[Param] = []
+        self._tags: List[RunTag] = []
+    def __enter__(self):
+        return self
+    def __exit__(self, exc_type, exc, tb):
+        self.flush()
+        return False
+    @property
+    def pending(self) -> int:
+        return len(self._metrics) + len(self._params) + len(self._tags)
+    def log_param(self, key: str, value: Any) -> None:
+        self._params.append(Param(key, str(value)))
+    def log_params(self, params: Dict[str, Any]) -> None:
+        for key, value in params.items():
+            self.log_param(key, value)
+    def set_tag(self, key: str, value: Any) -> None:
+        self._tags.append(RunTag(key, str(value)))
+    def log_metric(self, key: str, value: float, step: int = 0, timestamp: Optional[int] = None) -> None:
+        timestamp = timestamp or int(time.time() * 1000)
+        self._metrics.append(Metric(key, float(value), timestamp, step))
+    def log_metrics(self, metrics: Dict[str, float], step: int = 0) -> None:
+        timestamp = int(time.time() * 1000)
+        for key, value in metrics.items():
+            self.log_metric(key, value, step=step, timestamp=timestamp)
+    def log_series(self, key: str, values: Sequence[float], start_step: int = 1) -> None:
+        timestamp = int(time.time() * 1000)
+        for step, value in enumerate(values, start=start_step):
+            self.log_metric(key, value, step=step, timestamp=timestamp)
+    def flush(self) -> int:
+        requests = 0
+        while self.pending:
+            params = self._params[:MAX_PARAMS_PER_BATCH]
+            tags = self._tags[:min(MAX_TAGS_PER_BATCH, MAX_ENTITIES_PER_BATCH - len(params))]
+            metrics = self._metrics[:min(MAX_METRICS_PER_BATCH, MAX_ENTITIES_PER_BATCH - len(params) - len(tags))]
+            self.client.log_batch(self.run_id, metrics=metrics, params=params, tags=tags)
+            del self._params[:len(params)]
+            del self._tags[:len(tags)]
+            del self._metrics[:len(metrics)]
+            requests += 1
+        self.request_count += requests
+        return requests
@@ -1,34 +1,171 @@
-from ml_core.training.artifacts import save_training_artifacts
-from ml_core.training.evaluate import evaluate_model, generate_classification_report
+from ml_core.training.artifacts import start_training_artifacts
+from ml_core.training.tracking import BatchedRunLogger
+from ml_core.training.async_tracking import AsyncRunTracker, get_async_tracker
+from ml_core.training.evaluate import evaluate_predictions
 from ml_core.models.mnist_cnn import MNISTClassifier
 from ml_core.config import get_config
+from ml_core.utils.data_utils import get_mnist_arrays
+from ml_core.utils.fingerprint import (
+    FINGERPRINT_TAG,
+    compute_fingerprint,
+    find_existing_run,
+    get_code_version,
+    get_data_version,
+)
 import argparse
 import os
+import shutil
 import sys
 import tempfile
 from pathlib import Path
+from typing import Callable
 import numpy as np
 import mlflow
 import mlflow.sklearn
-from sklearn.datasets import fetch_openml
-from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+class TrainingCancelled(Exception):
+    pass
 def set_seeds(seed: int):
     np.random.seed(seed)
 def load_mnist_data(data_dir: str = "./data"):
     os.makedirs(data_dir, exist_ok=True)
     print("Loading MNIST dataset...")
-    mnist = fetch_openml('mnist_784', version=1,
-                         as_frame=False, data_home=data_dir)
-    X = mnist.data.astype('float32') / 255.0
-    y = mnist.target.astype('int')
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=0.2, random_state=42, stratify=y
-    )
+    X_train, X_test, y_train, y_test = get_mnist_arrays(data_dir)
     print(f"Training set: {X_train.shape[0]} samples")
     print(f"Test set: {X_test.shape[0]} samples")
     return X_train, X_test, y_train, y_test
+def log_model_outputs(
+    model,
+    X_test,
+    y_test,
+    run_id: str,
+    run_logger: BatchedRunLogger = None,
+    tracker: AsyncRunTracker = None,
+) -> dict:
+    run_logger = run_logger or BatchedRunLogger(run_id, client=tracker)
+    evaluation = evaluate_predictions(model, X_test, y_test)
+    metrics = evaluation.metrics
+    run_logger.log_metrics(metrics)
+    run_logger.flush()
+    for metric_name, metric_value in metrics.items():
+        print(f"  {metric_name}: {metric_value:.4f}")
+    print("ONNX export skipped: Model is sklearn pipeline, requires skl2onnx.")
+    if tracker is not None:
+        output_dir = tempfile.mkdtemp(prefix="mlflow-figures-")
+        try:
+            pending = start_training_artifacts(model, X_test, y_test, output_dir=output_dir, run_id=run_id, evaluation=evaluation)
+            tracker.log_model(run_id, model, "model")
+        except Exception:
+            shutil.rmtree(output_dir, ignore_errors=True)
+            raise
+        tracker.log_pending_artifacts(run_id, pending, output_dir)
+        return metrics
+    with tempfile.TemporaryDirectory() as tmpdir:
+        pending = start_training_artifacts(
+            model, X_test, y_test,
+            output_dir=tmpdir,
+            run_id=run_id,
+            evaluation=evaluation,
+        )
+        mlflow.sklearn.log_model(
+            model,
+            "model",
+            registered_model_name=None,
+        )
+        if pending.wait():
+            mlflow.log_artifacts(tmpdir)
+    return metrics
+def _fit_and_log(
+    model,
+    params: dict,
+    data,
+    run_id: str,
+    tracker: AsyncRunTracker = None,
+    progress_callback: Callable[[dict], None] = None,
+    warm_start: bool = False,
+) -> None:
+    X_train, X_test, y_train, y_test = data
+    run_logger = BatchedRunLogger(run_id, client=tracker)
+    run_logger.log_params({
+        **params,
+        "model_type": "MLPClassifier",
+        "hidden_layer_sizes": f"({params['hidden_size']}, {params['hidden_size'] // 2})",
+    })
+    print(f"\nTraining model with run_id: {run_id}")
+    print(
+        f"Parameters: lr={params['learning_rate']}, epochs={params['epochs']}, batch_size={params['batch_size']}")
+    def on_epoch(progress: dict) -> None:
+        print(f"  epoch {progress['epoch']}/{progress['epochs']}: loss={progress['loss']:.4f}"
+              + (f" val_accuracy={progress['val_accuracy']:.4f}" if "val_accuracy" in progress else ""))
+        if progress_callback is not None:
+            progress_callback({**progress, "run_id": run_id})
+    first_epoch = len(model.loss_curve_) if warm_start else 0
+    model.fit_epochs(X_train, y_train, callback=on_epoch, warm_start=warm_start)
+    run_logger.log_series("train_loss", model.loss_curve_[first_epoch:])
+    if model.validation_scores_ is not None:
+        run_logger.log_series("val_accuracy", model.validation_scores_)
+    log_model_outputs(model, X_test, y_test, run_id, run_logger=run_logger, tracker=tracker)
+    print(f"MLflow logging round-trips (params/metrics): {run_logger.request_count}")
+def _train_async(
+    model,
+    params: dict,
+    data,
+    experiment_name: str,
+    run_name: str,
+    tags: dict,
+    flush_timeout: float,
+    progress_callback: Callable[[dict], None] = None,
+    warm_start: bool = False,
+) -> str:
+    tracker = get_async_tracker()
+    run_id = tracker.create_run(experiment_name, run_name=run_name, tags=tags)
+    try:
+        _fit_and_log(
+            model, params, data, run_id,
+            tracker=tracker, progress_callback=progress_callback, warm_start=warm_start,
+        )
+    except Exception as e:
+        tracker.set_terminated(run_id, "KILLED" if isinstance(e, TrainingCancelled) else "FAILED")
+        tracker.flush(flush_timeout)
+        raise
+    tracker.set_terminated(run_id, "FINISHED")
+    flushed = tracker.flush(flush_timeout)
+    stats = tracker.stats()
+    print(f"Async tracking: queue_depth={stats['queue_depth']} lag={stats['lag_seconds']:.1f}s "
+          f"completed={stats['completed']} failed={stats['failed']}")
+    if not flushed:
+        print(f"Warning: async tracking did not drain within {flush_timeout}s; "
+              f"{stats['queue_depth']} operations still pending for run {run_id}")
+    return run_id
+def run_training(
+    model,
+    params: dict,
+    data,
+    experiment_name: str,
+    run_name: str = None,
+    tags: dict = None,
+    progress_callback: Callable[[dict], None] = None,
+    warm_start: bool = False,
+) -> str:
+    config = get_config()
+    if config.tracking_mode == "async":
+        return _train_async(
+            model, params, data, experiment_name, run_name, tags,
+            flush_timeout=config.tracking_flush_timeout,
+            progress_callback=progress_callback,
+            warm_start=warm_start,
+        )
+    with mlflow.start_run(run_name=run_name, tags=tags) as run:
+        try:
+            _fit_and_log(
+                model, params, data, run.info.run_id,
+                progress_callback=progress_callback, warm_start=warm_start,
+            )
+        except TrainingCancelled:
+            mlflow.end_run(status="KILLED")
+            raise
+    return run.info.run_id
 def train_model(
     learning_rate: float = 0.001,
     epochs: int = 10,
@@ -38,12 +175,39 @@ def train_model(
     random_seed: int = 42,
     experiment_name: str = "MNIST_Experiments",
     run_name: str = None,
+    tags: dict = None,
+    reuse_existing: bool = False,
+    progress_callback: Callable[[dict], None] = None,
 ) -> str:
     set_seeds(random_seed)
     config = get_config()
     mlflow.set_tracking_uri(config.mlflow_tracking_uri)
     mlflow.set_experiment(experiment_name)
     X_train, X_test, y_train, y_test = load_mnist_data(config.data_dir)
+    data_version = get_data_version(config.data_dir)
+    fingerprint = compute_fingerprint(
+        {
+            "learning_rate": learning_rate,
+            "epochs": epochs,
+            "batch_size": batch_size,
+            "hidden_size": hidden_size,
+            "dropout": dropout,
+            "random_seed": random_seed,
+            "dtype": config.model_dtype,
+        },
+        data_version,
+    )
+    if reuse_existing:
+        existing_run_id = find_existing_run(fingerprint, experiment_name)
+        if existing_run_id:
+            print(f"Reusing run {existing_run_id} with identical fingerprint {fingerprint[:12]}")
+            return existing_run_id
+    tags = {
+        **(tags or {}),
+        FINGERPRINT_TAG: fingerprint,
+        "data_version": data_version,
+        "code_version": get_code_version(),
+    }
     model = MNISTClassifier(
         hidden_layer_sizes=(hidden_size, hidden_size // 2),
         learning_rate_init=learning_rate,
@@ -53,45 +217,22 @@ def train_model(
         random_state=random_seed,
         early_stopping=True,
         validation_fraction=0.1,
+        dtype=config.model_dtype,
     )
-    with mlflow.start_run(run_name=run_name) as run:
-        mlflow.log_param("learning_rate", learning_rate)
-        mlflow.log_param("epochs", epochs)
-        mlflow.log_param("batch_size", batch_size)
-        mlflow.log_param("hidden_size", hidden_size)
-        mlflow.log_param("dropout", dropout)
-        mlflow.log_param("random_seed", random_seed)
-        mlflow.log_param("model_type", "MLPClassifier")
-        mlflow.log_param("hidden_layer_sizes",
-                         f"({hidden_size}, {hidden_size // 2})")
-        print(f"\nTraining model with run_id: {run.info.run_id}")
-        print(
-            f"Parameters: lr={learning_rate}, epochs={epochs}, batch_size={batch_size}")
-        model.fit(X_train, y_train)
-        metrics = evaluate_model(model, X_test, y_test)
-        for metric_name, metric_value in metrics.items():
-            mlflow.log_metric(metric_name, metric_value)
-            print(f"  {metric_name}: {metric_value:.4f}")
-        mlflow.sklearn.log_model(
-            model,
-            "model",
-            registered_model_name=None,
-        )
-        try:
-            print("ONNX export skipped: Model is sklearn pipeline, requires skl2onnx.")
-        except Exception as e:
-            print(f"ONNX export failed: {e}")
-        with tempfile.TemporaryDirectory() as tmpdir:
-            save_training_artifacts(
-                model, X_test, y_test,
-                output_dir=tmpdir,
-                run_id=run.info.run_id
-            )
-            for artifact_file in Path(tmpdir).glob("*"):
-                mlflow.log_artifact(str(artifact_file))
-        print(f"\nTraining complete. Run ID: {run.info.run_id}")
-        print(f"View at: {config.mlflow_tracking_uri}")
-        return run.info.run_id
+    params = {
+        "learning_rate": learning_rate,
+        "epochs": epochs,
+        "batch_size": batch_size,
+        "hidden_size": hidden_size,
+        "dropout": dropout,
+        "random_seed": random_seed,
+        "dtype": config.model_dtype,
+    }
+    data = (X_train, X_test, y_train, y_test)
+    run_id = run_training(model, params, data, experiment_name, run_name, tags, progress_callback=progress_callback)
+    print(f"\nTraining complete. Run ID: {run_id}")
+    print(f"View at: {config.mlflow_tracking_uri}")
+    return run_id
 def parse_args():
     parser = argparse.ArgumentParser(
         description="Train MNIST classifier with MLflow tracking")
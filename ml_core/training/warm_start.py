@@ -0,0 +1,112 @@
+import hashlib
+import os
+import sys
+from pathlib import Path
+from typing import Any, Callable, Dict, Tuple
+import numpy as np
+import mlflow
+import mlflow.sklearn
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from ml_core.config import get_config
+from ml_core.experiments.registry import get_latest_model_version
+from ml_core.models.mnist_cnn import MNISTClassifier
+from ml_core.training.train import load_mnist_data, run_training, set_seeds
+from ml_core.utils.fingerprint import get_code_version, get_data_version
+def load_parent_model(model_name: str, stage: str = "Production") -> Tuple[MNISTClassifier, Dict[str, Any]]:
+    parent = get_latest_model_version(model_name, stage=stage)
+    if parent is None:
+        raise ValueError(f"No {stage} version registered for model '{model_name}'")
+    model = mlflow.sklearn.load_model(f"models:/{model_name}/{parent['version']}")
+    if not isinstance(model, MNISTClassifier) or model._pipeline is None:
+        raise ValueError(f"{model_name} v{parent['version']} is not a fitted MNISTClassifier")
+    return model, parent
+def load_refresh_data(path: str) -> Tuple[np.ndarray, np.ndarray, str]:
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Refresh dataset not found: {path}")
+    with np.load(path) as archive:
+        X = np.asarray(archive["X"], dtype=np.float32)
+        y = np.asarray(archive["y"]).astype(int)
+    X = X.reshape(X.shape[0], -1)
+    if X.shape[0] == 0 or X.shape[0] != y.shape[0]:
+        raise ValueError(f"Refresh dataset {path} must contain matching, non-empty X and y arrays")
+    with open(path, "rb") as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    return X, y, digest
+def build_refresh_set(
+    X_new: np.ndarray,
+    y_new: np.ndarray,
+    X_replay: np.ndarray,
+    y_replay: np.ndarray,
+    replay_ratio: float,
+    random_seed: int = 42,
+) -> Tuple[np.ndarray, np.ndarray, int]:
+    replay_size = min(int(round(len(X_new) * replay_ratio)), len(X_replay))
+    if replay_size <= 0:
+        return X_new, y_new, 0
+    rng = np.random.default_rng(random_seed)
+    index = np.sort(rng.choice(len(X_replay), size=replay_size, replace=False))
+    X = np.concatenate([X_new, np.asarray(X_replay[index], dtype=X_new.dtype)])
+    y = np.concatenate([y_new, np.asarray(y_replay[index]).astype(y_new.dtype)])
+    order = rng.permutation(len(X))
+    return X[order], y[order], replay_size
+def refresh_model(
+    model_name: str = None,
+    stage: str = "Production",
+    data_path: str = None,
+    epochs: int = None,
+    replay_ratio: float = None,
+    random_seed: int = None,
+    experiment_name: str = "MNIST_Experiments",
+    run_name: str = None,
+    tags: dict = None,
+    progress_callback: Callable[[dict], None] = None,
+) -> str:
+    config = get_config()
+    model_name = model_name or config.model_name
+    data_path = data_path or config.refresh_data_path
+    epochs = epochs or config.refresh_epochs
+    replay_ratio = config.refresh_replay_ratio if replay_ratio is None else replay_ratio
+    random_seed = config.random_seed if random_seed is None else random_seed
+    set_seeds(random_seed)
+    mlflow.set_tracking_uri(config.mlflow_tracking_uri)
+    mlflow.set_experiment(experiment_name)
+    X_new, y_new, refresh_digest = load_refresh_data(data_path)
+    model, parent = load_parent_model(model_name, stage)
+    unknown = np.setdiff1d(np.unique(y_new), model.classes_)
+    if unknown.size:
+        raise ValueError(f"Refresh dataset contains labels unknown to {model_name} v{parent['version']}: {unknown.tolist()}")
+    X_train, X_test, y_train, y_test = load_mnist_data(config.data_dir)
+    X_fit, y_fit, replay_size = build_refresh_set(X_new, y_new, X_train, y_train, replay_ratio, random_seed)
+    print(f"Warm-starting {model_name} v{parent['version']} (run {parent['run_id']}) on "
+          f"{len(X_new)} new + {replay_size} replayed samples for {epochs} epochs")
+    model.max_iter = epochs
+    model.random_state = random_seed
+    model.astype(config.model_dtype)
+    params = {
+        "learning_rate": model.learning_rate_init,
+        "epochs": epochs,
+        "batch_size": model.batch_size,
+        "hidden_size": model.hidden_layer_sizes[0],
+        "dropout": model.alpha,
+        "random_seed": random_seed,
+        "dtype": config.model_dtype,
+        "refresh_samples": len(X_new),
+        "replay_samples": replay_size,
+        "replay_ratio": replay_ratio,
+    }
+    tags = {
+        **(tags or {}),
+        "training_mode": "warm_start",
+        "parent_run_id": parent["run_id"],
+        "parent_model_name": model_name,
+        "parent_model_version": str(parent["version"]),
+        "refresh_data_sha256": refresh_digest,
+        "data_version": get_data_version(config.data_dir),
+        "code_version": get_code_version(),
+    }
+    run_id = run_training(
+        model, params, (X_fit, X_test, y_fit, y_test), experiment_name, run_name, tags,
+        progress_callback=progress_callback, warm_start=True,
+    )
+    print(f"\nRefresh complete. Run ID: {run_id} (parent run {parent['run_id']})")
+    return run_id
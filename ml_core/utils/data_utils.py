@@ -1 +1,129 @@
-
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Any, Tuple
+import numpy as np
+DATASET_NAME = "mnist_784"
+DATASET_VERSION = "v1-float32-split80-seed42"
+ARRAY_NAMES = ("X_train", "X_test", "y_train", "y_test")
+MANIFEST_FILE = "manifest.json"
+_verified_manifests: Dict[str, str] = {}
+_loaded_arrays: Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = {}
+class DatasetIntegrityError(RuntimeError):
+    pass
+def get_dataset_dir(data_dir: str) -> Path:
+    return Path(data_dir) / "cache" / f"{DATASET_NAME}-{DATASET_VERSION}"
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(8 * 1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+@contextmanager
+def _build_lock(dataset_dir: Path):
+    dataset_dir.parent.mkdir(parents=True, exist_ok=True)
+    with open(dataset_dir.parent / f".{dataset_dir.name}.lock", "a") as handle:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+def read_manifest(data_dir: str) -> Dict[str, Any]:
+    with open(get_dataset_dir(data_dir) / MANIFEST_FILE) as f:
+        return json.load(f)
+def build_mnist_cache(
+    data_dir: str,
+    test_size: float = 0.2,
+    random_state: int = 42,
+) -> Path:
+    from sklearn.datasets import fetch_openml
+    from sklearn.model_selection import train_test_split
+    dataset_dir = get_dataset_dir(data_dir)
+    with _build_lock(dataset_dir):
+        if (dataset_dir / MANIFEST_FILE).exists():
+            return dataset_dir
+        print("Building MNIST dataset cache...")
+        mnist = fetch_openml(DATASET_NAME, version=1, as_frame=False, data_home=data_dir)
+        X = mnist.data.astype('float32') / 255.0
+        y = mnist.target.astype('int')
+        X_train, X_test, y_train, y_test = train_test_split(
+            X, y, test_size=test_size, random_state=random_state, stratify=y
+        )
+        staging_dir = dataset_dir.parent / f".{dataset_dir.name}-{os.getpid()}"
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        staging_dir.mkdir(parents=True)
+        arrays = {}
+        for name, array in zip(ARRAY_NAMES, (X_train, X_test, y_train, y_test)):
+            path = staging_dir / f"{name}.npy"
+            np.save(path, np.ascontiguousarray(array))
+            arrays[name] = {
+                "shape": list(array.shape),
+                "dtype": str(array.dtype),
+                "sha256": _file_sha256(path),
+            }
+        manifest = {
+            "dataset": DATASET_NAME,
+            "version": DATASET_VERSION,
+            "test_size": test_size,
+            "random_state": random_state,
+            "created_at": time.time(),
+            "arrays": arrays,
+        }
+        manifest["fingerprint"] = hashlib.sha256(
+            json.dumps(arrays, sort_keys=True).encode()
+        ).hexdigest()
+        with open(staging_dir / MANIFEST_FILE, "w") as f:
+            json.dump(manifest, f, indent=2)
+        shutil.rmtree(dataset_dir, ignore_errors=True)
+        os.rename(staging_dir, dataset_dir)
+        return dataset_dir
+def verify_mnist_cache(data_dir: str) -> Dict[str, Any]:
+    dataset_dir = get_dataset_dir(data_dir)
+    manifest = read_manifest(data_dir)
+    if _verified_manifests.get(str(dataset_dir)) == manifest["fingerprint"]:
+        return manifest
+    for name, spec in manifest["arrays"].items():
+        if _file_sha256(dataset_dir / f"{name}.npy") != spec["sha256"]:
+            raise DatasetIntegrityError(f"Checksum mismatch for {dataset_dir / name}.npy")
+    _verified_manifests[str(dataset_dir)] = manifest["fingerprint"]
+    return manifest
+def load_mnist_arrays(
+    data_dir: str,
+    verify: bool = True,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    dataset_dir = get_dataset_dir(data_dir)
+    if not (dataset_dir / MANIFEST_FILE).exists():
+        build_mnist_cache(data_dir)
+    if verify:
+        try:
+            manifest = verify_mnist_cache(data_dir)
+        except DatasetIntegrityError as e:
+            print(f"{e}; rebuilding dataset cache")
+            with _build_lock(dataset_dir):
+                shutil.rmtree(dataset_dir, ignore_errors=True)
+            build_mnist_cache(data_dir)
+            manifest = verify_mnist_cache(data_dir)
+    else:
+        manifest = read_manifest(data_dir)
+    arrays = []
+    for name in ARRAY_NAMES:
+        array = np.load(dataset_dir / f"{name}.npy", mmap_mode="r")
+        spec = manifest["arrays"][name]
+        if list(array.shape) != spec["shape"] or str(array.dtype) != spec["dtype"]:
+            raise DatasetIntegrityError(f"Unexpected shape or dtype for {dataset_dir / name}.npy")
+        arrays.append(array)
+    return tuple(arrays)
+def get_mnist_arrays(data_dir: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    key = str(get_dataset_dir(data_dir).resolve())
+    if key not in _loaded_arrays:
+        _loaded_arrays[key] = load_mnist_arrays(data_dir)
+    return _loaded_arrays[key]
+def clear_loaded_arrays() -> None:
+    _loaded_arrays.clear()
+def get_dataset_fingerprint(data_dir: str) -> str:
+    return read_manifest(data_dir)["fingerprint"]
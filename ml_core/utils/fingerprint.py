@@ -0,0 +1,129 @@
+import hashlib
+import json
+import os
+import sys
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Any, Optional
+import mlflow
+from mlflow.exceptions import MlflowException
+from mlflow.tracking import MlflowClient
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from ml_core.config import get_config
+from ml_core.utils.data_utils import get_dataset_fingerprint, load_mnist_arrays
+FINGERPRINT_TAG = "fingerprint"
+FINGERPRINT_PARAMS = {
+    "learning_rate": float,
+    "epochs": int,
+    "batch_size": int,
+    "hidden_size": int,
+    "dropout": float,
+    "random_seed": int,
+    "dtype": str,
+}
+CODE_PATHS = ("models", "training/train.py", "training/evaluate.py")
+SYNC_MARGIN_MS = 60 * 1000
+def normalize_params(params: Dict[str, Any]) -> Dict[str, Any]:
+    normalized = {}
+    for name, cast in FINGERPRINT_PARAMS.items():
+        value = params.get(name)
+        if value is None:
+            normalized[name] = None
+        elif cast is float:
+            normalized[name] = f"{float(value):.10g}"
+        elif cast is str:
+            normalized[name] = str(value)
+        else:
+            normalized[name] = int(float(value))
+    return normalized
+@lru_cache(maxsize=1)
+def get_code_version() -> str:
+    if os.getenv("CODE_VERSION"):
+        return os.getenv("CODE_VERSION")
+    root = Path(__file__).parent.parent
+    digest = hashlib.sha256()
+    for rel in CODE_PATHS:
+        path = root / rel
+        files = sorted(path.rglob("*.py")) if path.is_dir() else [path]
+        for file in files:
+            digest.update(str(file.relative_to(root)).encode())
+            digest.update(file.read_bytes())
+    return digest.hexdigest()[:16]
+def get_data_version(data_dir: str) -> str:
+    try:
+        return get_dataset_fingerprint(data_dir)[:16]
+    except FileNotFoundError:
+        load_mnist_arrays(data_dir)
+        return get_dataset_fingerprint(data_dir)[:16]
+def compute_fingerprint(
+    params: Dict[str, Any],
+    data_version: str,
+    code_version: Optional[str] = None,
+) -> str:
+    payload = {
+        "params": normalize_params(params),
+        "data_version": data_version,
+        "code_version": code_version or get_code_version(),
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+def _index_path(cache_dir: str, experiment_id: str) -> Path:
+    return Path(cache_dir) / "cache" / f"fingerprints-{experiment_id}.json"
+def load_fingerprint_index(experiment_name: str, cache_dir: Optional[str] = None) -> Dict[str, str]:
+    config = get_config()
+    mlflow.set_tracking_uri(config.mlflow_tracking_uri)
+    client = MlflowClient()
+    experiment = client.get_experiment_by_name(experiment_name)
+    if experiment is None:
+        return {}
+    path = _index_path(cache_dir or config.data_dir, experiment.experiment_id)
+    index = {"synced_at": 0, "runs": {}}
+    if path.exists():
+        try:
+            with open(path) as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            pass
+    synced_at = int(time.time() * 1000)
+    filter_string = "attributes.status = 'FINISHED'"
+    if index["synced_at"]:
+        filter_string += f" and attributes.end_time > {index['synced_at'] - SYNC_MARGIN_MS}"
+    page_token = None
+    while True:
+        runs = client.search_runs(
+            experiment_ids=[experiment.experiment_id],
+            filter_string=filter_string,
+            max_results=1000,
+            page_token=page_token,
+        )
+        for run in runs:
+            fingerprint = run.data.tags.get(FINGERPRINT_TAG)
+            if fingerprint:
+                index["runs"][fingerprint] = run.info.run_id
+        page_token = runs.token
+        if not page_token:
+            break
+    index["synced_at"] = synced_at
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(index, f)
+    os.replace(tmp_path, path)
+    return index["runs"]
+def find_existing_run(
+    fingerprint: str,
+    experiment_name: str,
+    index: Optional[Dict[str, str]] = None,
+) -> Optional[str]:
+    if index is None:
+        index = load_fingerprint_index(experiment_name)
+    run_id = index.get(fingerprint)
+    if run_id is None:
+        return None
+    try:
+        run = MlflowClient().get_run(run_id)
+    except MlflowException:
+        return None
+    if run.info.lifecycle_stage != "active" or run.info.status != "FINISHED":
+        return None
+    return run_id
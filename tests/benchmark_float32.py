@@ -0,0 +1,87 @@
+import argparse
+import pickle
+import sys
+import time
+import warnings
+from pathlib import Path
+import numpy as np
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from ml_core.models.mnist_cnn import MNISTClassifier
+def load_data(args):
+    if args.synthetic:
+        rng = np.random.default_rng(0)
+        centers = rng.random((10, 784))
+        y = rng.integers(0, 10, args.train_size + args.test_size)
+        X = np.clip(centers[y] + rng.normal(scale=1.5, size=(len(y), 784)), 0.0, 1.0)
+        return X[:args.train_size], X[args.train_size:], y[:args.train_size], y[args.train_size:]
+    from ml_core.utils.data_utils import get_mnist_arrays
+    X_train, X_test, y_train, y_test = get_mnist_arrays(args.data_dir)
+    return (
+        np.asarray(X_train[:args.train_size], dtype=np.float64),
+        np.asarray(X_test[:args.test_size], dtype=np.float64),
+        np.asarray(y_train[:args.train_size]),
+        np.asarray(y_test[:args.test_size]),
+    )
+def weight_bytes(model):
+    classifier = model._pipeline.named_steps["classifier"]
+    return sum(w.nbytes for w in classifier.coefs_ + classifier.intercepts_)
+def measure(dtype, data, args):
+    X_train, X_test, y_train, y_test = data
+    model = MNISTClassifier(
+        hidden_layer_sizes=(args.hidden_size, args.hidden_size // 2),
+        max_iter=args.epochs,
+        batch_size=args.batch_size,
+        random_state=42,
+        dtype=dtype,
+    )
+    start = time.perf_counter()
+    model.fit_epochs(X_train, y_train)
+    fit_seconds = time.perf_counter() - start
+    requests = [X_test[i:i + 1].tolist() for i in range(min(len(X_test), 500))]
+    start = time.perf_counter()
+    for _ in range(args.repeats):
+        model.predict_proba(X_test)
+    batch_seconds = (time.perf_counter() - start) / args.repeats
+    start = time.perf_counter()
+    for image in requests:
+        model.predict_proba(np.asarray(image, dtype=dtype))
+    single_ms = 1000 * (time.perf_counter() - start) / len(requests)
+    return {
+        "dtype": dtype,
+        "fit_s": fit_seconds,
+        "batch_ms": 1000 * batch_seconds,
+        "single_ms": single_ms,
+        "weights_kb": weight_bytes(model) / 1024,
+        "pickle_kb": len(pickle.dumps(model)) / 1024,
+        "accuracy": float(model.score(X_test, y_test)),
+    }
+def main():
+    parser = argparse.ArgumentParser(description="Compare float64 and float32 MNISTClassifier training and inference")
+    parser.add_argument("--data-dir", default="./data")
+    parser.add_argument("--synthetic", action="store_true", help="Use generated data instead of the MNIST cache")
+    parser.add_argument("--train-size", type=int, default=20000)
+    parser.add_argument("--test-size", type=int, default=5000)
+    parser.add_argument("--hidden-size", type=int, default=128)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--epochs", type=int, default=10)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--max-accuracy-delta", type=float, default=0.005)
+    args = parser.parse_args()
+    warnings.filterwarnings("ignore")
+    data = load_data(args)
+    print(f"Train: {len(data[0])} samples, test: {len(data[1])} samples, "
+          f"hidden=({args.hidden_size}, {args.hidden_size // 2}), epochs={args.epochs}\n")
+    results = [measure(dtype, data, args) for dtype in ("float64", "float32")]
+    for r in results:
+        print(f"  {r['dtype']:<8} fit: {r['fit_s']:6.2f} s   batch predict: {r['batch_ms']:7.1f} ms   "
+              f"single predict: {r['single_ms']:5.3f} ms   weights: {r['weights_kb']:7.1f} KB   "
+              f"pickle: {r['pickle_kb']:7.1f} KB   accuracy: {r['accuracy']:.4f}")
+    baseline, candidate = results
+    delta = candidate["accuracy"] - baseline["accuracy"]
+    print(f"\nfloat32 vs float64: fit {baseline['fit_s'] / candidate['fit_s']:.2f}x faster, "
+          f"batch predict {baseline['batch_ms'] / candidate['batch_ms']:.2f}x faster, "
+          f"model {baseline['pickle_kb'] / candidate['pickle_kb']:.2f}x smaller, "
+          f"accuracy delta {delta:+.4f}")
+    return 0 if abs(delta) <= args.max_accuracy_delta else 1
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+import argparse
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+import urllib.request
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import mlflow
+import mlflow.utils.rest_utils as rest_utils
+from ml_core.training.tracking import BatchedRunLogger
+PARAMS = {
+    "learning_rate": 0.001,
+    "epochs": 10,
+    "batch_size": 64,
+    "hidden_size": 128,
+    "dropout": 0.2,
+    "random_seed": 42,
+    "model_type": "MLPClassifier",
+    "hidden_layer_sizes": "(128, 64)",
+}
+METRICS = {
+    "accuracy": 0.97,
+    "precision_macro": 0.97,
+    "recall_macro": 0.97,
+    "f1_macro": 0.97,
+    "precision_weighted": 0.97,
+    "recall_weighted": 0.97,
+    "f1_weighted": 0.97,
+}
+class RequestCounter:
+    def __init__(self):
+        self.count = 0
+        self._original = rest_utils.http_request
+    def __enter__(self):
+        def counting(*args, **kwargs):
+            self.count += 1
+            return self._original(*args, **kwargs)
+        rest_utils.http_request = counting
+        return self
+    def __exit__(self, *exc):
+        rest_utils.http_request = self._original
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+def start_server(workdir, port):
+    proc = subprocess.Popen(
+        [
+            sys.executable, "-m", "mlflow", "server",
+            "--backend-store-uri", f"sqlite:///{workdir}/mlflow.db",
+            "--default-artifact-root", f"{workdir}/artifacts",
+            "--host", "127.0.0.1", "--port", str(port),
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.time() + 120
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1)
+            return proc
+        except OSError:
+            time.sleep(0.5)
+    proc.terminate()
+    raise RuntimeError("MLflow server did not start")
+def log_legacy(loss_curve):
+    for key, value in PARAMS.items():
+        mlflow.log_param(key, value)
+    for key, value in METRICS.items():
+        mlflow.log_metric(key, value)
+def log_legacy_with_curve(loss_curve):
+    log_legacy(loss_curve)
+    for step, loss in enumerate(loss_curve, start=1):
+        mlflow.log_metric("train_loss", loss, step=step)
+def log_batched(loss_curve):
+    run_logger = BatchedRunLogger(mlflow.active_run().info.run_id)
+    run_logger.log_params(PARAMS)
+    run_logger.log_series("train_loss", loss_curve)
+    run_logger.log_metrics(METRICS)
+    run_logger.flush()
+def measure(name, fn, loss_curve, repeats):
+    counts = []
+    durations = []
+    for _ in range(repeats):
+        with mlflow.start_run():
+            with RequestCounter() as counter:
+                start = time.perf_counter()
+                fn(loss_curve)
+                durations.append(time.perf_counter() - start)
+            counts.append(counter.count)
+    print(f"  {name:<28} round-trips/run: {sum(counts) / repeats:6.1f}   "
+          f"logging time/run: {1000 * sum(durations) / repeats:7.1f} ms")
+    return sum(counts) / repeats
+def main():
+    parser = argparse.ArgumentParser(description="Compare MLflow round-trips for per-call vs batched run logging")
+    parser.add_argument("--epochs", type=int, default=50)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+    loss_curve = [1.0 / (i + 1) for i in range(args.epochs)]
+    with tempfile.TemporaryDirectory() as workdir:
+        port = free_port()
+        server = start_server(workdir, port)
+        try:
+            mlflow.set_tracking_uri(f"http://127.0.0.1:{port}")
+            mlflow.set_experiment("logging_benchmark")
+            print(f"Params: {len(PARAMS)}, final metrics: {len(METRICS)}, loss curve: {args.epochs} epochs\n")
+            legacy = measure("per-call (previous)", log_legacy, loss_curve, args.repeats)
+            legacy_curve = measure("per-call + loss curve", log_legacy_with_curve, loss_curve, args.repeats)
+            batched = measure("batched + loss curve", log_batched, loss_curve, args.repeats)
+        finally:
+            server.terminate()
+            server.wait()
+    print(f"\nRound-trips reduced from {legacy:.0f} ({legacy_curve:.0f} with curves) to {batched:.0f}")
+    return 0 if batched < legacy else 1
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+import argparse
+import multiprocessing as mp
+import os
+import pickle
+import sys
+import tempfile
+from pathlib import Path
+import numpy as np
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "api"))
+def read_memory_kb():
+    values = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[0].endswith(":") and parts[1].isdigit():
+                values[parts[0][:-1]] = int(parts[1])
+    return {
+        "rss": values.get("Rss", 0),
+        "pss": values.get("Pss", 0),
+        "private": values.get("Private_Clean", 0) + values.get("Private_Dirty", 0),
+    }
+def build_model(model_path, hidden_size):
+    from sklearn.neural_network import MLPClassifier
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import StandardScaler
+    rng = np.random.RandomState(0)
+    X = rng.rand(500, 784).astype("float32")
+    y = rng.randint(0, 10, 500)
+    pipeline = Pipeline([
+        ("scaler", StandardScaler()),
+        ("classifier", MLPClassifier(hidden_layer_sizes=(hidden_size, hidden_size // 2), max_iter=1)),
+    ])
+    pipeline.fit(X, y)
+    with open(model_path, "wb") as f:
+        pickle.dump(pipeline, f)
+    weights = sum(c.nbytes for c in pipeline.named_steps["classifier"].coefs_)
+    return weights
+def worker(mode, model_path, weights_dir, results, ready, release):
+    from app.services.shared_weights import share_model_weights
+    import sklearn.neural_network
+    import sklearn.pipeline
+    X = np.random.rand(64, 784).astype("float32")
+    before = read_memory_kb()
+    with open(model_path, "rb") as f:
+        model = pickle.load(f)
+    if mode == "shared":
+        share_model_weights(model, weights_dir)
+    model.predict(X)
+    after = read_memory_kb()
+    results.put({
+        "mode": mode,
+        "private_mb": (after["private"] - before["private"]) / 1024,
+        "pss_mb": (after["pss"] - before["pss"]) / 1024,
+    })
+    ready.wait()
+    release.wait()
+def run_mode(mode, model_path, weights_dir, n_workers):
+    ctx = mp.get_context("spawn")
+    results = ctx.Queue()
+    ready = ctx.Barrier(n_workers + 1)
+    release = ctx.Barrier(n_workers + 1)
+    procs = [
+        ctx.Process(target=worker, args=(mode, model_path, weights_dir, results, ready, release))
+        for _ in range(n_workers)
+    ]
+    for p in procs:
+        p.start()
+    ready.wait()
+    samples = [results.get() for _ in range(n_workers)]
+    release.wait()
+    for p in procs:
+        p.join()
+    return samples
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-worker memory for private vs shared model weights")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--hidden-size", type=int, default=4096)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        model_path = os.path.join(tmpdir, "model.pkl")
+        weights_dir = os.path.join(tmpdir, "weights")
+        weight_bytes = build_model(model_path, args.hidden_size)
+        print(f"Model weights: {weight_bytes / 1024 / 1024:.1f} MB, workers: {args.workers}")
+        totals = {}
+        for mode in ["private", "shared"]:
+            samples = run_mode(mode, model_path, weights_dir, args.workers)
+            private = [s["private_mb"] for s in samples]
+            totals[mode] = sum(private)
+            print(f"\n[{mode}]")
+            for i, s in enumerate(samples):
+                print(f"  worker {i}: private +{s['private_mb']:.1f} MB, pss +{s['pss_mb']:.1f} MB")
+            print(f"  total private: {totals[mode]:.1f} MB")
+        saved = totals["private"] - totals["shared"]
+        print(f"\nPrivate memory saved across {args.workers} workers: {saved:.1f} MB")
+        return 0 if totals["shared"] < totals["private"] else 1
+if __name__ == "__main__":
+    sys.exit(main())
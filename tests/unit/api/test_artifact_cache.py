@@ -0,0 +1,62 @@
+import os
+import pytest
+from unittest.mock import patch
+from app.services.artifact_cache import ArtifactCache
+def fake_download(payload_size=100):
+    def _download(artifact_uri, dst_path):
+        model_dir = os.path.join(dst_path, "model")
+        os.makedirs(model_dir, exist_ok=True)
+        with open(os.path.join(model_dir, "model.pkl"), "wb") as f:
+            f.write(b"x" * payload_size)
+        return model_dir
+    return _download
+class TestArtifactCache:
+    def test_download_once_then_hit(self, tmp_path):
+        cache = ArtifactCache(cache_dir=str(tmp_path), max_bytes=10_000)
+        with patch('app.services.artifact_cache.mlflow.artifacts.download_artifacts') as mock_download:
+            mock_download.side_effect = fake_download()
+            first = cache.get_or_download("MNISTClassifier", "1", "run1")
+            second = cache.get_or_download("MNISTClassifier", "1", "run1")
+            assert first == second
+            assert mock_download.call_count == 1
+            assert os.path.exists(os.path.join(first, "model.pkl"))
+    def test_keyed_by_version_and_run(self, tmp_path):
+        cache = ArtifactCache(cache_dir=str(tmp_path), max_bytes=10_000)
+        with patch('app.services.artifact_cache.mlflow.artifacts.download_artifacts') as mock_download:
+            mock_download.side_effect = fake_download()
+            v1 = cache.get_or_download("MNISTClassifier", "1", "run1")
+            v2 = cache.get_or_download("MNISTClassifier", "2", "run2")
+            assert v1 != v2
+            assert mock_download.call_count == 2
+    def test_lru_eviction_over_budget(self, tmp_path):
+        cache = ArtifactCache(cache_dir=str(tmp_path), max_bytes=250)
+        with patch('app.services.artifact_cache.mlflow.artifacts.download_artifacts') as mock_download:
+            mock_download.side_effect = fake_download(100)
+            cache.get_or_download("MNISTClassifier", "1", "run1")
+            cache.get_or_download("MNISTClassifier", "2", "run2")
+            os.utime(tmp_path / cache._entry_key("MNISTClassifier", "1", "run1") / "manifest.json", (1, 1))
+            os.utime(tmp_path / cache._entry_key("MNISTClassifier", "2", "run2") / "manifest.json", (2, 2))
+            cache.get_or_download("MNISTClassifier", "1", "run1")
+            cache.get_or_download("MNISTClassifier", "3", "run3")
+            versions = sorted(e["version"] for e in cache.list_entries())
+            assert versions == ["1", "3"]
+    def test_failed_download_leaves_no_entry(self, tmp_path):
+        cache = ArtifactCache(cache_dir=str(tmp_path), max_bytes=10_000)
+        with patch('app.services.artifact_cache.mlflow.artifacts.download_artifacts') as mock_download:
+            mock_download.side_effect = OSError("connection reset")
+            with pytest.raises(OSError):
+                cache.get_or_download("MNISTClassifier", "1", "run1")
+            assert cache.list_entries() == []
+    def test_update_size_counts_files_added_to_the_entry(self, tmp_path):
+        cache = ArtifactCache(cache_dir=str(tmp_path), max_bytes=250)
+        with patch('app.services.artifact_cache.mlflow.artifacts.download_artifacts') as mock_download:
+            mock_download.side_effect = fake_download(100)
+            old = cache.get_or_download("MNISTClassifier", "1", "run1")
+            os.utime(os.path.join(os.path.dirname(old), "manifest.json"), (1, 1))
+            new = cache.get_or_download("MNISTClassifier", "2", "run2")
+        weights_dir = os.path.join(os.path.dirname(new), "weights")
+        os.makedirs(weights_dir)
+        with open(os.path.join(weights_dir, "array_0.npy"), "wb") as f:
+            f.write(b"x" * 100)
+        cache.update_size(new)
+        assert [(e["version"], e["size_bytes"]) for e in cache.list_entries()] == [("2", 200)]
@@ -0,0 +1,100 @@
+import pytest
+from unittest.mock import MagicMock
+from app.services.drift_monitor import DriftMonitor, breach_key, retrain_lock_key
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+        self.ttls = {}
+    def set(self, key, value, nx=False, xx=False, ex=None, keepttl=False):
+        if (nx and key in self.data) or (xx and key not in self.data):
+            return None
+        self.data[key] = value
+        if ex is not None:
+            self.ttls[key] = ex
+        elif not keepttl:
+            self.ttls.pop(key, None)
+        return True
+    def get(self, key):
+        return self.data.get(key)
+    def delete(self, key):
+        self.ttls.pop(key, None)
+        return int(self.data.pop(key, None) is not None)
+    def expire(self, key, seconds):
+        self.ttls[key] = seconds
+    def ttl(self, key):
+        return self.ttls.get(key, -1) if key in self.data else -2
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.calls = []
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.calls.append((getattr(self.client, name), args, kwargs))
+        return queue
+    def execute(self):
+        return [fn(*args, **kwargs) for fn, args, kwargs in self.calls]
+def make_monitor(psi):
+    drift_service = MagicMock()
+    drift_service.get_drift_status.return_value = {"status": "alert" if psi else "insufficient_data", "psi": psi}
+    monitor = DriftMonitor(redis_client=FakeRedis(), drift_service=drift_service)
+    monitor.settings = monitor.settings.model_copy(update={
+        "drift_psi_threshold": 0.25,
+        "drift_sustained_seconds": 600,
+        "drift_check_interval_seconds": 60,
+        "drift_retrain_cooldown_seconds": 3600,
+    })
+    return monitor
+class TestDriftMonitor:
+    def test_below_threshold_clears_breach(self):
+        monitor = make_monitor(0.05)
+        monitor.redis.set(breach_key("m"), "100")
+        dispatch = MagicMock()
+        result = monitor.evaluate("m", dispatch, now=1000.0)
+        assert result["action"] == "none"
+        assert monitor.redis.get(breach_key("m")) is None
+        dispatch.assert_not_called()
+    def test_insufficient_data_does_not_dispatch(self):
+        dispatch = MagicMock()
+        assert make_monitor(None).evaluate("m", dispatch, now=1000.0)["action"] == "none"
+        dispatch.assert_not_called()
+    def test_breach_must_be_sustained(self):
+        monitor = make_monitor(0.4)
+        dispatch = MagicMock(return_value="job1")
+        assert monitor.evaluate("m", dispatch, now=1000.0)["action"] == "pending"
+        assert monitor.evaluate("m", dispatch, now=1300.0)["action"] == "pending"
+        assert monitor.redis.ttl(breach_key("m")) == 720
+        result = monitor.evaluate("m", dispatch, now=1600.0)
+        assert result["action"] == "retrain"
+        assert result["job_id"] == "job1"
+        assert result["breach_seconds"] == 600.0
+        dispatch.assert_called_once()
+        assert monitor.redis.get(retrain_lock_key("m")) == "job1"
+        assert monitor.redis.ttl(retrain_lock_key("m")) == 3600
+        assert monitor.redis.get(breach_key("m")) is None
+    def test_cooldown_deduplicates_dispatch(self):
+        monitor = make_monitor(0.4)
+        dispatch = MagicMock(return_value="job1")
+        monitor.redis.set(retrain_lock_key("m"), "job0", ex=1200)
+        monitor.evaluate("m", dispatch, now=0.0)
+        result = monitor.evaluate("m", dispatch, now=700.0)
+        assert result["action"] == "cooldown"
+        assert result["cooldown_remaining"] == 1200
+        dispatch.assert_not_called()
+    def test_failed_dispatch_releases_lock(self):
+        monitor = make_monitor(0.4)
+        dispatch = MagicMock(side_effect=RuntimeError("broker down"))
+        monitor.evaluate("m", dispatch, now=0.0)
+        with pytest.raises(RuntimeError):
+            monitor.evaluate("m", dispatch, now=700.0)
+        assert monitor.redis.get(retrain_lock_key("m")) is None
+        assert monitor.redis.get(breach_key("m")) == "0.0"
+    def test_state_reports_last_retrain(self):
+        monitor = make_monitor(0.4)
+        monitor.evaluate("m", MagicMock(return_value="job1"), now=0.0)
+        monitor.evaluate("m", MagicMock(return_value="job1"), now=600.0)
+        state = monitor.get_state("m")
+        assert state["last_retrain"]["job_id"] == "job1"
+        assert state["cooldown_remaining"] == 3600
+        assert state["breach_since"] is None
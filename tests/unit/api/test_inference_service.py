@@ -0,0 +1,104 @@
+import pytest
+from unittest.mock import patch, MagicMock
+from app.config import Settings
+from app.services.inference_service import InferenceService
+class FakeModel:
+    def __init__(self):
+        self.inputs = []
+    def predict(self, X):
+        self.inputs.append(X)
+        return [7] * len(X)
+@pytest.fixture
+def inference_service():
+    settings = Settings(model_cache_enabled=False, mlflow_tracking_uri="http://mlflow_server:5000")
+    with patch('app.services.inference_service.get_settings', return_value=settings):
+        service = InferenceService()
+    return service
+@pytest.fixture
+def mock_registry():
+    with patch('app.services.inference_service.get_mlflow_service') as mock_get_service:
+        version = MagicMock(version="3", current_stage="Production", run_id="abc123")
+        mock_get_service.return_value.client.get_latest_versions.return_value = [version]
+        yield mock_get_service.return_value
+class TestInferenceServiceCache:
+    def test_model_loaded_once(self, inference_service, mock_registry):
+        with patch('app.services.inference_service.mlflow.pyfunc.load_model') as mock_load:
+            mock_load.return_value = FakeModel()
+            inference_service.load_model("MNISTClassifier", "Production")
+            inference_service.load_model("MNISTClassifier", "Production")
+            assert mock_load.call_count == 1
+            cached = inference_service.list_cached_models()
+            assert cached[0]["key"] == "MNISTClassifier@3"
+            assert cached[0]["stages"] == ["Production"]
+            assert cached[0]["hits"] == 1
+    def test_alias_resolved_once_within_ttl(self, inference_service, mock_registry):
+        with patch('app.services.inference_service.mlflow.pyfunc.load_model') as mock_load:
+            mock_load.return_value = FakeModel()
+            inference_service.predict([0.0] * 784, "MNISTClassifier", "Production")
+            inference_service.predict([0.0] * 784, "MNISTClassifier", "Production")
+            assert mock_registry.client.get_latest_versions.call_count == 1
+    def test_reported_version_is_served_version(self, inference_service, mock_registry):
+        with patch('app.services.inference_service.mlflow.pyfunc.load_model') as mock_load:
+            mock_load.return_value = FakeModel()
+            first = inference_service.predict([0.0] * 784, "MNISTClassifier", "Production")
+            promoted = MagicMock(version="4", current_stage="Production", run_id="def456")
+            mock_registry.client.get_latest_versions.return_value = [promoted]
+            inference_service.resolve_version("MNISTClassifier", "Production", force_refresh=True)
+            second = inference_service.predict([0.0] * 784, "MNISTClassifier", "Production")
+            assert first["model_version"] == "3"
+            assert second["model_version"] == "4"
+            assert mock_load.call_args_list[-1].args[0] == "models:/MNISTClassifier/4"
+    def test_pinned_version_prediction(self, inference_service, mock_registry):
+        pinned = MagicMock(version="2", current_stage="Archived", run_id="old123")
+        mock_registry.client.get_model_version.return_value = pinned
+        with patch('app.services.inference_service.mlflow.pyfunc.load_model') as mock_load:
+            mock_load.return_value = FakeModel()
+            result = inference_service.predict([0.0] * 784, "MNISTClassifier", version="2")
+            assert result["model_version"] == "2"
+            assert result["model_stage"] == "Archived"
+            assert mock_load.call_args.args[0] == "models:/MNISTClassifier/2"
+    def test_pinned_version_stage_refreshed_after_ttl(self, inference_service, mock_registry):
+        mock_registry.client.get_model_version.return_value = MagicMock(version="2", current_stage="Staging", run_id="old123")
+        with patch('app.services.inference_service.time.monotonic', return_value=1000.0):
+            assert inference_service.get_version_info("MNISTClassifier", "2")["stage"] == "Staging"
+        mock_registry.client.get_model_version.return_value = MagicMock(version="2", current_stage="Archived", run_id="old123")
+        with patch('app.services.inference_service.time.monotonic', return_value=1001.0):
+            assert inference_service.get_version_info("MNISTClassifier", "2")["stage"] == "Staging"
+        ttl = inference_service.settings.model_alias_ttl_seconds
+        with patch('app.services.inference_service.time.monotonic', return_value=1000.0 + ttl):
+            assert inference_service.get_version_info("MNISTClassifier", "2")["stage"] == "Archived"
+        mock_registry.client.get_model_version.return_value = MagicMock(version="2", current_stage="Production", run_id="old123")
+        inference_service.clear_cache()
+        assert inference_service.get_version_info("MNISTClassifier", "2")["stage"] == "Production"
+        assert mock_registry.client.get_model_version.call_count == 3
+    def test_missing_model_raises_value_error(self, inference_service, mock_registry):
+        mock_registry.client.get_latest_versions.return_value = []
+        with patch('app.services.inference_service.mlflow.pyfunc.load_model'):
+            with pytest.raises(ValueError):
+                inference_service.load_model("MNISTClassifier", "Production")
+            assert inference_service.list_cached_models() == []
+    def test_inputs_converted_to_float32(self, inference_service, mock_registry):
+        model = FakeModel()
+        with patch('app.services.inference_service.mlflow.pyfunc.load_model', return_value=model):
+            inference_service.predict([255] * 784, "MNISTClassifier", "Production")
+            inference_service.predict_batch([[0.5] * 784] * 2, "MNISTClassifier", "Production")
+        assert [X.dtype.name for X in model.inputs] == ["float32", "float32"]
+        assert model.inputs[0].max() == 1.0
+    def test_unwritable_artifact_cache_falls_back_to_direct_load(self, inference_service, mock_registry):
+        inference_service._artifact_cache = MagicMock()
+        inference_service._artifact_cache.get_or_download.side_effect = PermissionError("read-only")
+        with patch('app.services.inference_service.mlflow.pyfunc.load_model', return_value=FakeModel()) as mock_load:
+            result = inference_service.predict([0.0] * 784, "MNISTClassifier", "Production")
+        assert result["prediction"] == 7
+        mock_load.assert_called_once_with("models:/MNISTClassifier/3")
+    def test_mismatched_shared_weights_keep_private_copy(self, inference_service, mock_registry):
+        inference_service.settings.model_shared_weights = True
+        inference_service._artifact_cache = MagicMock()
+        inference_service._artifact_cache.get_or_download.return_value = "/cache/entry/model"
+        model = FakeModel()
+        model._model_impl = object()
+        with patch('app.services.inference_service.mlflow.pyfunc.load_model', return_value=model), \
+             patch('app.services.inference_service.share_model_weights', side_effect=ValueError("shape mismatch")):
+            result = inference_service.predict([0.0] * 784, "MNISTClassifier", "Production")
+        assert result["prediction"] == 7
+        inference_service._artifact_cache.update_size.assert_called_once_with("/cache/entry/model")
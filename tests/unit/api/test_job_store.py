@@ -0,0 +1,298 @@
+import asyncio
+import pytest
+from celery import chord
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import patch
+from app.schemas.train import TrainingStatus
+from app.services.job_store import JobStore, TrainingJob, index_key
+from app.services.training_service import TrainingService
+from app import signals
+from app.worker import celery_app
+class FakeRedis:
+    def __init__(self):
+        self.hashes = {}
+        self.zsets = {}
+        self.strings = {}
+    def set(self, key, value, ex=None):
+        self.strings[key] = value
+    def hset(self, key, mapping):
+        self.hashes.setdefault(key, {}).update(mapping)
+    def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+    def hmget(self, key, *fields):
+        return [self.hashes.get(key, {}).get(f) for f in fields]
+    def exists(self, key):
+        return int(key in self.hashes or key in self.strings)
+    def zadd(self, key, mapping):
+        self.zsets.setdefault(key, {}).update(mapping)
+    def zrem(self, key, member):
+        self.zsets.get(key, {}).pop(member, None)
+    def zcard(self, key):
+        return len(self.zsets.get(key, {}))
+    def zrevrange(self, key, start, end):
+        members = sorted(self.zsets.get(key, {}).items(), key=lambda kv: kv[1], reverse=True)
+        return [m for m, _ in members][start:end + 1]
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+    def transaction(self, func, *watches, value_from_callable=False):
+        pipe = FakePipeline(self, immediate=True)
+        value = func(pipe)
+        results = pipe.execute()
+        return value if value_from_callable else results
+class FakePipeline:
+    def __init__(self, redis, immediate=False):
+        self.redis = redis
+        self.immediate = immediate
+        self.commands = []
+    def multi(self):
+        self.immediate = False
+    def execute(self):
+        return [fn(*args, **kwargs) for fn, args, kwargs in self.commands]
+    def __getattr__(self, name):
+        fn = getattr(self.redis, name)
+        if self.immediate:
+            return fn
+        return lambda *args, **kwargs: self.commands.append((fn, args, kwargs))
+def make_job(job_id, experiment="exp", minutes=0, status=TrainingStatus.PENDING):
+    return TrainingJob(
+        job_id=job_id,
+        experiment_name=experiment,
+        status=status,
+        params={"epochs": 3},
+        started_at=datetime(2026, 1, 1) + timedelta(minutes=minutes),
+    )
+class TestJobStore:
+    def test_round_trip(self):
+        store = JobStore(redis_client=FakeRedis())
+        store.create(make_job("j1"))
+        job = store.get("j1")
+        assert job.status == TrainingStatus.PENDING
+        assert job.params == {"epochs": 3}
+        assert job.run_id is None
+        assert store.get("missing") is None
+    def test_status_update_moves_indexes(self):
+        redis = FakeRedis()
+        store = JobStore(redis_client=redis)
+        store.create(make_job("j1"))
+        assert store.update("j1", status=TrainingStatus.COMPLETED, run_id="r1")
+        assert store.get("j1").run_id == "r1"
+        assert store.count(status="pending") == 0
+        assert store.count(status=TrainingStatus.COMPLETED) == 1
+        assert store.count(status="completed", experiment_name="exp") == 1
+        assert redis.zcard(index_key()) == 1
+        assert not store.update("missing", status=TrainingStatus.RUNNING)
+        assert not store.exists("missing")
+    def test_list_is_newest_first_filtered_and_paginated(self):
+        store = JobStore(redis_client=FakeRedis())
+        for i in range(5):
+            store.create(make_job(f"a{i}", minutes=i))
+        store.create(make_job("b0", experiment="other", minutes=10))
+        store.update("a1", status=TrainingStatus.FAILED)
+        assert [j.job_id for j in store.list(limit=3)] == ["b0", "a4", "a3"]
+        assert [j.job_id for j in store.list(offset=3, limit=3)] == ["a2", "a1", "a0"]
+        assert [j.job_id for j in store.list(experiment_name="exp", status="pending", limit=2)] == ["a4", "a3"]
+        assert [j.job_id for j in store.list(status="failed")] == ["a1"]
+        assert store.count(experiment_name="exp") == 5
+class TestSignals:
+    def test_lifecycle_updates_job_store(self):
+        store = JobStore(redis_client=FakeRedis())
+        store.create(make_job("j1"))
+        task = SimpleNamespace(name="train_model_task", request=SimpleNamespace(id="j1"))
+        with patch('app.signals.get_job_store', return_value=store):
+            signals.on_task_prerun(sender=task, task_id="j1")
+            assert store.get("j1").status == TrainingStatus.RUNNING
+            signals.on_task_success(sender=task, result={"status": "success", "run_id": "r1"})
+        job = store.get("j1")
+        assert job.status == TrainingStatus.COMPLETED
+        assert job.run_id == "r1"
+        assert job.completed_at is not None
+    def test_ignores_other_tasks(self):
+        store = JobStore(redis_client=FakeRedis())
+        store.create(make_job("j1"))
+        with patch('app.signals.get_job_store', return_value=store):
+            signals.on_task_prerun(sender=SimpleNamespace(name="finalize_sweep_task"), task_id="j1")
+        assert store.get("j1").status == TrainingStatus.PENDING
+class TestTrainingServiceJobs:
+    def test_job_recorded_before_dispatch(self):
+        store = JobStore(redis_client=FakeRedis())
+        service = TrainingService(job_store=store)
+        def apply_async(kwargs, task_id, queue, priority):
+            assert store.get(task_id).status == TrainingStatus.PENDING
+            assert (queue, priority) == ("training.interactive", 0)
+        with patch('app.services.training_service.train_model_task') as task:
+            task.apply_async.side_effect = apply_async
+            job = asyncio.run(service.start_training(
+                learning_rate=0.01, epochs=2, batch_size=32, hidden_size=16, dropout=0.1,
+                experiment_name="exp", priority="high",
+            ))
+        task.apply_async.assert_called_once()
+        assert store.get(job.job_id).params["priority"] == "high"
+        assert service.has_job(job.job_id)
+        assert [j.job_id for j in service.list_jobs(experiment_name="exp")] == [job.job_id]
+    def test_sweep_trials_use_bulk_queue(self):
+        service = TrainingService(job_store=JobStore(redis_client=FakeRedis()))
+        with patch('app.services.training_service.chord') as chord:
+            asyncio.run(service.start_sweep(num_runs=3, search_strategy="random", experiment_name="exp"))
+        header = chord.call_args.args[0]
+        assert len(header) == 3
+        assert all(sig.options["queue"] == "training.bulk" and sig.options["priority"] == 6 for sig in header)
+    def test_sweep_and_trials_visible_from_any_replica(self):
+        redis = FakeRedis()
+        dispatcher = TrainingService(job_store=JobStore(redis_client=redis))
+        with patch('app.services.training_service.chord') as chord:
+            def dispatch(header):
+                assert all(dispatcher.job_store.exists(sig.options["task_id"]) for sig in header)
+                return lambda callback: None
+            chord.side_effect = dispatch
+            sweep = asyncio.run(dispatcher.start_sweep(num_runs=2, search_strategy="random", experiment_name="exp"))
+        replica = TrainingService(job_store=JobStore(redis_client=redis))
+        trial_id = sweep.trials[0]["job_id"]
+        assert replica.has_job(trial_id)
+        assert replica.job_store.get(trial_id).params["sweep_id"] == sweep.sweep_id
+        summary = {"status": "success", "best_run": {"run_id": "r1"}, "model_name": None, "model_version": None}
+        def mget(keys):
+            return [
+                celery_app.backend.encode({"status": "SUCCESS", "result": summary}) if key.endswith(sweep.sweep_id.encode())
+                else celery_app.backend.encode({"status": "SUCCESS", "result": {"status": "success", "run_id": "r1"}})
+                for key in keys
+            ]
+        with patch.object(celery_app.backend, 'mget', side_effect=mget):
+            status = replica.get_sweep(sweep.sweep_id)
+        assert status["status"] == TrainingStatus.COMPLETED
+        assert status["completed"] == 2
+        stored = dispatcher.job_store.get_sweep(sweep.sweep_id)
+        assert stored.status == TrainingStatus.COMPLETED
+        assert stored.summary["best_run"] == {"run_id": "r1"}
+        assert stored.completed_at is not None
+        assert replica.get_sweep("missing") is None
+    def test_sweep_trials_read_from_store_after_results_expire(self):
+        store = JobStore(redis_client=FakeRedis())
+        service = TrainingService(job_store=store)
+        with patch('app.services.training_service.chord'):
+            sweep = asyncio.run(service.start_sweep(num_runs=3, search_strategy="random", experiment_name="exp"))
+        finished, failed, queued = [trial["job_id"] for trial in sweep.trials]
+        store.update(finished, status=TrainingStatus.COMPLETED, run_id="r1")
+        store.update(failed, status=TrainingStatus.FAILED, error="boom")
+        with patch.object(celery_app.backend, 'mget', return_value=[None, None]) as mget:
+            status = service.get_sweep(sweep.sweep_id)
+        assert [key.decode() for key in mget.call_args.args[0]] == [
+            celery_app.backend.get_key_for_task(queued).decode(),
+            celery_app.backend.get_key_for_task(sweep.sweep_id).decode(),
+        ]
+        assert [t["status"] for t in status["trials"]] == [TrainingStatus.COMPLETED, TrainingStatus.FAILED, TrainingStatus.PENDING]
+        assert status["trials"][0]["run_id"] == "r1"
+        assert status["trials"][1]["error"] == "boom"
+        assert (status["completed"], status["failed"]) == (1, 1)
+        assert status["status"] == TrainingStatus.RUNNING
+    def test_sweep_dispatch_failure_marks_trials_failed(self):
+        store = JobStore(redis_client=FakeRedis())
+        service = TrainingService(job_store=store)
+        with patch('app.services.training_service.chord', side_effect=ConnectionError("broker down")):
+            with pytest.raises(ConnectionError):
+                asyncio.run(service.start_sweep(num_runs=2, search_strategy="random", experiment_name="exp"))
+        assert store.count(status="failed") == 2
+        assert store.count() == 2
+    def test_get_job_skips_lookups_for_finished_jobs(self):
+        store = JobStore(redis_client=FakeRedis())
+        store.create(make_job("j1", status=TrainingStatus.COMPLETED))
+        service = TrainingService(job_store=store)
+        with patch('app.services.training_service.get_progress_service') as progress, \
+             patch.object(celery_app.backend, 'mget') as mget:
+            assert service.get_job("j1").status == TrainingStatus.COMPLETED
+        progress.assert_not_called()
+        mget.assert_not_called()
+class TestBatchedTaskLookup:
+    def encode(self, task_id, status, result=None):
+        return celery_app.backend.encode({"task_id": task_id, "status": status, "result": result})
+    def test_list_jobs_fetches_active_states_in_one_round_trip(self):
+        store = JobStore(redis_client=FakeRedis())
+        for i in range(50):
+            store.create(make_job(f"j{i}", minutes=i))
+        for i in range(40):
+            store.update(f"j{i}", status=TrainingStatus.COMPLETED)
+        service = TrainingService(job_store=store)
+        def mget(keys):
+            return [
+                self.encode("j49", "SUCCESS", {"status": "success", "run_id": "r49"}) if key.endswith(b"j49")
+                else self.encode("j48", "FAILURE", {"exc_type": "ValueError", "exc_message": ["boom"], "exc_module": "builtins"}) if key.endswith(b"j48")
+                else None
+                for key in keys
+            ]
+        with patch.object(celery_app.backend, 'mget', side_effect=mget) as backend_mget:
+            jobs = {job.job_id: job for job in service.list_jobs(limit=100)}
+        backend_mget.assert_called_once()
+        assert len(backend_mget.call_args.args[0]) == 10
+        assert jobs["j49"].status == TrainingStatus.COMPLETED
+        assert jobs["j49"].run_id == "r49"
+        assert jobs["j48"].status == TrainingStatus.FAILED
+        assert "boom" in jobs["j48"].error
+        assert jobs["j47"].status == TrainingStatus.PENDING
+        assert store.get("j49").status == TrainingStatus.COMPLETED
+        assert store.count(status="completed") == 41
+    def test_backend_errors_leave_jobs_untouched(self):
+        store = JobStore(redis_client=FakeRedis())
+        store.create(make_job("j1"))
+        service = TrainingService(job_store=store)
+        with patch.object(celery_app.backend, 'mget', side_effect=ConnectionError("down")):
+            assert service.list_jobs()[0].status == TrainingStatus.PENDING
+class TestCancelJob:
+    def make_service(self, status):
+        store = JobStore(redis_client=FakeRedis())
+        store.request_cancel = lambda job_id: store.redis.hset(f"cancel:{job_id}", {"flag": "1"})
+        store.create(make_job("j1", status=status))
+        return store, TrainingService(job_store=store)
+    def test_pending_job_is_revoked_and_cancelled(self):
+        store, service = self.make_service(TrainingStatus.PENDING)
+        with patch.object(service, '_fetch_task_meta', return_value={}), \
+             patch('app.services.training_service.get_progress_service') as progress, \
+             patch.object(celery_app.control, 'revoke') as revoke:
+            progress.return_value.get_last.return_value = None
+            job = service.cancel_job("j1")
+        revoke.assert_called_once_with("j1")
+        assert job.status == TrainingStatus.CANCELLED
+        assert store.get("j1").status == TrainingStatus.CANCELLED
+        assert store.count(status="cancelled") == 1
+        assert "cancel:j1" in store.redis.hashes
+        progress.return_value.publish.assert_called_once()
+    def test_running_job_is_flagged_for_cooperative_stop(self):
+        store, service = self.make_service(TrainingStatus.RUNNING)
+        with patch('app.services.training_service.get_progress_service') as progress, \
+             patch.object(celery_app.control, 'revoke'):
+            progress.return_value.get_last.return_value = {"status": "running", "epoch": 3}
+            job = service.cancel_job("j1")
+        assert job.status == TrainingStatus.RUNNING
+        assert "cancel:j1" in store.redis.hashes
+        progress.return_value.publish.assert_not_called()
+    def test_finished_job_is_left_alone(self):
+        store, service = self.make_service(TrainingStatus.COMPLETED)
+        with patch.object(celery_app.control, 'revoke') as revoke:
+            assert service.cancel_job("j1").status == TrainingStatus.COMPLETED
+        revoke.assert_not_called()
+        assert "cancel:j1" not in store.redis.hashes
+    def test_pending_sweep_trial_is_skipped_without_breaking_the_chord(self):
+        store = JobStore(redis_client=FakeRedis())
+        service = TrainingService(job_store=store)
+        with patch('app.services.training_service.chord') as dispatch:
+            sweep = asyncio.run(service.start_sweep(num_runs=3, search_strategy="random", experiment_name="exp"))
+        header = dispatch.call_args.args[0]
+        callback = dispatch.return_value.call_args.args[0]
+        cancelled_id = sweep.trials[1]["job_id"]
+        with patch('app.services.training_service.get_progress_service') as progress, \
+             patch.object(service, '_fetch_task_meta', return_value={}), \
+             patch.object(celery_app.control, 'revoke') as revoke:
+            progress.return_value.get_last.return_value = None
+            assert service.cancel_job(cancelled_id).status == TrainingStatus.CANCELLED
+        revoke.assert_not_called()
+        runs = iter(["run_a", "run_c"])
+        with patch('app.tasks.get_job_store', return_value=store), \
+             patch('app.signals.get_job_store', return_value=store), \
+             patch('app.tasks.get_progress_service'), \
+             patch('app.tasks.train_model', side_effect=lambda **kwargs: next(runs)) as train, \
+             patch('app.tasks.find_best_run', return_value={"run_id": "run_c"}):
+            summary = chord(header, body=callback).apply().get()
+        assert train.call_count == 2
+        assert summary["run_ids"] == ["run_a", "run_c"]
+        assert summary["failed"] == 1
+        assert summary["best_run"] == {"run_id": "run_c"}
+        assert store.get(cancelled_id).status == TrainingStatus.CANCELLED
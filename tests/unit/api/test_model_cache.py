@@ -0,0 +1,76 @@
+import threading
+import time
+import numpy as np
+from app.services.model_cache import ModelCache, estimate_model_bytes
+class FakeModel:
+    def __init__(self, n_bytes):
+        self.weights = np.zeros(n_bytes, dtype=np.uint8)
+class TestModelCache:
+    def test_estimate_counts_arrays(self):
+        private_bytes, shared_bytes = estimate_model_bytes(FakeModel(10_000))
+        assert private_bytes >= 10_000
+        assert shared_bytes == 0
+    def test_hits_and_lru_order(self):
+        cache = ModelCache(max_bytes=10_000_000)
+        cache.put("a", FakeModel(100), model_name="A", stage="Production")
+        cache.put("b", FakeModel(100), model_name="B", stage="Production")
+        cache.get("a")
+        cache.get("a")
+        entries = cache.entries()
+        assert [e["key"] for e in entries] == ["a", "b"]
+        assert entries[0]["hits"] == 2
+    def test_evicts_least_recently_used_over_budget(self):
+        cache = ModelCache(max_bytes=25_000)
+        cache.put("a", FakeModel(10_000))
+        cache.put("b", FakeModel(10_000))
+        cache.get("a")
+        cache.put("c", FakeModel(10_000))
+        assert "a" in cache
+        assert "b" not in cache
+        assert "c" in cache
+    def test_concurrent_misses_load_once(self):
+        cache = ModelCache(max_bytes=10_000_000)
+        calls = []
+        results = []
+        def loader():
+            calls.append(1)
+            time.sleep(0.05)
+            return FakeModel(100)
+        threads = [
+            threading.Thread(target=lambda: results.append(cache.get_or_load("a", loader)))
+            for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(calls) == 1
+        assert len({id(r) for r in results}) == 1
+    def test_failed_load_propagates_to_waiters(self):
+        cache = ModelCache(max_bytes=10_000_000)
+        calls = []
+        errors = []
+        def loader():
+            calls.append(1)
+            time.sleep(0.05)
+            raise ValueError("No Production model found")
+        def worker():
+            try:
+                cache.get_or_load("a", loader)
+            except ValueError as e:
+                errors.append(e)
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(calls) == 1
+        assert len(errors) == 4
+        assert "a" not in cache
+    def test_clear_during_load_does_not_cache(self):
+        cache = ModelCache(max_bytes=10_000_000)
+        def loader():
+            cache.clear()
+            return FakeModel(100)
+        assert cache.get_or_load("a", loader) is not None
+        assert "a" not in cache
@@ -61,6 +61,48 @@ class TestStagingPredictEndpoint:
             response = client.post(
                 "/predict/staging", json=sample_predict_request, headers=auth_headers)
             assert response.status_code == 200
+class TestVersionPredictEndpoint:
+    def test_predict_pinned_version(self, client, sample_predict_request, mock_inference_service, auth_headers):
+        with patch('app.routes.predict.get_inference_service') as mock_get_service:
+            mock_get_service.return_value = mock_inference_service
+            response = client.post(
+                "/predict/versions/1", json=sample_predict_request, headers=auth_headers)
+            assert response.status_code == 200
+            assert mock_inference_service.predict.call_args.kwargs["version"] == "1"
+    def test_predict_unknown_version(self, client, sample_predict_request, auth_headers):
+        with patch('app.routes.predict.get_inference_service') as mock_get_service:
+            mock_service = MagicMock()
+            mock_service.predict.side_effect = ValueError("Version 99 of 'MNISTClassifier' not found")
+            mock_get_service.return_value = mock_service
+            response = client.post(
+                "/predict/versions/99", json=sample_predict_request, headers=auth_headers)
+            assert response.status_code == 404
+class TestListCacheEndpoint:
+    def test_list_cached_models(self, client, auth_headers):
+        with patch('app.routes.predict.get_inference_service') as mock_get_service:
+            mock_service = MagicMock()
+            mock_service.list_cached_models.return_value = [
+                {
+                    "key": "MNISTClassifier@3",
+                    "model_name": "MNISTClassifier",
+                    "version": "3",
+                    "stages": ["Production"],
+                    "run_id": "abc123",
+                    "size_bytes": 1024,
+                    "shared_bytes": 0,
+                    "hits": 5,
+                    "loaded_at": "2026-01-01T00:00:00",
+                    "last_accessed_at": "2026-01-01T00:05:00",
+                }
+            ]
+            mock_service.get_cache_stats.return_value = {"total_bytes": 1024, "max_bytes": 4096}
+            mock_get_service.return_value = mock_service
+            response = client.get("/predict/cache", headers=auth_headers)
+            assert response.status_code == 200
+            data = response.json()
+            assert data["total_count"] == 1
+            assert data["models"][0]["hits"] == 5
+            assert data["max_bytes"] == 4096
 class TestClearCacheEndpoint:
     def test_clear_cache_success(self, client, auth_headers):
         with patch('app.routes.predict.get_inference_service') as mock_get_service:
@@ -0,0 +1,63 @@
+import asyncio
+import json
+from unittest.mock import MagicMock
+from app.services.progress_service import ProgressService, progress_channel, progress_snapshot_key
+class FakePubSub:
+    def __init__(self, messages):
+        self.messages = list(messages)
+        self.subscribed = []
+        self.closed = False
+    async def subscribe(self, channel):
+        self.subscribed.append(channel)
+    async def unsubscribe(self, channel):
+        self.subscribed.remove(channel)
+    async def aclose(self):
+        self.closed = True
+    async def get_message(self, ignore_subscribe_messages=True, timeout=None):
+        if not self.messages:
+            return None
+        data = self.messages.pop(0)
+        return None if data is None else {"type": "message", "data": json.dumps(data)}
+class FakeAsyncRedis:
+    def __init__(self, snapshot=None, messages=()):
+        self.snapshot = snapshot
+        self.pubsub_instance = FakePubSub(messages)
+    def pubsub(self):
+        return self.pubsub_instance
+    async def get(self, key):
+        return json.dumps(self.snapshot) if self.snapshot else None
+def collect(service, job_id):
+    async def run():
+        return [event async for event in service.stream(job_id, keepalive=0.01)]
+    return asyncio.run(run())
+class TestProgressService:
+    def test_publish_stores_snapshot_and_publishes(self):
+        client = MagicMock()
+        ProgressService(redis_client=client).publish("job1", "running", epoch=2, loss=0.5)
+        pipe = client.pipeline.return_value
+        key, payload = pipe.set.call_args.args
+        assert key == progress_snapshot_key("job1")
+        assert json.loads(payload) == {"job_id": "job1", "status": "running", "epoch": 2, "loss": 0.5}
+        pipe.publish.assert_called_once_with(progress_channel("job1"), payload)
+    def test_publish_never_raises(self):
+        client = MagicMock()
+        client.pipeline.return_value.execute.side_effect = ConnectionError("down")
+        ProgressService(redis_client=client).publish("job1", "running")
+    def test_stream_replays_snapshot_then_follows_until_terminal(self):
+        fake = FakeAsyncRedis(
+            snapshot={"status": "running", "epoch": 1},
+            messages=[None, {"status": "running", "epoch": 2}, {"status": "completed", "run_id": "r1"}],
+        )
+        events = collect(ProgressService(async_redis_client=fake), "job1")
+        assert events == [
+            {"status": "running", "epoch": 1},
+            None,
+            {"status": "running", "epoch": 2},
+            {"status": "completed", "run_id": "r1"},
+        ]
+        assert fake.pubsub_instance.closed
+        assert fake.pubsub_instance.subscribed == []
+    def test_stream_of_finished_job_returns_snapshot_only(self):
+        fake = FakeAsyncRedis(snapshot={"status": "failed", "error": "boom"})
+        events = collect(ProgressService(async_redis_client=fake), "job1")
+        assert events == [{"status": "failed", "error": "boom"}]
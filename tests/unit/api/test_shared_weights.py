@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+from unittest.mock import patch
+from sklearn.neural_network import MLPClassifier
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+from app.services.shared_weights import share_model_weights, attach_weights
+@pytest.fixture
+def fitted_pipeline():
+    rng = np.random.RandomState(0)
+    X = rng.rand(60, 784)
+    y = np.arange(60) % 10
+    pipeline = Pipeline([
+        ("scaler", StandardScaler()),
+        ("classifier", MLPClassifier(hidden_layer_sizes=(32,), max_iter=2, random_state=0)),
+    ])
+    pipeline.fit(X, y)
+    return pipeline, X
+class TestSharedWeights:
+    def test_weights_become_memory_mapped(self, tmp_path, fitted_pipeline):
+        pipeline, X = fitted_pipeline
+        expected = pipeline.predict_proba(X)
+        with patch('app.services.shared_weights.MIN_SHARED_BYTES', 1024):
+            attached = share_model_weights(pipeline, str(tmp_path / "weights"))
+        assert attached > 0
+        assert isinstance(pipeline.named_steps["classifier"].coefs_[0], np.memmap)
+        np.testing.assert_allclose(pipeline.predict_proba(X), expected)
+    def test_attach_rejects_mismatched_model(self, tmp_path, fitted_pipeline):
+        pipeline, X = fitted_pipeline
+        other = MLPClassifier(hidden_layer_sizes=(16,), max_iter=2, random_state=0).fit(X, np.arange(60) % 10)
+        with patch('app.services.shared_weights.MIN_SHARED_BYTES', 1024):
+            share_model_weights(pipeline, str(tmp_path / "weights"))
+            with pytest.raises(ValueError):
+                attach_weights(other, str(tmp_path / "weights"))
+        assert not any(isinstance(w, np.memmap) for w in other.coefs_ + other.intercepts_)
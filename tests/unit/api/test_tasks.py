@@ -0,0 +1,154 @@
+import pytest
+from unittest.mock import MagicMock, patch
+from app.schemas.train import TrainingStatus
+from app.tasks import finalize_sweep_task, train_model_task
+class TestFinalizeSweepTask:
+    def test_selects_best_among_successful_trials(self):
+        results = [
+            {"status": "success", "run_id": "run_a"},
+            {"status": "failed", "error": "boom"},
+            {"status": "success", "run_id": "run_b"},
+        ]
+        with patch('app.tasks.find_best_run', return_value={"run_id": "run_b"}) as find_best, \
+             patch('app.tasks.register_model_from_run') as register:
+            summary = finalize_sweep_task.run(results, sweep_id="s1", experiment_name="exp")
+        find_best.assert_called_once_with("exp", metric="accuracy", run_ids=["run_a", "run_b"])
+        register.assert_not_called()
+        assert summary["succeeded"] == 2
+        assert summary["failed"] == 1
+        assert summary["best_run"]["run_id"] == "run_b"
+    def test_registers_and_stages_best_run(self):
+        with patch('app.tasks.find_best_run', return_value={"run_id": "run_a"}), \
+             patch('app.tasks.register_model_from_run', return_value="3") as register, \
+             patch('app.tasks.transition_model_stage') as transition:
+            summary = finalize_sweep_task.run(
+                [{"status": "success", "run_id": "run_a"}],
+                sweep_id="s1",
+                experiment_name="exp",
+                register_best=True,
+                model_name="MNISTClassifier",
+                stage="Staging",
+            )
+        register.assert_called_once_with(run_id="run_a", model_name="MNISTClassifier")
+        transition.assert_called_once_with("MNISTClassifier", "3", "Staging")
+        assert summary["model_version"] == "3"
+    def test_all_trials_failed(self):
+        with patch('app.tasks.find_best_run') as find_best:
+            summary = finalize_sweep_task.run([{"status": "failed"}], sweep_id="s1", experiment_name="exp")
+        find_best.assert_not_called()
+        assert summary["status"] == "failed"
+PARAMS = {"learning_rate": 0.01, "epochs": 5, "batch_size": 32, "hidden_size": 16, "dropout": 0.1, "random_seed": 1}
+@pytest.fixture
+def task_env():
+    job_store = MagicMock()
+    job_store.is_cancel_requested.return_value = False
+    with patch('app.tasks.get_job_store', return_value=job_store), \
+         patch('app.signals.get_job_store', return_value=job_store), \
+         patch('app.tasks.get_progress_service') as progress, \
+         patch.object(train_model_task.backend, 'mark_as_revoked') as mark_as_revoked:
+        yield job_store, progress.return_value, mark_as_revoked
+def run_task(**kwargs):
+    return train_model_task.apply(
+        kwargs={"metrics": {}, "params": PARAMS, "experiment_name": "exp", **kwargs},
+        task_id="job1",
+    )
+class TestTrainModelTask:
+    def test_success_publishes_completion(self, task_env):
+        _, progress, _ = task_env
+        with patch('app.tasks.train_model', return_value="run1"):
+            result = run_task()
+        assert result.state == "SUCCESS"
+        assert result.result["run_id"] == "run1"
+        progress.publish.assert_called_with("job1", "completed", run_id="run1")
+    def test_failures_are_raised(self, task_env):
+        _, progress, _ = task_env
+        with patch('app.tasks.train_model', side_effect=ValueError("bad config")):
+            result = run_task()
+        assert result.state == "FAILURE"
+        assert isinstance(result.result, ValueError)
+        progress.publish.assert_called_with("job1", "failed", error="bad config")
+    def test_sweep_trials_report_failures_as_results(self, task_env):
+        with patch('app.tasks.train_model', side_effect=ValueError("bad config")):
+            result = run_task(raise_on_failure=False)
+        assert result.state == "SUCCESS"
+        assert result.result == {"status": "failed", "error": "bad config"}
+    def test_cancelled_between_epochs(self, task_env):
+        job_store, progress, mark_as_revoked = task_env
+        job_store.is_cancel_requested.side_effect = [False, False, True]
+        epochs_run = []
+        def fake_train(progress_callback, **kwargs):
+            for epoch in range(1, 6):
+                epochs_run.append(epoch)
+                progress_callback({"epoch": epoch, "epochs": 5, "loss": 1.0 / epoch})
+            return "run1"
+        with patch('app.tasks.train_model', side_effect=fake_train):
+            result = run_task()
+        assert result.state == "IGNORED"
+        assert epochs_run == [1, 2]
+        mark_as_revoked.assert_called_once()
+        assert job_store.update.call_args.kwargs["status"] == TrainingStatus.CANCELLED
+        assert progress.publish.call_args.args[:2] == ("job1", "cancelled")
+    def test_cancelled_before_start(self, task_env):
+        job_store, _, _ = task_env
+        job_store.is_cancel_requested.return_value = True
+        with patch('app.tasks.train_model') as train:
+            result = run_task(raise_on_failure=False)
+        train.assert_not_called()
+        assert result.result["status"] == "cancelled"
+class TestDriftRetraining:
+    def test_dispatch_creates_job_and_chains_registration(self):
+        from app.tasks import dispatch_retraining
+        job_store = MagicMock()
+        with patch('app.tasks.get_job_store', return_value=job_store), \
+             patch('app.tasks.chain') as chain:
+            job_id = dispatch_retraining("MNISTClassifier", {"psi": 0.41})
+        job = job_store.create.call_args.args[0]
+        assert job.job_id == job_id
+        assert job.params["warm_start"] is False
+        train_sig, register_sig = chain.call_args.args
+        assert train_sig.options["task_id"] == job_id
+        assert train_sig.kwargs["tags"] == {"trigger": "drift", "drift_psi": "0.41"}
+        assert register_sig.kwargs == {"model_name": "MNISTClassifier", "stage": "Staging"}
+        chain.return_value.apply_async.assert_called_once()
+    @pytest.mark.parametrize("data_exists, expected", [(True, True), (False, False)])
+    def test_warm_start_falls_back_to_full_without_refresh_data(self, tmp_path, data_exists, expected):
+        from app.config import get_settings
+        from app.tasks import dispatch_retraining
+        refresh_path = tmp_path / "latest.npz"
+        if data_exists:
+            refresh_path.write_bytes(b"")
+        settings = get_settings().model_copy(update={"drift_retrain_mode": "warm_start"})
+        job_store = MagicMock()
+        with patch('app.tasks.get_settings', return_value=settings), \
+             patch('app.tasks.get_config', return_value=MagicMock(refresh_data_path=str(refresh_path), refresh_epochs=3)), \
+             patch('app.tasks.get_job_store', return_value=job_store), \
+             patch('app.tasks.chain'):
+            dispatch_retraining("MNISTClassifier", {"psi": 0.41})
+        params = job_store.create.call_args.args[0].params
+        assert params["warm_start"] is expected
+        assert params["epochs"] == (3 if expected else settings.default_epochs)
+        assert params["run_name"].startswith("drift_warm_start_" if expected else "drift_full_")
+    def test_dispatch_failure_marks_job_failed(self):
+        from app.tasks import dispatch_retraining
+        job_store = MagicMock()
+        with patch('app.tasks.get_job_store', return_value=job_store), \
+             patch('app.tasks.chain') as chain:
+            chain.return_value.apply_async.side_effect = RuntimeError("broker down")
+            with pytest.raises(RuntimeError):
+                dispatch_retraining("MNISTClassifier", {"psi": 0.41})
+        assert job_store.update.call_args.kwargs["status"] == TrainingStatus.FAILED
+    def test_registers_and_stages_retrained_run(self):
+        from app.tasks import register_retrained_model_task
+        with patch('app.tasks.register_model_from_run', return_value="7") as register, \
+             patch('app.tasks.transition_model_stage') as transition:
+            summary = register_retrained_model_task.run({"status": "success", "run_id": "run9"}, model_name="M", stage="Staging")
+        register.assert_called_once_with(run_id="run9", model_name="M")
+        transition.assert_called_once_with("M", "7", "Staging")
+        assert summary["model_version"] == "7"
+    def test_evaluate_task_uses_monitor(self):
+        from app.tasks import evaluate_drift_task
+        monitor = MagicMock()
+        monitor.evaluate.return_value = {"action": "pending", "psi": 0.3}
+        with patch('app.tasks.get_drift_monitor', return_value=monitor):
+            assert evaluate_drift_task.run("M")["action"] == "pending"
+        assert monitor.evaluate.call_args.args[0] == "M"
@@ -1,5 +1,6 @@
 import pytest
 from unittest.mock import patch, MagicMock, AsyncMock
+from app.schemas.train import TrainingStatus
 class TestTrainEndpoint:
     def test_train_valid_request(self, client, sample_train_request, auth_headers):
         with patch('app.routes.train.get_training_service') as mock_get_service:
@@ -29,6 +30,37 @@ class TestTrainEndpoint:
             mock_get_service.return_value = mock_service
             response = client.post("/train", json={}, headers=auth_headers)
             assert response.status_code == 202
+    def test_train_passes_priority(self, client, auth_headers):
+        with patch('app.routes.train.get_training_service') as mock_get_service:
+            mock_service = MagicMock()
+            class MockJob:
+                job_id = "job_000001"
+                run_id = None
+            mock_service.start_training = AsyncMock(return_value=MockJob())
+            mock_get_service.return_value = mock_service
+            response = client.post("/train", json={"priority": "low"}, headers=auth_headers)
+            assert response.status_code == 202
+            assert mock_service.start_training.call_args.kwargs["priority"] == "low"
+    def test_train_warm_start_rejects_model_hyperparameters(self, client, auth_headers):
+        response = client.post("/train", json={"warm_start": True, "hidden_size": 256}, headers=auth_headers)
+        assert response.status_code == 422
+        assert "hidden_size" in response.text
+    def test_train_warm_start_accepts_epochs(self, client, auth_headers):
+        with patch('app.routes.train.get_training_service') as mock_get_service:
+            mock_service = MagicMock()
+            class MockJob:
+                job_id = "job_000001"
+                run_id = None
+            mock_service.start_training = AsyncMock(return_value=MockJob())
+            mock_get_service.return_value = mock_service
+            response = client.post("/train", json={"warm_start": True, "epochs": 3}, headers=auth_headers)
+            assert response.status_code == 202
+            kwargs = mock_service.start_training.call_args.kwargs
+            assert kwargs["warm_start"] is True
+            assert kwargs["epochs"] == 3
+    def test_train_invalid_priority(self, client, auth_headers):
+        response = client.post("/train", json={"priority": "urgent"}, headers=auth_headers)
+        assert response.status_code == 422
     def test_train_invalid_learning_rate(self, client, auth_headers):
         response = client.post("/train", json={
             "learning_rate": 10.0,
@@ -82,10 +114,140 @@ class TestListJobsEndpoint:
                 experiment_name = "MNIST_Experiments"
                 status = "completed"
                 started_at = None
+                completed_at = None
             mock_service.list_jobs.return_value = [MockJob()]
+            mock_service.count_jobs.return_value = 1
             mock_get_service.return_value = mock_service
             response = client.get("/train/jobs", headers=auth_headers)
             assert response.status_code == 200
             data = response.json()
             assert "jobs" in data
             assert data["total_count"] == 1
+    def test_list_jobs_filters_and_paginates(self, client, auth_headers):
+        with patch('app.routes.train.get_training_service') as mock_get_service:
+            mock_service = MagicMock()
+            mock_service.list_jobs.return_value = []
+            mock_service.count_jobs.return_value = 120
+            mock_get_service.return_value = mock_service
+            response = client.get(
+                "/train/jobs?status=failed&experiment_name=exp&limit=20&offset=40", headers=auth_headers)
+            assert response.status_code == 200
+            assert response.json()["total_count"] == 120
+            mock_service.list_jobs.assert_called_once_with(
+                status="failed", experiment_name="exp", offset=40, limit=20)
+    def test_list_jobs_rejects_unknown_status(self, client, auth_headers):
+        response = client.get("/train/jobs?status=bogus", headers=auth_headers)
+        assert response.status_code == 422
+class TestSweepEndpoint:
+    def test_start_sweep(self, client, auth_headers):
+        with patch('app.routes.train.get_training_service') as mock_get_service:
+            mock_service = MagicMock()
+            class MockSweep:
+                sweep_id = "sweep_000001"
+                trials = [{}, {}, {}]
+            mock_service.start_sweep = AsyncMock(return_value=MockSweep())
+            mock_get_service.return_value = mock_service
+            response = client.post("/train/sweep", json={
+                "num_runs": 3,
+                "search_strategy": "grid",
+                "register_best": True,
+            }, headers=auth_headers)
+            assert response.status_code == 202
+            data = response.json()
+            assert data["sweep_id"] == "sweep_000001"
+            assert data["num_trials"] == 3
+            kwargs = mock_service.start_sweep.call_args.kwargs
+            assert kwargs["search_strategy"] == "grid"
+            assert kwargs["register_best"] is True
+            assert kwargs["stage"] == "Staging"
+    def test_start_sweep_invalid_stage(self, client, auth_headers):
+        response = client.post("/train/sweep", json={
+            "register_best": True,
+            "stage": "Prod",
+        }, headers=auth_headers)
+        assert response.status_code == 422
+    def test_start_sweep_invalid_strategy(self, client, auth_headers):
+        response = client.post("/train/sweep", json={
+            "search_strategy": "bayes",
+        }, headers=auth_headers)
+        assert response.status_code == 422
+    def test_get_sweep_status(self, client, auth_headers):
+        with patch('app.routes.train.get_training_service') as mock_get_service:
+            mock_service = MagicMock()
+            mock_service.get_sweep.return_value = {
+                "sweep_id": "sweep_000001",
+                "experiment_name": "MNIST_Experiments",
+                "status": "running",
+                "total": 2,
+                "completed": 1,
+                "failed": 0,
+                "running": 1,
+                "trials": [
+                    {"job_id": "a", "run_id": "run_a", "status": "completed"},
+                    {"job_id": "b", "status": "running"},
+                ],
+            }
+            mock_get_service.return_value = mock_service
+            response = client.get("/train/sweep/sweep_000001", headers=auth_headers)
+            assert response.status_code == 200
+            data = response.json()
+            assert data["completed"] == 1
+            assert len(data["trials"]) == 2
+    def test_get_sweep_not_found(self, client, auth_headers):
+        with patch('app.routes.train.get_training_service') as mock_get_service:
+            mock_service = MagicMock()
+            mock_service.get_sweep.return_value = None
+            mock_get_service.return_value = mock_service
+            response = client.get("/train/sweep/missing", headers=auth_headers)
+            assert response.status_code == 404
+class TestTrainStreamEndpoint:
+    def test_streams_progress_events(self, client, auth_headers):
+        async def stream(job_id):
+            yield {"job_id": job_id, "status": "running", "epoch": 1, "loss": 0.4}
+            yield None
+            yield {"job_id": job_id, "status": "completed", "run_id": "run_abc123"}
+        with patch('app.routes.train.get_training_service') as mock_get_service, \
+             patch('app.routes.train.get_progress_service') as mock_get_progress:
+            mock_get_service.return_value.has_job.return_value = True
+            mock_get_progress.return_value.stream = stream
+            response = client.get("/train/stream/job_000001", headers=auth_headers)
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert response.text.count("event: progress") == 2
+        assert ": keepalive" in response.text
+        assert '"run_id": "run_abc123"' in response.text
+    def test_stream_unknown_job(self, client, auth_headers):
+        with patch('app.routes.train.get_training_service') as mock_get_service, \
+             patch('app.routes.train.get_progress_service') as mock_get_progress:
+            mock_get_service.return_value.has_job.return_value = False
+            mock_get_progress.return_value.get_last.return_value = None
+            response = client.get("/train/stream/missing", headers=auth_headers)
+        assert response.status_code == 404
+class TestCancelEndpoint:
+    def make_job(self, job_status):
+        class MockJob:
+            job_id = "job_000001"
+            status = job_status
+        return MockJob()
+    def test_cancel_queued_job(self, client, auth_headers):
+        with patch('app.routes.train.get_training_service') as mock_get_service:
+            mock_get_service.return_value.cancel_job.return_value = self.make_job(TrainingStatus.CANCELLED)
+            response = client.delete("/train/job_000001", headers=auth_headers)
+        assert response.status_code == 202
+        assert response.json()["status"] == "cancelled"
+    def test_cancel_running_job(self, client, auth_headers):
+        with patch('app.routes.train.get_training_service') as mock_get_service:
+            mock_get_service.return_value.cancel_job.return_value = self.make_job(TrainingStatus.RUNNING)
+            response = client.delete("/train/job_000001", headers=auth_headers)
+        assert response.status_code == 202
+        assert "current epoch" in response.json()["message"]
+    def test_cancel_finished_job(self, client, auth_headers):
+        with patch('app.routes.train.get_training_service') as mock_get_service:
+            mock_get_service.return_value.cancel_job.return_value = self.make_job(TrainingStatus.COMPLETED)
+            response = client.delete("/train/job_000001", headers=auth_headers)
+        assert response.status_code == 409
+    def test_cancel_unknown_job(self, client, auth_headers):
+        with patch('app.routes.train.get_training_service') as mock_get_service:
+            mock_get_service.return_value.cancel_job.return_value = None
+            response = client.delete("/train/missing", headers=auth_headers)
+        assert response.status_code == 404
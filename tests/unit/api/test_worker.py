@@ -0,0 +1,85 @@
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+from prometheus_client import REGISTRY
+from app import signals
+from app.worker import celery_app, route_for_priority
+def sample(name, labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+class TestWorkerProfile:
+    def test_training_tasks_are_routed_and_fairly_scheduled(self):
+        conf = celery_app.conf
+        assert conf.task_routes["train_model_task"]["queue"] == "training.interactive"
+        assert {q.name for q in conf.task_queues} == {"celery", "training.interactive", "training.bulk"}
+        assert conf.task_acks_late is True
+        assert conf.task_reject_on_worker_lost is not True
+        assert conf.worker_prefetch_multiplier == 1
+        assert conf.worker_max_tasks_per_child > 0
+        assert conf.worker_max_memory_per_child > 0
+        limits = conf.task_annotations["train_model_task"]
+        assert limits["soft_time_limit"] < limits["time_limit"]
+        assert conf.broker_transport_options["visibility_timeout"] > limits["time_limit"]
+    def test_priority_routing(self):
+        assert route_for_priority("high") == {"queue": "training.interactive", "priority": 0}
+        assert route_for_priority("normal") == {"queue": "training.interactive", "priority": 3}
+        assert route_for_priority("low") == {"queue": "training.bulk", "priority": 6}
+        assert celery_app.conf.broker_transport_options["priority_steps"] == [0, 3, 6]
+    def test_resolve_blas_threads(self):
+        assert signals.resolve_blas_threads(3, 4) == 3
+        with patch("app.signals.os.cpu_count", return_value=8):
+            assert signals.resolve_blas_threads(0, 4) == 2
+            assert signals.resolve_blas_threads(0, 16) == 1
+            assert signals.resolve_blas_threads(0, None) == 1
+    def test_worker_process_limits_blas_threads(self):
+        with patch("threadpoolctl.threadpool_limits") as limits, \
+             patch("app.signals.resolve_blas_threads", return_value=2), \
+             patch("app.signals.preload_dataset") as preload:
+            signals.on_worker_process_init()
+        limits.assert_called_once_with(limits=2)
+        preload.assert_called_once()
+class TestDatasetPreload:
+    def test_worker_init_preloads_before_fork(self):
+        with patch("app.signals.start_metrics_server"), \
+             patch("ml_core.utils.data_utils.get_mnist_arrays", return_value=()) as get_arrays:
+            signals.on_worker_init()
+        get_arrays.assert_called_once()
+    def test_preload_failure_is_not_fatal(self):
+        with patch("ml_core.utils.data_utils.get_mnist_arrays", side_effect=OSError("offline")):
+            signals.preload_dataset()
+    def test_preload_can_be_disabled(self):
+        with patch("app.signals.get_settings") as settings, \
+             patch("ml_core.utils.data_utils.get_mnist_arrays") as get_arrays:
+            settings.return_value.worker_preload_dataset = False
+            signals.preload_dataset()
+        get_arrays.assert_not_called()
+class TestTaskTimingMetrics:
+    def test_publish_stamps_header(self):
+        headers = {}
+        signals.on_before_task_publish(headers=headers)
+        assert headers["published_at"] <= time.time()
+    def test_queue_wait_and_runtime_are_observed(self):
+        wait_labels = {"task": "train_model_task", "queue": "training.bulk", "priority": "low"}
+        run_labels = {"task": "train_model_task", "state": "SUCCESS"}
+        waits = sample("celery_task_queue_wait_seconds_count", wait_labels)
+        wait_sum = sample("celery_task_queue_wait_seconds_sum", wait_labels)
+        runs = sample("celery_task_runtime_seconds_count", run_labels)
+        task = SimpleNamespace(
+            name="train_model_task",
+            request=SimpleNamespace(
+                published_at=time.time() - 5,
+                delivery_info={"routing_key": "training.bulk", "priority": 6},
+            ),
+        )
+        signals.record_task_start(sender=task, task_id="t1")
+        signals.record_task_runtime(sender=task, task_id="t1", state="SUCCESS")
+        assert sample("celery_task_queue_wait_seconds_count", wait_labels) == waits + 1
+        assert sample("celery_task_queue_wait_seconds_sum", wait_labels) - wait_sum >= 5
+        assert sample("celery_task_runtime_seconds_count", run_labels) == runs + 1
+        signals.record_task_runtime(sender=task, task_id="t1", state="SUCCESS")
+        assert sample("celery_task_runtime_seconds_count", run_labels) == runs + 1
+class TestDriftSchedule:
+    def test_drift_evaluation_is_scheduled(self):
+        entry = celery_app.conf.beat_schedule["evaluate-drift"]
+        assert entry["task"] == "evaluate_drift_task"
+        assert entry["task"] in celery_app.tasks
+        assert entry["options"]["expires"] == entry["schedule"]
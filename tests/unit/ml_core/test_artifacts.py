@@ -0,0 +1,57 @@
+import subprocess
+import sys
+import numpy as np
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+from ml_core.training import artifacts
+from ml_core.training.artifacts import save_training_artifacts, start_training_artifacts
+from ml_core.training.evaluate import evaluate_predictions
+class FixedModel:
+    classes_ = np.arange(10)
+    def predict_proba(self, X):
+        return np.eye(10)[np.arange(len(X)) % 10]
+@pytest.fixture
+def test_data():
+    X_test = np.random.rand(100, 784).astype('float32')
+    y_test = np.arange(100) % 10
+    return X_test, y_test
+class TestArtifactModes:
+    def test_none_mode_writes_nothing(self, tmp_path, test_data):
+        X_test, y_test = test_data
+        result = save_training_artifacts(FixedModel(), X_test, y_test, str(tmp_path / "out"), mode="none")
+        assert result == {}
+        assert not (tmp_path / "out").exists()
+    def test_metrics_mode_skips_plots(self, tmp_path, test_data):
+        X_test, y_test = test_data
+        with patch.object(artifacts, 'get_render_executor') as get_executor:
+            result = save_training_artifacts(FixedModel(), X_test, y_test, str(tmp_path), mode="metrics")
+        get_executor.assert_not_called()
+        assert list(result) == ["classification_report"]
+    def test_full_mode_renders_in_background(self, tmp_path, test_data):
+        X_test, y_test = test_data
+        evaluation = evaluate_predictions(FixedModel(), X_test, y_test)
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            pending = start_training_artifacts(
+                FixedModel(), X_test, y_test, str(tmp_path),
+                evaluation=evaluation, mode="full", executor=executor,
+            )
+            result = pending.wait()
+        assert set(result) == {"classification_report", "confusion_matrix", "per_class_accuracy", "sample_predictions"}
+        for path in result.values():
+            assert (tmp_path / path.split("/")[-1]).stat().st_size > 0
+    def test_invalid_mode(self, tmp_path, test_data):
+        X_test, y_test = test_data
+        with pytest.raises(ValueError):
+            save_training_artifacts(FixedModel(), X_test, y_test, str(tmp_path), mode="some")
+    def test_daemon_process_falls_back_to_threads(self):
+        with patch.object(artifacts, '_render_executor', None), \
+             patch('ml_core.training.artifacts.mp.current_process') as current:
+            current.return_value.daemon = True
+            executor = artifacts.get_render_executor()
+            assert isinstance(executor, ThreadPoolExecutor)
+            executor.shutdown()
+    def test_import_does_not_load_plotting_libraries(self):
+        code = "import sys, ml_core.training; print('matplotlib' in sys.modules or 'seaborn' in sys.modules)"
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        assert output.stdout.strip().endswith("False")
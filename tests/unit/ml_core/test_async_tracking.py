@@ -0,0 +1,83 @@
+import threading
+from concurrent.futures import Future
+from pathlib import Path
+from unittest.mock import MagicMock
+from ml_core.training.artifacts import PendingArtifacts
+from ml_core.training.async_tracking import AsyncRunTracker
+from ml_core.training.tracking import BatchedRunLogger
+class TestAsyncRunTracker:
+    def test_batched_logger_ships_through_queue(self):
+        client = MagicMock()
+        tracker = AsyncRunTracker(client=client)
+        with BatchedRunLogger("run1", client=tracker) as run_logger:
+            run_logger.log_params({"learning_rate": 0.001})
+            run_logger.log_metrics({"accuracy": 0.9})
+        tracker.set_terminated("run1", "FINISHED")
+        assert tracker.flush(timeout=5)
+        client.log_batch.assert_called_once()
+        assert client.log_batch.call_args.kwargs["params"][0].key == "learning_rate"
+        client.set_terminated.assert_called_once_with("run1", "FINISHED")
+        assert tracker.stats()["completed"] == 2
+    def test_retries_transient_failures(self):
+        client = MagicMock()
+        client.set_terminated.side_effect = [ConnectionError("down"), None]
+        tracker = AsyncRunTracker(client=client, max_retries=3, retry_max_wait=0.01)
+        tracker.set_terminated("run1")
+        assert tracker.flush(timeout=10)
+        assert client.set_terminated.call_count == 2
+        assert tracker.stats()["failed"] == 0
+    def test_gives_up_after_max_retries(self):
+        client = MagicMock()
+        client.set_terminated.side_effect = ConnectionError("down")
+        tracker = AsyncRunTracker(client=client, max_retries=2, retry_max_wait=0.01)
+        tracker.set_terminated("run1")
+        assert tracker.flush(timeout=10)
+        stats = tracker.stats()
+        assert stats["failed"] == 1
+        assert "down" in stats["recent_errors"][0]
+    def test_flush_timeout_reports_queue_depth_and_lag(self):
+        release = threading.Event()
+        tracker = AsyncRunTracker(client=MagicMock())
+        tracker.submit("blocked", release.wait)
+        tracker.submit("queued", lambda: None)
+        assert not tracker.flush(timeout=0.2)
+        stats = tracker.stats()
+        assert stats["queue_depth"] == 2
+        assert stats["lag_seconds"] >= 0.2
+        release.set()
+        assert tracker.flush(timeout=5)
+        assert tracker.stats()["queue_depth"] == 0
+        assert tracker.stats()["lag_seconds"] == 0.0
+    def test_artifacts_are_staged_and_cleaned_up(self, tmp_path):
+        (tmp_path / "report.json").write_text("{}")
+        uploaded = {}
+        def upload(run_id, local_dir, artifact_path=None):
+            uploaded["files"] = sorted(p.name for p in Path(local_dir).iterdir())
+            uploaded["dir"] = local_dir
+        client = MagicMock()
+        client.log_artifacts.side_effect = upload
+        tracker = AsyncRunTracker(client=client)
+        tracker.log_artifacts("run1", str(tmp_path))
+        (tmp_path / "report.json").unlink()
+        assert tracker.flush(timeout=5)
+        assert uploaded["files"] == ["report.json"]
+        assert not Path(uploaded["dir"]).exists()
+    def test_figures_upload_once_rendered_without_blocking_flush(self, tmp_path):
+        figures = tmp_path / "figures"
+        figures.mkdir()
+        uploaded = threading.Event()
+        client = MagicMock()
+        client.log_artifacts.side_effect = lambda run_id, local_dir, artifact_path=None: uploaded.set()
+        tracker = AsyncRunTracker(client=client)
+        render = Future()
+        tracker.log_pending_artifacts("run1", PendingArtifacts({}, {"confusion_matrix": render}), str(figures))
+        tracker.set_terminated("run1")
+        assert tracker.flush(timeout=5)
+        client.set_terminated.assert_called_once_with("run1", "FINISHED")
+        assert not uploaded.is_set()
+        (figures / "confusion_matrix.png").write_bytes(b"png")
+        render.set_result(str(figures / "confusion_matrix.png"))
+        assert uploaded.wait(timeout=5)
+        assert tracker.flush(timeout=5)
+        client.log_artifacts.assert_called_once_with("run1", str(figures))
+        assert not figures.exists()
@@ -0,0 +1,73 @@
+import multiprocessing as mp
+import numpy as np
+import pytest
+from types import SimpleNamespace
+from unittest.mock import patch
+from ml_core.utils import data_utils
+from ml_core.utils.data_utils import (
+    DatasetIntegrityError,
+    get_dataset_dir,
+    get_mnist_arrays,
+    load_mnist_arrays,
+    verify_mnist_cache,
+)
+@pytest.fixture
+def fake_mnist():
+    rng = np.random.RandomState(0)
+    data = rng.randint(0, 256, size=(200, 784)).astype('float64')
+    target = np.array([str(i % 10) for i in range(200)], dtype=object)
+    with patch('sklearn.datasets.fetch_openml', return_value=SimpleNamespace(data=data, target=target)) as fetch:
+        yield fetch
+@pytest.fixture(autouse=True)
+def reset_verified():
+    data_utils._verified_manifests.clear()
+    data_utils.clear_loaded_arrays()
+    yield
+    data_utils._verified_manifests.clear()
+    data_utils.clear_loaded_arrays()
+def _shape_in_child(data_dir, queue):
+    with patch.object(data_utils, "load_mnist_arrays", side_effect=AssertionError("reloaded")):
+        queue.put(get_mnist_arrays(data_dir)[0].shape)
+class TestDatasetStore:
+    def test_builds_once_and_memory_maps(self, tmp_path, fake_mnist):
+        X_train, X_test, y_train, y_test = load_mnist_arrays(str(tmp_path))
+        load_mnist_arrays(str(tmp_path))
+        assert fake_mnist.call_count == 1
+        assert isinstance(X_train, np.memmap)
+        assert X_train.dtype == np.float32
+        assert X_train.shape == (160, 784)
+        assert X_test.shape == (40, 784)
+        assert float(X_train.max()) <= 1.0
+        assert not X_train.flags.writeable
+    def test_detects_corruption(self, tmp_path, fake_mnist):
+        load_mnist_arrays(str(tmp_path))
+        data_utils._verified_manifests.clear()
+        path = get_dataset_dir(str(tmp_path)) / "y_test.npy"
+        y_test = np.load(path)
+        y_test[0] = (y_test[0] + 1) % 10
+        np.save(path, y_test)
+        with pytest.raises(DatasetIntegrityError):
+            verify_mnist_cache(str(tmp_path))
+    def test_rebuilds_corrupted_cache(self, tmp_path, fake_mnist):
+        load_mnist_arrays(str(tmp_path))
+        data_utils._verified_manifests.clear()
+        (get_dataset_dir(str(tmp_path)) / "X_test.npy").write_bytes(b"corrupt")
+        X_train, X_test, y_train, y_test = load_mnist_arrays(str(tmp_path))
+        assert fake_mnist.call_count == 2
+        assert X_test.shape == (40, 784)
+class TestLoadedArrays:
+    def test_loaded_once_per_process(self, tmp_path, fake_mnist):
+        with patch.object(data_utils, "load_mnist_arrays", wraps=load_mnist_arrays) as load:
+            first = get_mnist_arrays(str(tmp_path))
+            second = get_mnist_arrays(str(tmp_path))
+        assert load.call_count == 1
+        assert all(a is b for a, b in zip(first, second))
+    def test_forked_children_reuse_parent_arrays(self, tmp_path, fake_mnist):
+        get_mnist_arrays(str(tmp_path))
+        ctx = mp.get_context("fork")
+        queue = ctx.Queue()
+        child = ctx.Process(target=_shape_in_child, args=(str(tmp_path), queue))
+        child.start()
+        child.join(30)
+        assert child.exitcode == 0
+        assert queue.get(timeout=5) == (160, 784)
@@ -0,0 +1,87 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pytest
+from sklearn.metrics import (
+    accuracy_score,
+    classification_report,
+    confusion_matrix,
+    f1_score,
+    precision_score,
+    recall_score,
+)
+from ml_core.training.artifacts import save_training_artifacts
+from ml_core.training.evaluate import (
+    compute_confusion_matrix,
+    compute_per_class_accuracy,
+    evaluate_model,
+    evaluate_predictions,
+    generate_classification_report,
+)
+class CountingModel:
+    def __init__(self, y_pred):
+        self.classes_ = np.arange(10)
+        self._proba = np.eye(10)[y_pred]
+        self.predict_calls = 0
+        self.predict_proba_calls = 0
+    def predict(self, X):
+        self.predict_calls += 1
+        return self.classes_[self._proba[:len(X)].argmax(axis=1)]
+    def predict_proba(self, X):
+        self.predict_proba_calls += 1
+        return self._proba[:len(X)]
+@pytest.fixture
+def labels():
+    rng = np.random.RandomState(0)
+    y_true = rng.randint(0, 9, 500)
+    y_pred = np.where(rng.rand(500) < 0.7, y_true, rng.randint(0, 10, 500))
+    return y_true, y_pred
+class TestEvaluate:
+    def test_metrics_match_sklearn(self, labels):
+        y_true, y_pred = labels
+        model = CountingModel(y_pred)
+        metrics = evaluate_model(model, np.zeros((500, 784)), y_true)
+        expected = {
+            "accuracy": accuracy_score(y_true, y_pred),
+            "precision_macro": precision_score(y_true, y_pred, average='macro', zero_division=0),
+            "recall_macro": recall_score(y_true, y_pred, average='macro', zero_division=0),
+            "f1_macro": f1_score(y_true, y_pred, average='macro', zero_division=0),
+            "precision_weighted": precision_score(y_true, y_pred, average='weighted', zero_division=0),
+            "recall_weighted": recall_score(y_true, y_pred, average='weighted', zero_division=0),
+            "f1_weighted": f1_score(y_true, y_pred, average='weighted', zero_division=0),
+        }
+        assert metrics.keys() == expected.keys()
+        for key, value in expected.items():
+            assert metrics[key] == pytest.approx(value)
+        np.testing.assert_array_equal(
+            compute_confusion_matrix(model, None, y_true, y_pred=y_pred),
+            confusion_matrix(y_true, y_pred, labels=range(10)),
+        )
+    def test_report_matches_sklearn(self, labels):
+        y_true, y_pred = labels
+        report = generate_classification_report(None, None, y_true, output_dict=True, y_pred=y_pred)
+        expected = classification_report(
+            y_true, y_pred, labels=range(10),
+            target_names=[f"Digit {i}" for i in range(10)],
+            output_dict=True, zero_division=0,
+        )
+        for key in ("Digit 3", "Digit 9", "weighted avg"):
+            for field, value in expected[key].items():
+                assert report[key][field] == pytest.approx(value)
+        per_class = compute_per_class_accuracy(None, None, y_true, y_pred=y_pred)
+        assert per_class[9] == 0.0
+    def test_artifacts_use_single_prediction_pass(self, tmp_path, labels):
+        y_true, y_pred = labels
+        model = CountingModel(y_pred)
+        X_test = np.random.rand(500, 784).astype('float32')
+        evaluation = evaluate_predictions(model, X_test, y_true)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            artifacts = save_training_artifacts(
+                model, X_test, y_true, str(tmp_path),
+                evaluation=evaluation, mode="full", executor=executor,
+            )
+        assert model.predict_proba_calls == 1
+        assert model.predict_calls == 0
+        assert len(artifacts) == 4
+        with open(artifacts["classification_report"]) as f:
+            assert json.load(f)["accuracy"] == pytest.approx(accuracy_score(y_true, y_pred))
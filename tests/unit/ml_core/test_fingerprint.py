@@ -0,0 +1,72 @@
+import time
+import mlflow
+import pytest
+from ml_core.utils.fingerprint import (
+    FINGERPRINT_TAG,
+    compute_fingerprint,
+    find_existing_run,
+    load_fingerprint_index,
+    normalize_params,
+)
+PARAMS = {
+    "learning_rate": 0.001,
+    "epochs": 5,
+    "batch_size": 64,
+    "hidden_size": 128,
+    "dropout": 0.2,
+    "random_seed": 42,
+}
+@pytest.fixture
+def tracking_uri(tmp_path, monkeypatch):
+    uri = f"sqlite:///{tmp_path}/mlflow.db"
+    monkeypatch.setenv("MLFLOW_TRACKING_URI", uri)
+    monkeypatch.setenv("DATA_DIR", str(tmp_path / "data"))
+    mlflow.set_tracking_uri(uri)
+    yield uri
+    mlflow.end_run()
+class TestFingerprint:
+    def test_normalization_ignores_representation(self):
+        logged = {k: str(v) for k, v in PARAMS.items()}
+        logged["learning_rate"] = "1e-3"
+        assert normalize_params(logged) == normalize_params(PARAMS)
+        assert compute_fingerprint(logged, "data", "code") == compute_fingerprint(PARAMS, "data", "code")
+    def test_fingerprint_changes_with_inputs(self):
+        base = compute_fingerprint(PARAMS, "data", "code")
+        assert compute_fingerprint({**PARAMS, "random_seed": 43}, "data", "code") != base
+        assert compute_fingerprint(PARAMS, "data2", "code") != base
+        assert compute_fingerprint(PARAMS, "data", "code2") != base
+        assert compute_fingerprint({**PARAMS, "dtype": "float32"}, "data", "code") != compute_fingerprint(
+            {**PARAMS, "dtype": "float64"}, "data", "code")
+    def test_index_finds_tagged_runs(self, tracking_uri):
+        fingerprint = compute_fingerprint(PARAMS, "data", "code")
+        mlflow.set_experiment("fp_test")
+        with mlflow.start_run(tags={FINGERPRINT_TAG: fingerprint}) as run:
+            pass
+        with mlflow.start_run():
+            pass
+        index = load_fingerprint_index("fp_test")
+        assert index == {fingerprint: run.info.run_id}
+        assert find_existing_run(fingerprint, "fp_test", index) == run.info.run_id
+        assert find_existing_run("missing", "fp_test", index) is None
+        mlflow.delete_run(run.info.run_id)
+        assert find_existing_run(fingerprint, "fp_test") is None
+    def test_index_is_cached_and_refreshed_incrementally(self, tracking_uri):
+        mlflow.set_experiment("fp_cache")
+        with mlflow.start_run(tags={FINGERPRINT_TAG: "a"}):
+            pass
+        assert set(load_fingerprint_index("fp_cache")) == {"a"}
+        with mlflow.start_run(tags={FINGERPRINT_TAG: "b"}):
+            pass
+        assert set(load_fingerprint_index("fp_cache")) == {"a", "b"}
+    def test_long_running_run_indexed_after_it_finishes(self, tracking_uri):
+        mlflow.set_experiment("fp_long")
+        experiment_id = mlflow.get_experiment_by_name("fp_long").experiment_id
+        client = mlflow.MlflowClient()
+        run = client.create_run(
+            experiment_id,
+            start_time=int(time.time() * 1000) - 3600 * 1000,
+            tags={FINGERPRINT_TAG: "long"},
+        )
+        assert load_fingerprint_index("fp_long") == {}
+        client.set_terminated(run.info.run_id, "FINISHED")
+        assert load_fingerprint_index("fp_long") == {"long": run.info.run_id}
@@ -0,0 +1,40 @@
+import numpy as np
+import mlflow
+import pytest
+from unittest.mock import patch
+from mlflow.tracking import MlflowClient
+from ml_core.experiments.halving import compute_rung_epochs, run_successive_halving
+from ml_core.experiments.run_experiments import build_sweep_trials
+@pytest.fixture
+def tracking_uri(tmp_path, monkeypatch):
+    uri = f"sqlite:///{tmp_path}/mlflow.db"
+    monkeypatch.setenv("MLFLOW_TRACKING_URI", uri)
+    yield uri
+    mlflow.end_run()
+@pytest.fixture
+def synthetic_data():
+    rng = np.random.RandomState(0)
+    X = rng.rand(400, 784).astype('float32')
+    y = np.arange(400) % 10
+    X[np.arange(400), y] += 5.0
+    return X[:300], X[300:], y[:300], y[300:]
+class TestSuccessiveHalving:
+    def test_compute_rung_epochs(self):
+        assert compute_rung_epochs(1, 9, 3) == [1, 3, 9]
+        assert compute_rung_epochs(1, 5, 3) == [1, 3, 5]
+        assert compute_rung_epochs(2, 2, 3) == [2]
+    def test_prunes_bottom_configs(self, tracking_uri, synthetic_data):
+        trials = build_sweep_trials(num_runs=9, experiment_name="halving_test", epochs=3)
+        with patch('ml_core.experiments.halving.load_mnist_data', return_value=synthetic_data), \
+             patch('ml_core.experiments.halving.log_model_outputs') as log_outputs:
+            run_ids = run_successive_halving(trials, experiment_name="halving_test", max_epochs=3, eta=3)
+        assert len(run_ids) == 3
+        assert log_outputs.call_count == 3
+        client = MlflowClient(tracking_uri)
+        experiment = client.get_experiment_by_name("halving_test")
+        runs = client.search_runs([experiment.experiment_id])
+        assert len(runs) == 9
+        pruned = [r for r in runs if "halving_pruned_at_rung" in r.data.tags]
+        assert len(pruned) == 6
+        survivor = client.get_metric_history(run_ids[0], "val_accuracy")
+        assert [m.step for m in survivor] == [1, 3]
@@ -0,0 +1,77 @@
+import numpy as np
+from ml_core.models.mnist_cnn import MNISTClassifier
+def make_data(n=300, seed=0):
+    rng = np.random.default_rng(seed)
+    y = np.repeat(np.arange(3), n // 3)
+    X = rng.normal(size=(n, 20)) + 2 * y[:, None]
+    return X.astype(np.float32), y
+class TestFitEpochs:
+    def test_reports_every_epoch(self):
+        X, y = make_data()
+        events = []
+        model = MNISTClassifier(hidden_layer_sizes=(8, 4), learning_rate_init=0.01, max_iter=4, batch_size=32)
+        model.fit_epochs(X, y, callback=events.append)
+        assert [e["epoch"] for e in events] == [1, 2, 3, 4]
+        assert all(e["epochs"] == 4 and "val_accuracy" in e for e in events)
+        assert len(model.loss_curve_) == 4
+        assert model.validation_scores_ == [e["val_accuracy"] for e in events]
+        assert model.score(X, y) > 0.5
+    def test_stops_early_when_validation_plateaus(self):
+        X, y = make_data()
+        events = []
+        model = MNISTClassifier(hidden_layer_sizes=(8, 4), max_iter=200, batch_size=32)
+        model.fit_epochs(X, y, callback=events.append, n_iter_no_change=2)
+        assert len(events) < 200
+        assert model.score(X, y) > 0.5
+    def test_without_validation_split(self):
+        X, y = make_data()
+        events = []
+        model = MNISTClassifier(hidden_layer_sizes=(8, 4), max_iter=3, early_stopping=False)
+        model.fit_epochs(X, y, callback=events.append)
+        assert len(events) == 3
+        assert "val_accuracy" not in events[0]
+        assert model.validation_scores_ is None
+    def test_warm_start_continues_from_fitted_weights(self):
+        X, y = make_data()
+        model = MNISTClassifier(hidden_layer_sizes=(8, 4), learning_rate_init=0.01, max_iter=5, batch_size=32)
+        model.fit_epochs(X, y)
+        scaler = model._pipeline.named_steps['scaler']
+        baseline = model.score(X, y)
+        model.max_iter = 2
+        events = []
+        model.fit_epochs(X, y, callback=events.append, warm_start=True)
+        assert len(events) == 2
+        assert model._pipeline.named_steps['scaler'] is scaler
+        assert len(model.loss_curve_) == 7
+        assert model.score(X, y) >= baseline - 0.05
+    def test_warm_start_without_fitted_pipeline_trains_from_scratch(self):
+        X, y = make_data()
+        model = MNISTClassifier(hidden_layer_sizes=(8, 4), learning_rate_init=0.01, max_iter=3, batch_size=32)
+        model.fit_epochs(X, y, warm_start=True)
+        assert len(model.loss_curve_) == 3
+class TestPrecision:
+    def test_float32_training_keeps_weights_and_outputs_float32(self):
+        X, y = make_data()
+        model = MNISTClassifier(hidden_layer_sizes=(8, 4), max_iter=2, batch_size=32)
+        model.fit_epochs(X.astype(np.float64), y)
+        classifier = model._pipeline.named_steps['classifier']
+        assert {w.dtype for w in classifier.coefs_ + classifier.intercepts_} == {np.dtype(np.float32)}
+        assert model._pipeline.named_steps['scaler'].scale_.dtype == np.float32
+        assert model.predict_proba(X.astype(np.float64)).dtype == np.float32
+    def test_float64_mode_and_astype(self):
+        X, y = make_data()
+        model = MNISTClassifier(hidden_layer_sizes=(8, 4), max_iter=2, batch_size=32, dtype="float64")
+        model.fit(X, y)
+        assert model._pipeline.named_steps['classifier'].coefs_[0].dtype == np.float64
+        expected = model.predict(X)
+        model.astype("float32")
+        assert model.get_params()['dtype'] == "float32"
+        assert model._pipeline.named_steps['classifier'].coefs_[0].dtype == np.float32
+        assert (model.predict(X) == expected).mean() > 0.99
+    def test_models_pickled_without_dtype_still_predict(self):
+        X, y = make_data()
+        model = MNISTClassifier(hidden_layer_sizes=(8, 4), max_iter=2, batch_size=32)
+        model.fit_epochs(X, y)
+        del model.dtype
+        assert len(model.predict(X)) == len(X)
+        assert model.get_params()['dtype'] is None
@@ -0,0 +1,55 @@
+import importlib
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+from ml_core.experiments.run_experiments import build_sweep_trials, resolve_sweep_workers, run_experiments
+sweep = importlib.import_module("ml_core.experiments.run_experiments")
+class TestParallelSweep:
+    def test_build_sweep_trials_leaves_global_rng_alone(self):
+        random.seed(123)
+        expected = random.random()
+        random.seed(123)
+        first = build_sweep_trials(num_runs=4, random_seed=7)
+        assert random.random() == expected
+        assert build_sweep_trials(num_runs=4, random_seed=7) == first
+        assert build_sweep_trials(num_runs=4, search_strategy="grid", random_seed=7) == build_sweep_trials(
+            num_runs=4, search_strategy="grid", random_seed=7)
+    def test_resolve_sweep_workers(self):
+        assert resolve_sweep_workers(4, 1, 10) == 4
+        assert resolve_sweep_workers(8, 1, 3) == 3
+        with patch('ml_core.experiments.run_experiments.os.cpu_count', return_value=32):
+            assert resolve_sweep_workers(0, 2, 100) == 16
+    def test_sequential_when_single_worker(self):
+        with patch.object(sweep, 'train_model', side_effect=lambda **kw: kw["run_name"]) as train:
+            run_ids = run_experiments(num_runs=3, n_jobs=1, skip_existing=False)
+        assert train.call_count == 3
+        assert run_ids == [c.kwargs["run_name"] for c in train.call_args_list]
+    def test_parallel_gathers_results_and_skips_failures(self):
+        threads = set()
+        def fake_train(**kwargs):
+            threads.add(threading.get_ident())
+            if kwargs["random_seed"] == 43:
+                raise RuntimeError("boom")
+            return kwargs["run_name"]
+        def fake_pool(max_workers, initializer, initargs, **kwargs):
+            return ThreadPoolExecutor(max_workers=max_workers, initializer=initializer, initargs=initargs)
+        with patch.object(sweep, 'train_model', side_effect=fake_train), \
+             patch.object(sweep, 'ProcessPoolExecutor', side_effect=fake_pool), \
+             patch.object(sweep, 'load_mnist_arrays') as load, \
+             patch.object(sweep, '_init_sweep_worker') as init, \
+             patch.object(sweep, 'mlflow'):
+            run_ids = run_experiments(num_runs=4, n_jobs=2, blas_threads=1, skip_existing=False)
+        load.assert_called_once()
+        init.assert_called_with(1)
+        assert len(run_ids) == 3
+        assert len(threads) <= 2
+    def test_skips_already_trained_configs(self):
+        def fake_dedupe(trials, experiment_name):
+            return trials[1:], ["existing_run"]
+        with patch.object(sweep, 'train_model', side_effect=lambda **kw: kw["run_name"]) as train, \
+             patch.object(sweep, 'dedupe_trials', side_effect=fake_dedupe):
+            run_ids = run_experiments(num_runs=3, n_jobs=1)
+        assert train.call_count == 2
+        assert run_ids[0] == "existing_run"
+        assert len(run_ids) == 3
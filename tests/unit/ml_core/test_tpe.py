@@ -0,0 +1,48 @@
+import numpy as np
+from types import SimpleNamespace
+from unittest.mock import patch, MagicMock
+from ml_core.experiments.tpe import SEARCH_SPACE, load_search_history, suggest_configs
+def _in_space(config):
+    for name, spec in SEARCH_SPACE.items():
+        if spec[0] == "choice":
+            assert config[name] in spec[1]
+        else:
+            assert spec[1] - 1e-12 <= config[name] <= spec[2] + 1e-12
+class TestTPE:
+    def test_random_startup_stays_in_space(self):
+        configs = suggest_configs([], 4, np.random.RandomState(0))
+        assert len(configs) == 4
+        for config in configs:
+            _in_space(config)
+    def test_proposals_concentrate_near_good_region(self):
+        rng = np.random.RandomState(0)
+        history = []
+        for _ in range(40):
+            lr = float(np.exp(rng.uniform(np.log(1e-4), np.log(1e-2))))
+            hidden = int(rng.choice([64, 96, 128, 192, 256]))
+            config = {"learning_rate": lr, "hidden_size": hidden, "batch_size": 64, "dropout": 0.2}
+            score = 1.0 - abs(np.log10(lr) + 3.0) - (0.1 if hidden != 256 else 0.0)
+            history.append((config, score))
+        proposals = suggest_configs(history, 10, np.random.RandomState(1))
+        for config in proposals:
+            _in_space(config)
+        median_distance = np.median([abs(np.log10(c["learning_rate"]) + 3.0) for c in proposals])
+        assert median_distance < 0.5
+        assert sum(c["hidden_size"] == 256 for c in proposals) >= 5
+    def test_load_history_parses_runs(self):
+        runs = [
+            SimpleNamespace(data=SimpleNamespace(
+                metrics={"accuracy": 0.97},
+                params={"learning_rate": "0.001", "hidden_size": "128", "batch_size": "64", "dropout": "0.2"},
+            )),
+            SimpleNamespace(data=SimpleNamespace(
+                metrics={"accuracy": 0.9},
+                params={"learning_rate": "0.001", "hidden_size": "100", "batch_size": "64", "dropout": "0.2"},
+            )),
+            SimpleNamespace(data=SimpleNamespace(metrics={}, params={})),
+        ]
+        client = MagicMock()
+        client.search_runs.return_value = runs
+        with patch('ml_core.experiments.tpe.MlflowClient', return_value=client):
+            history = load_search_history("exp")
+        assert history == [({"learning_rate": 0.001, "hidden_size": 128, "batch_size": 64, "dropout": 0.2}, 0.97)]
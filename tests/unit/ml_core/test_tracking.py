@@ -0,0 +1,35 @@
+from unittest.mock import MagicMock
+from ml_core.training.tracking import BatchedRunLogger
+class TestBatchedRunLogger:
+    def test_single_request_for_small_run(self):
+        client = MagicMock()
+        with BatchedRunLogger("run1", client=client) as run_logger:
+            run_logger.log_params({"learning_rate": 0.001, "epochs": 10})
+            run_logger.log_metrics({"accuracy": 0.9, "f1_macro": 0.8})
+            run_logger.log_series("train_loss", [1.0, 0.5, 0.25])
+            run_logger.set_tag("stage", "done")
+        client.log_batch.assert_called_once()
+        kwargs = client.log_batch.call_args.kwargs
+        assert {p.key: p.value for p in kwargs["params"]} == {"learning_rate": "0.001", "epochs": "10"}
+        assert [(m.key, m.step) for m in kwargs["metrics"] if m.key == "train_loss"] == [
+            ("train_loss", 1), ("train_loss", 2), ("train_loss", 3)
+        ]
+        assert run_logger.request_count == 1
+        assert run_logger.pending == 0
+    def test_chunks_respect_mlflow_limits(self):
+        client = MagicMock()
+        run_logger = BatchedRunLogger("run1", client=client)
+        run_logger.log_params({f"p{i}": i for i in range(150)})
+        run_logger.log_series("loss", [0.1] * 1500)
+        assert run_logger.flush() == 2
+        for call in client.log_batch.call_args_list:
+            params = call.kwargs["params"]
+            metrics = call.kwargs["metrics"]
+            assert len(params) <= 100
+            assert len(params) + len(metrics) + len(call.kwargs["tags"]) <= 1000
+        assert sum(len(c.kwargs["metrics"]) for c in client.log_batch.call_args_list) == 1500
+        assert sum(len(c.kwargs["params"]) for c in client.log_batch.call_args_list) == 150
+    def test_flush_without_pending_is_noop(self):
+        client = MagicMock()
+        assert BatchedRunLogger("run1", client=client).flush() == 0
+        client.log_batch.assert_not_called()
@@ -0,0 +1,74 @@
+from unittest.mock import patch
+import numpy as np
+import pytest
+from ml_core.models.mnist_cnn import MNISTClassifier
+from ml_core.training import warm_start
+from ml_core.training.warm_start import build_refresh_set, load_refresh_data, refresh_model
+def make_data(n=300, seed=0):
+    rng = np.random.default_rng(seed)
+    y = np.repeat(np.arange(3), n // 3)
+    X = rng.normal(size=(n, 20)) + 2 * y[:, None]
+    return X.astype(np.float32), y
+class TestRefreshData:
+    def test_load_refresh_data(self, tmp_path):
+        path = tmp_path / "refresh.npz"
+        np.savez(path, X=np.zeros((4, 2, 2)), y=np.array([0, 1, 2, 1]))
+        X, y, digest = load_refresh_data(str(path))
+        assert X.shape == (4, 4) and X.dtype == np.float32
+        assert y.tolist() == [0, 1, 2, 1]
+        assert len(digest) == 64
+    def test_missing_or_mismatched_data_rejected(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            load_refresh_data(str(tmp_path / "missing.npz"))
+        path = tmp_path / "bad.npz"
+        np.savez(path, X=np.zeros((4, 4)), y=np.array([0, 1]))
+        with pytest.raises(ValueError):
+            load_refresh_data(str(path))
+    def test_build_refresh_set_mixes_replay(self):
+        X_new, y_new = np.ones((10, 3), dtype=np.float32), np.full(10, 7)
+        X_old, y_old = np.zeros((100, 3), dtype=np.float32), np.arange(100) % 3
+        X, y, replayed = build_refresh_set(X_new, y_new, X_old, y_old, replay_ratio=2.0)
+        assert replayed == 20
+        assert len(X) == len(y) == 30
+        assert (y == 7).sum() == 10
+        assert X[y == 7].min() == 1.0
+    def test_build_refresh_set_without_replay(self):
+        X_new, y_new = np.ones((10, 3), dtype=np.float32), np.full(10, 1)
+        X, y, replayed = build_refresh_set(X_new, y_new, X_new, y_new, replay_ratio=0.0)
+        assert replayed == 0 and X is X_new
+class TestRefreshModel:
+    def test_warm_starts_parent_and_tags_lineage(self, tmp_path):
+        X, y = make_data()
+        parent = MNISTClassifier(hidden_layer_sizes=(8, 4), learning_rate_init=0.01, max_iter=4, batch_size=32)
+        parent.fit_epochs(X, y)
+        coefs = [c.copy() for c in parent._pipeline.named_steps['classifier'].coefs_]
+        path = tmp_path / "refresh.npz"
+        np.savez(path, X=X[:30], y=y[:30])
+        info = {"version": "3", "run_id": "parent-run"}
+        with patch.object(warm_start, "load_parent_model", return_value=(parent, info)), \
+                patch.object(warm_start, "load_mnist_data", return_value=(X, X, y, y)), \
+                patch.object(warm_start, "get_data_version", return_value="data-v1"), \
+                patch.object(warm_start, "mlflow"), \
+                patch.object(warm_start, "run_training", return_value="child-run") as run_training:
+            run_id = refresh_model(model_name="MNISTClassifier", data_path=str(path), epochs=2, replay_ratio=1.0)
+        assert run_id == "child-run"
+        model, params, data, _, _, tags = run_training.call_args.args
+        assert model is parent
+        assert model.max_iter == 2
+        assert run_training.call_args.kwargs["warm_start"] is True
+        assert params["refresh_samples"] == 30 and params["replay_samples"] == 30
+        assert len(data[0]) == 60
+        assert tags["parent_run_id"] == "parent-run"
+        assert tags["parent_model_version"] == "3"
+        assert tags["training_mode"] == "warm_start"
+        assert np.array_equal(coefs[0], model._pipeline.named_steps['classifier'].coefs_[0])
+    def test_rejects_unknown_labels(self, tmp_path):
+        X, y = make_data()
+        parent = MNISTClassifier(hidden_layer_sizes=(8, 4), max_iter=1, batch_size=32)
+        parent.fit_epochs(X, y)
+        path = tmp_path / "refresh.npz"
+        np.savez(path, X=X[:3], y=np.array([0, 1, 9]))
+        with patch.object(warm_start, "load_parent_model", return_value=(parent, {"version": "1", "run_id": "r"})), \
+                patch.object(warm_start, "mlflow"):
+            with pytest.raises(ValueError, match="unknown"):
+                refresh_model(data_path=str(path))